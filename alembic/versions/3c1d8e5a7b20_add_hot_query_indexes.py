@@ -0,0 +1,47 @@
+"""add hot query indexes
+
+Revision ID: 3c1d8e5a7b20
+Revises: 9f65a7c9beb3
+Create Date: 2026-10-18 10:12:31.418204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3c1d8e5a7b20'
+down_revision: Union[str, Sequence[str], None] = '9f65a7c9beb3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction block
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_tasks_project_id_id',
+            'tasks',
+            ['project_id', 'id'],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            'ix_tasks_open_deadline',
+            'tasks',
+            ['deadline'],
+            unique=False,
+            postgresql_where=sa.text("status <> 'done'"),
+            sqlite_where=sa.text("status <> 'done'"),
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_tasks_open_deadline', table_name='tasks', postgresql_concurrently=True)
+        op.drop_index('ix_tasks_project_id_id', table_name='tasks', postgresql_concurrently=True)
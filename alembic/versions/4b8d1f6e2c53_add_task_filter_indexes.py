@@ -0,0 +1,46 @@
+"""add task filter indexes
+
+Revision ID: 4b8d1f6e2c53
+Revises: e91b6d2f4a87
+Create Date: 2026-10-18 16:03:57.730419
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4b8d1f6e2c53'
+down_revision: Union[str, Sequence[str], None] = 'e91b6d2f4a87'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+_INDEXES = {
+    'ix_tasks_project_status_id': ['project_id', 'status', 'id'],
+    'ix_tasks_project_deadline_id': ['project_id', 'deadline', 'id'],
+    'ix_tasks_project_closed_at_id': ['project_id', 'closed_at', 'id'],
+    # ORDER BY column DESC NULLS LAST, id DESC (query_page "-deadline" / "-closed_at")
+    'ix_tasks_project_deadline_desc_id': [
+        'project_id', sa.text('deadline DESC NULLS LAST'), sa.text('id DESC'),
+    ],
+    'ix_tasks_project_closed_at_desc_id': [
+        'project_id', sa.text('closed_at DESC NULLS LAST'), sa.text('id DESC'),
+    ],
+}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction block
+    with op.get_context().autocommit_block():
+        for name, columns in _INDEXES.items():
+            op.create_index(name, 'tasks', columns, unique=False, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name in reversed(list(_INDEXES)):
+            op.drop_index(name, table_name='tasks', postgresql_concurrently=True)
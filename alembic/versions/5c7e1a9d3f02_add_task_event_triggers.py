@@ -0,0 +1,49 @@
+"""add task event NOTIFY triggers
+
+Revision ID: 5c7e1a9d3f02
+Revises: f2a8c4d6b931
+Create Date: 2026-10-18 21:40:12.204913
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+from todo.db.task_events import CREATE_TRIGGERS
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5c7e1a9d3f02'
+down_revision: Union[str, Sequence[str], None] = 'f2a8c4d6b931'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+_TRIGGERS = {
+    'tasks_notify_insert': 'tasks',
+    'tasks_notify_update': 'tasks',
+    'tasks_notify_delete': 'tasks',
+    'projects_notify_delete': 'projects',
+}
+_FUNCTIONS = (
+    'project_events_notify()',
+    'task_events_notify()',
+    'task_events_payload(text, integer, integer[], integer)',
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if op.get_bind().dialect.name != 'postgresql':
+        return  # no LISTEN/NOTIFY
+    for statement in CREATE_TRIGGERS:
+        op.execute(statement)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    for name, table in _TRIGGERS.items():
+        op.execute(f'DROP TRIGGER IF EXISTS {name} ON {table}')
+    for function in _FUNCTIONS:
+        op.execute(f'DROP FUNCTION IF EXISTS {function}')
@@ -0,0 +1,47 @@
+"""add quota counters
+
+Revision ID: 7a4e2f9c1d36
+Revises: 3c1d8e5a7b20
+Create Date: 2026-10-18 11:05:47.902113
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7a4e2f9c1d36'
+down_revision: Union[str, Sequence[str], None] = '3c1d8e5a7b20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        'projects',
+        sa.Column('task_count', sa.Integer(), server_default='0', nullable=False),
+    )
+    op.create_table('quota_counters',
+    sa.Column('name', sa.String(length=50), nullable=False),
+    sa.Column('used', sa.Integer(), server_default='0', nullable=False),
+    sa.PrimaryKeyConstraint('name')
+    )
+
+    # Backfill the counters from the existing rows
+    op.execute(
+        "UPDATE projects SET task_count = "
+        "(SELECT count(*) FROM tasks WHERE tasks.project_id = projects.id)"
+    )
+    op.execute(
+        "INSERT INTO quota_counters (name, used) "
+        "SELECT 'projects', count(*) FROM projects"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('quota_counters')
+    op.drop_column('projects', 'task_count')
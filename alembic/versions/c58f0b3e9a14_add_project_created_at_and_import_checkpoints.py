@@ -0,0 +1,41 @@
+"""add project created_at and import checkpoints
+
+Revision ID: c58f0b3e9a14
+Revises: 7a4e2f9c1d36
+Create Date: 2026-10-18 13:40:09.551862
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c58f0b3e9a14'
+down_revision: Union[str, Sequence[str], None] = '7a4e2f9c1d36'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        'projects',
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    )
+    op.create_table('import_checkpoints',
+    sa.Column('source', sa.String(length=500), nullable=False),
+    sa.Column('byte_offset', sa.BigInteger(), nullable=False),
+    sa.Column('projects_imported', sa.Integer(), nullable=False),
+    sa.Column('tasks_imported', sa.Integer(), nullable=False),
+    sa.Column('finished', sa.Boolean(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.PrimaryKeyConstraint('source')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('import_checkpoints')
+    op.drop_column('projects', 'created_at')
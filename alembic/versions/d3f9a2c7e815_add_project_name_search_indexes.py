@@ -0,0 +1,44 @@
+"""add project name search indexes
+
+Revision ID: d3f9a2c7e815
+Revises: a7c3e5f1b964
+Create Date: 2026-10-18 17:25:06.118342
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd3f9a2c7e815'
+down_revision: Union[str, Sequence[str], None] = 'a7c3e5f1b964'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if op.get_bind().dialect.name != 'postgresql':
+        return  # other backends scan projects.name (todo/repositories/project_repository.py)
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    with op.get_context().autocommit_block():
+        # substring (LIKE '%q%') and similarity (%) matches
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_projects_name_trgm "
+            "ON projects USING gin (lower(name) gin_trgm_ops)"
+        )
+        # prefix matches (LIKE 'q%') of queries too short for trigrams
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_projects_name_prefix "
+            "ON projects (lower(name) text_pattern_ops)"
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_projects_name_prefix")
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_projects_name_trgm")
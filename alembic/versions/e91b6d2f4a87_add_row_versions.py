@@ -0,0 +1,30 @@
+"""add row versions to projects and tasks
+
+Revision ID: e91b6d2f4a87
+Revises: c58f0b3e9a14
+Create Date: 2026-10-18 15:12:44.208131
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e91b6d2f4a87'
+down_revision: Union[str, Sequence[str], None] = 'c58f0b3e9a14'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('projects', sa.Column('version', sa.Integer(), server_default='1', nullable=False))
+    op.add_column('tasks', sa.Column('version', sa.Integer(), server_default='1', nullable=False))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('tasks', 'version')
+    op.drop_column('projects', 'version')
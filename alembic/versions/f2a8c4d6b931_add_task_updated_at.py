@@ -0,0 +1,45 @@
+"""add tasks.updated_at for the autoclose scheduler
+
+Revision ID: f2a8c4d6b931
+Revises: d3f9a2c7e815
+Create Date: 2026-10-18 19:41:06.517392
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f2a8c4d6b931'
+down_revision: Union[str, Sequence[str], None] = 'd3f9a2c7e815'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # now() is not volatile: Postgres 11+ adds the column without a table rewrite
+    op.add_column(
+        'tasks',
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    )
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction block
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_tasks_open_updated_at',
+            'tasks',
+            ['updated_at'],
+            unique=False,
+            postgresql_where=sa.text("status <> 'done'"),
+            sqlite_where=sa.text("status <> 'done'"),
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_tasks_open_updated_at', table_name='tasks', postgresql_concurrently=True)
+    op.drop_column('tasks', 'updated_at')
@@ -2,14 +2,14 @@
 from __future__ import annotations
 
 from typing import Optional
-from todo.services.app_factory import build_services
 from todo.exceptions.service_exceptions import (
     ProjectAlreadyExists, ProjectNotFound, TaskNotFound, InvalidStatus
 )
 from todo.config import ALLOWED_STATUSES
 
-# Only I/O here; all business rules live in services
-ps, ts = build_services()
+# Only I/O here; all business rules live in services.
+# Built by main(), so importing this module does not touch the database.
+ps = ts = None
 
 
 # -------- Helpers (inputs + selectors) --------
@@ -23,45 +23,28 @@ def _input_int(prompt: str) -> Optional[int]:
     return int(raw)
 
 def _select_project_id() -> int | None:
-    projects = list(ps.list_projects())
-    if not projects:
-        print("ℹ️ No projects.")
-        return None
-
-    print("\nProjects:")
-    for i, p in enumerate(projects, start=1):
-        print(f"{i}) #{p.id}  {p.name}")
-
-    raw = input("Pick project (number / ID / exact name / partial): ").strip()
+    raw = input("Pick project (ID / name / partial): ").strip()
     if not raw:
         return None
 
-    # number (1..N)
-    if raw.isdigit():
-        idx = int(raw)
-        if 1 <= idx <= len(projects):
-            return projects[idx - 1].id
-
     # try ID
     if raw.isdigit():
         return int(raw)
 
-    # exact name (case-insensitive)
-    for p in projects:
-        if p.name.lower() == raw.lower():
-            return p.id
-
-    # partial name
-    matches = [p for p in projects if raw.lower() in p.name.lower()]
-    if len(matches) == 1:
-        return matches[0].id
-    elif len(matches) > 1:
-        print("Multiple matches:")
-        for p in matches:
-            print(f"- #{p.id}  {p.name}")
+    # indexed lookup: exact name first, then prefix / similar names
+    matches = list(ps.search_projects(raw, limit=10))
+    if not matches:
+        print("❌ Not found.")
         return None
+    if len(matches) == 1 or matches[0].name.lower() == raw.lower():
+        return matches[0].id
 
-    print("❌ Not found.")
+    print("Multiple matches:")
+    for i, p in enumerate(matches, start=1):
+        print(f"{i}) #{p.id}  {p.name}")
+    pick = _input_int("Pick number (empty to cancel): ")
+    if pick is not None and 1 <= pick <= len(matches):
+        return matches[pick - 1].id
     return None
 
 def _select_task_id(project_id: int) -> int | None:
@@ -232,6 +215,10 @@ def change_task_status():
 
 # -------- Menu loop --------
 def main():
+    global ps, ts
+    from todo.services.app_factory import build_services
+
+    ps, ts = build_services()
     MENU = {
         "1": ("Create Project", create_project),
         "2": ("Edit Project", edit_project),
@@ -1,13 +1,39 @@
 from __future__ import annotations
 
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator
+
+from fastapi import FastAPI, Response, status
+
+from todo.api.events import TaskEventBroker
+from todo.api.routers import router as api_router
+from todo.config import CACHE_ENABLED, DB_MAX_OVERFLOW, DB_POOL_SIZE, DB_POOL_TIMEOUT
+from todo.db.health import check_database, pool_status
+from todo.db.session import get_engine, get_replicas
+from todo.repositories.cache import read_cache
+from todo.services.container import build_container
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    # engine, repositories and services are built once per worker and
+    # handed to the controllers through Depends(get_container)
+    app.state.container = build_container()
+    # one LISTEN connection per worker, opened by the first event stream
+    app.state.task_events = TaskEventBroker()
+    # open event streams would otherwise hold up the shutdown forever
+    restore_signals = app.state.task_events.end_streams_on_exit()
+    yield
+    restore_signals()
+    await app.state.task_events.close()
+    app.state.container.close()
 
-from todo.api.routers import api_router
 
 app = FastAPI(
     title="ToDoList API",
     version="0.3.0",
     description="ToDoList Web API for managing projects and tasks (Phase 3).",
+    lifespan=lifespan,
 )
 
 
@@ -17,5 +43,34 @@ def health_check() -> dict[str, str]:
     return {"status": "ok"}
 
 
+@app.get("/health/ready", tags=["system"])
+def readiness_check(response: Response) -> dict[str, Any]:
+    """Readiness probe: runs a timed `SELECT 1` and reports connection pool usage."""
+    result: dict[str, Any] = {"status": "ok"}
+    try:
+        result["database"] = check_database(get_engine())
+    except Exception as e:  # driver / pool timeout errors
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+        result["status"] = "unavailable"
+        result["database"] = {"error": type(e).__name__}
+
+    result["pool"] = pool_status(get_engine())
+    result["pool"]["configured"] = {
+        "pool_size": DB_POOL_SIZE,
+        "max_overflow": DB_MAX_OVERFLOW,
+        "pool_timeout": DB_POOL_TIMEOUT,
+    }
+    replicas = get_replicas()
+    if replicas:
+        result["replicas"] = [pool_status(e) for e in replicas.engines]
+    return result
+
+
+@app.get("/health/cache", tags=["system"])
+def cache_stats() -> dict[str, Any]:
+    """Hit/miss counters of this worker's read-through cache."""
+    return {"enabled": CACHE_ENABLED, **read_cache.stats()}
+
+
 # Mount all API routers (v1)
 app.include_router(api_router)
@@ -0,0 +1,29 @@
+from __future__ import annotations
+
+import os
+from typing import Iterator
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import Engine
+
+# PostgreSQL-only tests (query plans, ...) run against TEST_POSTGRES_URL, by
+# default the docker-compose database; it must have `alembic upgrade head`
+# applied. They are skipped when it cannot be reached.
+TEST_POSTGRES_URL = os.getenv("TEST_POSTGRES_URL") or (
+    f"postgresql+psycopg2://{os.getenv('DB_USER', 'todolist')}:"
+    f"{os.getenv('DB_PASSWORD', 'secret')}@{os.getenv('DB_HOST', '127.0.0.1')}:"
+    f"{os.getenv('DB_PORT', '5433')}/{os.getenv('DB_NAME', 'todolist')}"
+)
+
+
+@pytest.fixture(scope="session")
+def postgres_engine() -> Iterator[Engine]:
+    try:
+        engine = create_engine(TEST_POSTGRES_URL, connect_args={"connect_timeout": 3})
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+    except Exception as e:  # driver missing, server down, auth
+        pytest.skip(f"PostgreSQL unavailable ({type(e).__name__}); set TEST_POSTGRES_URL")
+    yield engine
+    engine.dispose()
@@ -0,0 +1,21 @@
+from __future__ import annotations
+
+import pytest
+
+from todo.db import async_session
+from todo.db.async_session import async_url
+
+
+def test_async_url_swaps_only_the_driver():
+    assert async_url("postgresql+psycopg2://u:p@db:5432/todo") == "postgresql+asyncpg://u:p@db:5432/todo"
+    assert async_url("postgresql://u@db/todo") == "postgresql+asyncpg://u@db/todo"
+
+
+def test_async_url_rejects_other_databases():
+    with pytest.raises(ValueError):
+        async_url("sqlite:///todo.db")
+
+
+def test_engine_is_created_on_first_use():
+    assert async_session._async_engine is None
+    assert async_session.AsyncSessionLocal.kw.get("bind") is None
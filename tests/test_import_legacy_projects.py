@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+import json
+
+import pytest
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.orm import sessionmaker
+
+import todo.models  # noqa: F401  (registers every table)
+from todo.commands import import_legacy_projects as importer
+from todo.db.base import Base
+from todo.exceptions.service_exceptions import QuotaExceeded
+from todo.models import Project
+from todo.models.quota_counter import QuotaCounter
+from todo.repositories.quota import PROJECTS_COUNTER
+
+
+@pytest.fixture
+def session_factory(tmp_path, monkeypatch):
+    engine = create_engine(f"sqlite:///{tmp_path}/import.db")
+    Base.metadata.create_all(engine)
+    factory = sessionmaker(bind=engine, autoflush=False)
+    monkeypatch.setattr(importer, "SessionLocal", factory)
+    yield factory
+    engine.dispose()
+
+
+def _legacy_file(tmp_path, tasks_per_project):
+    path = tmp_path / "projects.json"
+    path.write_text(json.dumps([
+        {"project_id": i, "name": f"p{i}", "tasks": [{"title": f"t{j}"} for j in range(n)]}
+        for i, n in enumerate(tasks_per_project, 1)
+    ]))
+    return str(path)
+
+
+def _projects(session_factory):
+    with session_factory() as s:
+        return (
+            s.scalar(select(func.count()).select_from(Project)),
+            s.get(QuotaCounter, PROJECTS_COUNTER).used,
+        )
+
+
+def test_projects_beyond_the_quota_are_not_imported(session_factory, tmp_path, monkeypatch):
+    monkeypatch.setattr(importer, "MAX_NUMBER_OF_PROJECTS", 3)
+    path = _legacy_file(tmp_path, [1, 1, 1, 1, 1])
+
+    with pytest.raises(QuotaExceeded):
+        importer.run(path, batch_size=2)
+
+    # the first batch fits, the second would bring the total to 4
+    assert _projects(session_factory) == (2, 2)
+    assert importer.main([path, "--batch-size", "2"]) == 1
+
+
+def test_projects_with_too_many_tasks_are_rejected(session_factory, tmp_path, monkeypatch):
+    monkeypatch.setattr(importer, "MAX_NUMBER_OF_TASKS", 2)
+    path = _legacy_file(tmp_path, [2, 3])
+
+    with pytest.raises(QuotaExceeded, match="#2 has 3 tasks"):
+        importer.run(path, batch_size=10)
+
+    assert _projects(session_factory) == (0, 0)
@@ -0,0 +1,19 @@
+from __future__ import annotations
+
+import pytest
+
+from todo.commands.check_import_time import COMMAND_MODULES, check, scaled_budget
+
+REPEAT = 5
+
+
+@pytest.fixture(scope="module")
+def budget_ms() -> float:
+    return scaled_budget(repeat=REPEAT)
+
+
+@pytest.mark.parametrize("module", COMMAND_MODULES)
+def test_command_starts_within_budget(module, budget_ms):
+    # fastest of REPEAT fresh interpreters, under -X importtime
+    total, status = check(module, budget_ms=budget_ms, repeat=REPEAT)
+    assert status == "ok", f"{module}: {total:.1f} ms, {status}"
@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+from typing import Iterator, List
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event, insert
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import sessionmaker
+
+from main import app
+from todo.api.dependencies import get_container, get_unit_of_work
+from todo.db.base import Base
+from todo.db.unit_of_work import CURRENT_UNIT_OF_WORK, UnitOfWork, current_session_factory
+from todo.models import Project, Task
+from todo.repositories.project_repository import SqlAlchemyProjectRepository
+from todo.repositories.task_repository import SqlAlchemyTaskRepository
+from todo.services.container import AppContainer
+from todo.services.project_service import ProjectService
+from todo.services.task_service import TaskService
+
+TASKS_PER_PROJECT = 3
+
+
+def _seed(engine: Engine, projects: int) -> None:
+    Base.metadata.create_all(engine)
+    with engine.begin() as conn:
+        project_ids = conn.scalars(
+            insert(Project).returning(Project.id, sort_by_parameter_order=True),
+            [
+                {"name": f"project {i}", "task_count": TASKS_PER_PROJECT}
+                for i in range(projects)
+            ],
+        ).all()
+        conn.execute(
+            insert(Task),
+            [
+                {"project_id": project_id, "title": f"task {j}", "status": "todo"}
+                for project_id in project_ids
+                for j in range(TASKS_PER_PROJECT)
+            ],
+        )
+
+
+class _StatementCounter:
+    def __init__(self, engine: Engine) -> None:
+        self.statements: List[str] = []
+        event.listen(engine, "before_cursor_execute", self._count)
+
+    def _count(self, conn, cursor, statement, parameters, context, executemany) -> None:
+        self.statements.append(statement)
+
+    def during(self, client: TestClient, url: str) -> int:
+        self.statements.clear()
+        response = client.get(url)
+        assert response.status_code == 200, response.text
+        return len(self.statements)
+
+
+@pytest.fixture
+def api(tmp_path) -> Iterator:
+    """Returns ``open(projects)``: a client on a fresh SQLite database and its counter."""
+    engines: List[Engine] = []
+
+    def open_api(projects: int):
+        engine = create_engine(f"sqlite:///{tmp_path}/projects-{projects}.db")
+        engines.append(engine)
+        _seed(engine, projects)
+        session_factory = sessionmaker(bind=engine, autoflush=False)
+        project_repo = SqlAlchemyProjectRepository(current_session_factory(session_factory))
+        task_repo = SqlAlchemyTaskRepository(current_session_factory(session_factory))
+        container = AppContainer(
+            engine=engine,
+            project_repo=project_repo,
+            task_repo=task_repo,
+            project_service=ProjectService(project_repo, task_repo, uow=CURRENT_UNIT_OF_WORK),
+            task_service=TaskService(project_repo, task_repo, uow=CURRENT_UNIT_OF_WORK),
+        )
+
+        def unit_of_work() -> Iterator[UnitOfWork]:
+            with UnitOfWork(session_factory) as uow:
+                yield uow
+
+        app.dependency_overrides[get_container] = lambda: container
+        app.dependency_overrides[get_unit_of_work] = unit_of_work
+        return TestClient(app), _StatementCounter(engine)
+
+    yield open_api
+    app.dependency_overrides.clear()
+    for engine in engines:
+        engine.dispose()
+
+
+@pytest.mark.parametrize(
+    "url",
+    ["/projects/?include=tasks", "/projects/?include=tasks&limit=100"],
+)
+def test_include_tasks_runs_a_constant_number_of_statements(api, url):
+    client, counter = api(1)
+    one = counter.during(client, url)
+    client, counter = api(50)
+    fifty = counter.during(client, url)
+
+    response = client.get(url)
+    assert len(response.json()) == 50
+    assert all(len(p["tasks"]) == TASKS_PER_PROJECT for p in response.json())
+    assert one == fifty
+
+
+def test_include_task_count_reads_the_counter_column(api):
+    client, counter = api(50)
+    plain = counter.during(client, "/projects/")
+    with_count = counter.during(client, "/projects/?include=task_count")
+
+    response = client.get("/projects/?include=task_count&fields=id")
+    assert with_count == plain
+    assert response.json()[0] == {"id": 1, "task_count": TASKS_PER_PROJECT}
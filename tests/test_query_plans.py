@@ -0,0 +1,20 @@
+from __future__ import annotations
+
+from todo.commands.check_query_plans import _seed, check
+
+# Same dataset as `python -m todo.commands.check_query_plans`
+SEED_PROJECTS = 200
+SEED_TASKS = 100_000
+THRESHOLD = 10_000
+
+
+def test_hot_queries_use_an_index(postgres_engine):
+    with postgres_engine.connect() as conn:
+        trans = conn.begin()
+        try:
+            _seed(conn, SEED_PROJECTS, SEED_TASKS)
+            failures = check(conn, THRESHOLD)
+        finally:
+            trans.rollback()
+
+    assert failures == [], f"hot queries falling back to a seq scan: {failures}"
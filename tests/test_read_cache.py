@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+import pytest
+from fastapi import Response
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+from starlette.requests import Request
+
+from todo.api import dependencies
+from todo.db.base import Base
+from todo.db.unit_of_work import (
+    CURRENT_UNIT_OF_WORK,
+    UnitOfWork,
+    bind_unit_of_work,
+    current_session_factory,
+)
+from todo.models import Project
+from todo.repositories.cache import CachedProjectRepository, TTLCache
+from todo.repositories.project_repository import SqlAlchemyProjectRepository
+from todo.services.container import _use_cache
+
+
+def _request(method: str, cookie: str = "") -> Request:
+    headers = [(b"cookie", cookie.encode())] if cookie else []
+    return Request({"type": "http", "method": method, "headers": headers})
+
+
+@pytest.fixture
+def session_factory(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path}/cache.db")
+    Base.metadata.create_all(engine)
+    with engine.begin() as conn:
+        conn.execute(insert(Project), [{"name": "before"}])
+    yield sessionmaker(bind=engine, autoflush=False)
+    engine.dispose()
+
+
+def test_pinned_reads_bypass_another_workers_cache(session_factory):
+    repo = SqlAlchemyProjectRepository(current_session_factory(session_factory))
+    # a second worker process: its own cache, never told about the write
+    other_worker = CachedProjectRepository(
+        repo, TTLCache(), uow=CURRENT_UNIT_OF_WORK, use_cache=_use_cache
+    )
+    assert other_worker.get_by_id(1).name == "before"
+
+    repo.update(1, name="after")
+
+    assert other_worker.get_by_id(1).name == "before"  # stale up to the TTL
+    with UnitOfWork(session_factory, pinned=True) as uow, bind_unit_of_work(uow):
+        assert other_worker.get_by_id(1).name == "after"
+
+
+def test_writes_pin_the_client_when_the_cache_is_on(monkeypatch):
+    monkeypatch.setattr(dependencies, "CACHE_ENABLED", True)
+    response = Response()
+
+    assert dependencies._pinned_to_primary(_request("PATCH"), response)
+    assert dependencies.PRIMARY_PIN_COOKIE in response.headers["set-cookie"]
+    assert dependencies._pinned_to_primary(
+        _request("GET", f"{dependencies.PRIMARY_PIN_COOKIE}=1"), Response()
+    )
+    assert not dependencies._pinned_to_primary(_request("GET"), Response())
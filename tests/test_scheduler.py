@@ -0,0 +1,37 @@
+from __future__ import annotations
+
+from datetime import timedelta
+
+from sqlalchemy.exc import OperationalError
+
+from todo.commands.scheduler import AutocloseScheduler
+
+
+class _FlakyLock:
+    """Leader lock whose database is down for the first ``outages`` attempts."""
+
+    def __init__(self, scheduler_stop, outages: int) -> None:
+        self.outages = outages
+        self.attempts = 0
+        self.released = False
+        self._stop = scheduler_stop
+
+    def acquire(self) -> bool:
+        self.attempts += 1
+        if self.attempts <= self.outages:
+            raise OperationalError("SELECT pg_try_advisory_lock(...)", {}, Exception("down"))
+        self._stop()  # standby once the database is back, then stop
+        return False
+
+    def release(self) -> None:
+        self.released = True
+
+
+def test_database_outage_while_acquiring_is_retried():
+    scheduler = AutocloseScheduler(ts=None, lock=None, refresh=timedelta(milliseconds=1))
+    scheduler.lock = lock = _FlakyLock(scheduler.stop, outages=3)
+
+    scheduler.run_forever()
+
+    assert lock.attempts == 4
+    assert lock.released
@@ -0,0 +1,36 @@
+from __future__ import annotations
+
+import asyncio
+import itertools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from todo.api import streaming
+from todo.api.streaming import iterate_in_thread
+
+
+def test_streams_beyond_the_limit_wait_for_a_thread(monkeypatch):
+    monkeypatch.setattr(streaming, "_producers", ThreadPoolExecutor(max_workers=1))
+    threads = set()
+
+    def rows(name: str):
+        for i in itertools.count():
+            threads.add(threading.current_thread().name)
+            yield f"{name}{i}"
+
+    async def scenario() -> None:
+        first = iterate_in_thread(rows("a"))
+        second = iterate_in_thread(rows("b"))
+        assert await first.__anext__() == "a0"
+
+        waiting = asyncio.ensure_future(second.__anext__())
+        await asyncio.sleep(0.2)
+        assert not waiting.done()  # the only thread streams the first export
+
+        await first.aclose()
+        assert await asyncio.wait_for(waiting, 5) == "b0"
+        await second.aclose()
+
+    asyncio.run(scenario())
+    streaming._producers.shutdown(wait=True)
+    assert len(threads) == 1
@@ -0,0 +1,210 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import select
+import signal
+import socket
+import time
+from typing import Any, List
+
+import pytest
+from sqlalchemy import create_engine, delete, event, insert
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import sessionmaker
+
+from todo.api import events
+from todo.api.controllers.events_controller import _event_stream
+from todo.api.events import END_OF_STREAM, RESET, Subscription, TaskEventBroker
+from todo.db.base import Base
+from todo.db.task_events import CHANNEL
+from todo.models import Project, Task
+from todo.repositories.task_repository import SqlAlchemyTaskRepository
+
+
+class _Request:
+    async def is_disconnected(self) -> bool:
+        return False
+
+
+class _Connection:
+    """Stands in for the psycopg2 LISTEN connection; ``dead`` fails every ping."""
+
+    def __init__(self, dead: bool = False) -> None:
+        self.dead = dead
+        self.closed = False
+        self.notifies: List[Any] = []
+        self._socket, self._peer = socket.socketpair()
+
+    def fileno(self) -> int:
+        return self._socket.fileno()
+
+    def poll(self) -> None:
+        pass
+
+    def cursor(self) -> "_Connection":
+        return self
+
+    def __enter__(self) -> "_Connection":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        pass
+
+    def execute(self, sql: str) -> None:
+        if self.dead:
+            raise OSError("server closed the connection unexpectedly")
+
+    def close(self) -> None:
+        self.closed = True
+        self._socket.close()
+        self._peer.close()
+
+
+async def _rest(stream: Any) -> List[str]:
+    return [frame async for frame in stream]
+
+
+def _subscribed(broker: TaskEventBroker, project_id: int = 1) -> Subscription:
+    sub = Subscription(project_id, broker.queue_size)
+    broker._subscriptions[project_id].add(sub)
+    return sub
+
+
+def test_end_streams_ends_open_streams():
+    async def scenario() -> List[str]:
+        broker = TaskEventBroker()
+        sub = _subscribed(broker)
+        stream = _event_stream(_Request(), broker, sub)
+        frames = [await stream.__anext__()]  # retry: ...
+        broker.end_streams()
+        frames += await asyncio.wait_for(_rest(stream), 5)
+
+        assert broker.subscriber_count() == 0
+        with pytest.raises(RuntimeError):
+            await broker.subscribe(1)
+        return frames
+
+    frames = asyncio.run(scenario())
+    assert frames[-1] is END_OF_STREAM
+    assert len(frames) == 2
+
+
+def test_end_streams_on_exit_wraps_the_server_handler():
+    received = []
+
+    def server_handler(signum: int, frame: Any) -> None:
+        received.append(signum)
+
+    original = signal.signal(signal.SIGTERM, server_handler)
+
+    async def scenario() -> Subscription:
+        broker = TaskEventBroker()
+        sub = _subscribed(broker)
+        restore = broker.end_streams_on_exit()
+        signal.raise_signal(signal.SIGTERM)
+        await asyncio.sleep(0)  # end_streams is scheduled on the loop
+        restore()
+        return sub
+
+    try:
+        sub = asyncio.run(scenario())
+        assert received == [signal.SIGTERM]
+        assert sub.ended
+        assert signal.getsignal(signal.SIGTERM) is server_handler
+    finally:
+        signal.signal(signal.SIGTERM, original)
+
+
+def test_failed_ping_reconnects_and_resets_every_stream(monkeypatch):
+    monkeypatch.setattr(events, "TASK_EVENTS_HEARTBEAT_SECONDS", 0.01)
+    monkeypatch.setattr(events, "RECONNECT_DELAYS", (0,))
+    connections = [_Connection(dead=True), _Connection()]
+    broker = TaskEventBroker()
+    monkeypatch.setattr(broker, "_connect", iter(connections).__next__)
+
+    async def scenario() -> str:
+        sub = _subscribed(broker)
+        await broker._listen()
+        frame = await asyncio.wait_for(sub.get(), 5)
+        await broker.close()
+        await asyncio.sleep(0.05)  # connections are closed on the executor
+        return frame
+
+    assert asyncio.run(scenario()) is RESET
+    assert all(conn.closed for conn in connections)
+
+
+class _Statements:
+    def __init__(self, engine: Engine) -> None:
+        self.executed: List[str] = []
+        event.listen(engine, "before_cursor_execute", self._record)
+
+    def _record(self, conn, cursor, statement, parameters, context, executemany) -> None:
+        self.executed.append(statement)
+
+
+def test_update_without_changes_writes_nothing(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path}/tasks.db")
+    Base.metadata.create_all(engine)
+    with engine.begin() as conn:
+        conn.execute(insert(Project), [{"name": "project"}])
+        conn.execute(insert(Task), [{"project_id": 1, "title": "task", "status": "todo"}])
+    repo = SqlAlchemyTaskRepository(sessionmaker(bind=engine, autoflush=False))
+    statements = _Statements(engine)
+
+    unchanged = repo.update(1, title="task", status="todo")
+    assert unchanged.version == 1
+    # no UPDATE, so the NOTIFY trigger has nothing to announce
+    assert not any(sql.startswith("UPDATE") for sql in statements.executed)
+
+    changed = repo.update(1, title="renamed")
+    assert changed.version == 2
+    engine.dispose()
+
+
+def _notifications(conn: Any, project_id: int, expected: int) -> List[dict]:
+    """The events of ``project_id`` received within a few seconds."""
+    events: List[dict] = []
+    deadline = time.monotonic() + 5
+    while len(events) < expected and time.monotonic() < deadline:
+        select.select([conn], [], [], 0.1)
+        conn.poll()
+        while conn.notifies:
+            payload = json.loads(conn.notifies.pop(0).payload)
+            if payload["project_id"] == project_id:
+                events.append(payload)
+    return events
+
+
+def test_writes_notify_from_the_trigger(postgres_engine):
+    listener = postgres_engine.raw_connection()
+    conn = listener.driver_connection
+    listener.detach()
+    conn.autocommit = True
+    with conn.cursor() as cursor:
+        cursor.execute(f"LISTEN {CHANNEL}")
+    with postgres_engine.begin() as c:
+        project_id = c.scalar(insert(Project).values(name="events test").returning(Project.id))
+    repo = SqlAlchemyTaskRepository(sessionmaker(bind=postgres_engine))
+    statements = _Statements(postgres_engine)
+
+    try:
+        task = repo.create(project_id, "task")
+        assert len(statements.executed) == 1  # the quota-checked INSERT, nothing else
+        repo.update(task.id, title="task")
+        repo.update(task.id, title="renamed")
+        with postgres_engine.begin() as c:
+            c.execute(delete(Project).where(Project.id == project_id))
+
+        events = _notifications(conn, project_id, 3)
+    finally:
+        event.remove(postgres_engine, "before_cursor_execute", statements._record)
+        conn.close()
+    assert [e["op"] for e in events] == ["created", "updated", "project_deleted"]
+    assert events[1] == {
+        "op": "updated",
+        "project_id": project_id,
+        "task_ids": [task.id],
+        "version": 2,
+    }
@@ -1,9 +1,12 @@
 from __future__ import annotations
 
-from typing import Optional
+from datetime import datetime
+from typing import Dict, List, Optional
 
 from pydantic import BaseModel, Field, ConfigDict
 
+from .task_responses import TaskRead
+
 
 class ProjectRead(BaseModel):
     """Response schema returned when reading a project."""
@@ -26,3 +29,56 @@ class ProjectRead(BaseModel):
             }
         },
     )
+
+
+class ProjectExpandedRead(ProjectRead):
+    """A project with the related data requested via ``?include=``.
+
+    Fields that were not requested are left out of the response.
+    """
+
+    tasks: Optional[List[TaskRead]] = Field(
+        None,
+        description="Tasks of the project ordered by id (include=tasks).",
+    )
+    task_count: Optional[int] = Field(
+        None,
+        description="Number of tasks in the project (include=task_count).",
+    )
+
+
+class ProjectStatsRead(BaseModel):
+    """Response schema with the task statistics of a project."""
+
+    project_id: int = Field(..., description="Identifier of the project.")
+    counts: Dict[str, int] = Field(
+        ...,
+        description="Number of tasks per status (every allowed status is present).",
+    )
+    total: int = Field(..., description="Number of tasks in the project.")
+    overdue: int = Field(
+        ...,
+        description="Open tasks (status other than done) whose deadline has passed.",
+    )
+    next_deadline: Optional[datetime] = Field(
+        None,
+        description="Earliest upcoming deadline of an open task.",
+    )
+    last_closed_at: Optional[datetime] = Field(
+        None,
+        description="When a task of the project was last closed.",
+    )
+
+    model_config = ConfigDict(
+        from_attributes=True,
+        json_schema_extra={
+            "example": {
+                "project_id": 1,
+                "counts": {"todo": 3, "doing": 1, "done": 8},
+                "total": 12,
+                "overdue": 1,
+                "next_deadline": "2025-06-01T12:00:00Z",
+                "last_closed_at": "2025-05-28T09:30:00Z",
+            }
+        },
+    )
@@ -43,3 +43,9 @@ class TaskRead(BaseModel):
             }
         },
     )
+
+
+class TaskSearchHit(TaskRead):
+    """A task matching a full-text search, with its relevance."""
+
+    rank: float = Field(..., description="Relevance of the match; higher is better.")
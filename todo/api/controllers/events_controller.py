@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import asyncio
+from typing import AsyncIterator
+
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi.responses import StreamingResponse
+
+from todo.api.dependencies import get_streaming_project_service, get_task_events
+from todo.api.events import (
+    END_OF_STREAM,
+    EVENT_STREAM_MEDIA_TYPE,
+    KEEP_ALIVE,
+    RETRY_MS,
+    Subscription,
+    TaskEventBroker,
+)
+from todo.config import TASK_EVENTS_HEARTBEAT_SECONDS
+from todo.services.async_services import AsyncProjectService
+
+router = APIRouter()
+
+
+async def _event_stream(
+    request: Request,
+    broker: TaskEventBroker,
+    sub: Subscription,
+) -> AsyncIterator[str]:
+    try:
+        yield f"retry: {RETRY_MS}\n\n"
+        while True:
+            try:
+                frame = await asyncio.wait_for(sub.get(), TASK_EVENTS_HEARTBEAT_SECONDS)
+            except asyncio.TimeoutError:
+                if await request.is_disconnected():
+                    return
+                frame = KEEP_ALIVE
+            yield frame
+            if frame is END_OF_STREAM or frame.startswith("event: project_deleted\n"):
+                return
+    finally:
+        broker.unsubscribe(sub)
+
+
+@router.get(
+    "/{project_id}/events",
+    response_class=StreamingResponse,
+    summary="Stream a project's task changes (Server-Sent Events)",
+)
+async def project_events(
+    project_id: int,
+    request: Request,
+    ps: AsyncProjectService = Depends(get_streaming_project_service),
+    broker: TaskEventBroker = Depends(get_task_events),
+):
+    """
+    Sends an event for every committed change of the project's tasks, by
+    any writer: `created`, `updated`, `closed` (status changed to done),
+    `deleted` and `project_deleted`, which ends the stream. The stream also
+    ends when the server shuts down; `EventSource` then reconnects on its
+    own. The data is one line of JSON, e.g.
+    `{"op": "updated", "version": 3, "task_ids": [7], "project_id": 1}`
+    (`version` only when a single task changed); an event lists up to 500
+    ids (`"truncated": true` and `count` beyond that).
+
+    A `reset` event means changes may have been missed (the client fell
+    behind, or the server's listener reconnected): reload the tasks with
+    `GET /projects/{project_id}/tasks`, then keep applying events.
+    """
+    if not broker.available:
+        raise HTTPException(
+            status_code=status.HTTP_501_NOT_IMPLEMENTED,
+            detail="Live events need PostgreSQL (LISTEN/NOTIFY)",
+        )
+    if await ps.get_project_version(project_id) is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Project not found",
+        )
+    try:
+        sub = await broker.subscribe(project_id)
+    except Exception:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Event listener unavailable",
+        )
+
+    headers = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    return StreamingResponse(
+        _event_stream(request, broker, sub),
+        media_type=EVENT_STREAM_MEDIA_TYPE,
+        headers=headers,
+    )
@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+from typing import List, Literal, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
+
+from todo.api.dependencies import get_export_task_service
+from todo.api.streaming import iterate_in_thread
+from todo.services.async_services import AsyncTaskService
+from todo.services.task_export import MEDIA_TYPES
+
+router = APIRouter()
+
+
+@router.get(
+    "/tasks",
+    response_class=StreamingResponse,
+    summary="Stream all tasks as NDJSON or CSV",
+)
+async def export_tasks(
+    format: Literal["ndjson", "csv"] = Query(
+        "ndjson",
+        description="ndjson: one JSON object per line; csv: with a header row.",
+    ),
+    project_id: Optional[int] = Query(None, description="Only export tasks of this project."),
+    status_filter: Optional[List[str]] = Query(
+        None,
+        alias="status",
+        description="Only export tasks with one of these statuses (repeatable).",
+    ),
+    gzip: bool = Query(False, description="Compress the body (Content-Encoding: gzip)."),
+    ts: AsyncTaskService = Depends(get_export_task_service),
+):
+    """
+    Streams the matching tasks ordered by id. Rows are read from a server-side
+    cursor while the response is sent, so memory does not grow with the export.
+    """
+    try:
+        body = await ts.export_tasks(
+            fmt=format,
+            project_id=project_id,
+            statuses=status_filter,
+            compress=gzip,
+        )
+    except LookupError:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Project not found",
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e),
+        )
+
+    headers = {"Content-Disposition": f'attachment; filename="tasks.{format}"'}
+    if gzip:
+        headers["Content-Encoding"] = "gzip"
+    # The rows' session and cursor stay on one thread for the whole export
+    return StreamingResponse(
+        iterate_in_thread(body),
+        media_type=MEDIA_TYPES[format],
+        headers=headers,
+    )
@@ -1,30 +1,109 @@
 from __future__ import annotations
 
-from typing import List
+from typing import List, Literal, Optional, Sequence, Tuple
 
-from fastapi import APIRouter, HTTPException, status
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response, status
 from ..controller_schemas.project_requests import ProjectCreate, ProjectUpdate
-from ..controller_schemas.project_responses import ProjectRead
-from todo.services.project_service import ProjectService
-from todo.services.app_factory import build_services
+from ..controller_schemas.project_responses import (
+    ProjectExpandedRead,
+    ProjectRead,
+    ProjectStatsRead,
+)
+from ..dependencies import get_project_service
+from ..etags import ETAG_HEADER, entity_etag, etag_matches, not_modified, precondition_failed
+from ..pagination import apply_page_headers
+from ..serialization import (
+    fields_query_description,
+    json_list_response,
+    json_response,
+    parse_fields,
+    sparse_adapter,
+)
+from todo.config import MAX_PAGE_SIZE
+from todo.exceptions.service_exceptions import VersionConflict
+from todo.services.async_services import AsyncProjectService
 
 # ❗ بدون prefix و بدون tags
 router = APIRouter()
 
+Include = Literal["tasks", "task_count"]
 
-def get_project_service() -> ProjectService:
-    ps, _ = build_services()
-    return ps
+
+def _fieldset(
+    fields: Optional[str],
+    include: Sequence[str],
+) -> Tuple[Optional[Tuple[str, ...]], Tuple[str, ...]]:
+    """Columns to load (None: all) and fields of the response, from ?fields= and ?include=."""
+    try:
+        selected = parse_fields(fields, ProjectRead)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e),
+        )
+    load = selected
+    names = selected or tuple(ProjectRead.model_fields)
+    if "tasks" in include:
+        # eagerly loaded by the repository (with_tasks)
+        names += ("tasks",)
+    if "task_count" in include:
+        # maintained counter on the project row: no query at all
+        names += ("task_count",)
+        if load is not None:
+            load += ("task_count",)
+    return load, names
 
 
 @router.get(
     "/",
-    response_model=List[ProjectRead],
+    response_model=List[ProjectExpandedRead],
+    description="Fields that were not requested (fields / include) are left out.",
 )
-def list_projects():
-    ps = get_project_service()
-    projects = ps.list_projects()
-    return [ProjectRead.model_validate(p) for p in projects]
+async def list_projects(
+    response: Response,
+    limit: Optional[int] = Query(
+        None,
+        ge=1,
+        le=MAX_PAGE_SIZE,
+        description="Page size. When set (or a cursor is given) the list is paginated.",
+    ),
+    cursor: Optional[str] = Query(
+        None,
+        description="Opaque cursor taken from the X-Next-Cursor header of the previous page.",
+    ),
+    total: Optional[Literal["exact", "estimate"]] = Query(
+        None,
+        description="Also return the total number of projects in X-Total-Count.",
+    ),
+    include: List[Include] = Query(
+        [],
+        description="Embed related data (repeatable): tasks and/or task_count.",
+    ),
+    fields: Optional[str] = Query(None, description=fields_query_description(ProjectRead)),
+    ps: AsyncProjectService = Depends(get_project_service),
+):
+    load, names = _fieldset(fields, include)
+    adapter = sparse_adapter(ProjectExpandedRead, names, many=True)
+    with_tasks = "tasks" in include
+    if limit is None and cursor is None and total is None:
+        projects = await ps.list_projects(with_tasks=with_tasks, fields=load)
+        return json_list_response(adapter, projects, response)
+
+    try:
+        page = await ps.list_projects_page(
+            limit=limit or MAX_PAGE_SIZE,
+            cursor=cursor,
+            total=total,
+            with_tasks=with_tasks,
+            fields=load,
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e),
+        )
+    apply_page_headers(response, page)
+    return json_list_response(adapter, page.items, response)
 
 
 @router.post(
@@ -32,10 +111,12 @@ def list_projects():
     response_model=ProjectRead,
     status_code=status.HTTP_201_CREATED,
 )
-def create_project(payload: ProjectCreate):
-    ps = get_project_service()
+async def create_project(
+    payload: ProjectCreate,
+    ps: AsyncProjectService = Depends(get_project_service),
+):
     try:
-        project = ps.create_project(
+        project = await ps.create_project(
             name=payload.name,
             description=payload.description,
         )
@@ -47,32 +128,146 @@ def create_project(payload: ProjectCreate):
         )
 
 
+# "/search" and "/stats" are declared before "/{project_id}" so they are
+# not parsed as an id
+@router.get(
+    "/search",
+    response_model=List[ProjectRead],
+    summary="Find projects by name (typeahead)",
+)
+async def search_projects(
+    q: str = Query(..., min_length=1, max_length=200, description="Name or part of it."),
+    limit: int = Query(10, ge=1, le=50, description="Maximum number of matches."),
+    ps: AsyncProjectService = Depends(get_project_service),
+):
+    """
+    Exact name first, then prefix matches, then similar names.
+    """
+    try:
+        projects = await ps.search_projects(q, limit=limit)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e),
+        )
+    return [ProjectRead.model_validate(p) for p in projects]
+
+
+@router.get(
+    "/stats",
+    response_model=List[ProjectStatsRead],
+    summary="Task statistics of every project",
+)
+async def list_project_stats(
+    ps: AsyncProjectService = Depends(get_project_service),
+):
+    """
+    Per-status counts, overdue tasks, next deadline and last closing time of
+    each project, computed by one aggregate query.
+    """
+    stats = await ps.project_stats()
+    return [ProjectStatsRead.model_validate(st) for st in stats]
+
+
 @router.get(
     "/{project_id}",
-    response_model=ProjectRead,
+    response_model=ProjectExpandedRead,
+    description="Fields that were not requested (fields / include) are left out.",
 )
-def get_project(project_id: int):
-    ps = get_project_service()
-    project = ps.get_project(project_id)
+async def get_project(
+    project_id: int,
+    response: Response,
+    if_none_match: Optional[str] = Header(
+        None,
+        description="ETag of a previous response; 304 if the project is unchanged.",
+    ),
+    include: List[Include] = Query(
+        [],
+        description="Embed related data (repeatable): tasks and/or task_count.",
+    ),
+    fields: Optional[str] = Query(None, description=fields_query_description(ProjectRead)),
+    ps: AsyncProjectService = Depends(get_project_service),
+):
+    load, names = _fieldset(fields, include)
+    # task changes do not bump the project's version: the ETag only
+    # describes the project itself
+    conditional = not include
+    if conditional and if_none_match is not None:
+        version = await ps.get_project_version(project_id)
+        if version is not None:
+            etag = entity_etag("project", project_id, version)
+            if etag_matches(if_none_match, etag):
+                return not_modified(etag)
+
+    project = await ps.get_project(project_id, with_tasks="tasks" in include, fields=load)
     if project is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Project not found",
         )
-    return ProjectRead.model_validate(project)
+    if conditional:
+        response.headers[ETAG_HEADER] = entity_etag("project", project.id, project.version)
+    return json_response(sparse_adapter(ProjectExpandedRead, names), project, response)
+
+
+@router.get(
+    "/{project_id}/stats",
+    response_model=ProjectStatsRead,
+    summary="Task statistics of a project",
+)
+async def get_project_stats(
+    project_id: int,
+    ps: AsyncProjectService = Depends(get_project_service),
+):
+    stats = await ps.get_project_stats(project_id)
+    if stats is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Project not found",
+        )
+    return ProjectStatsRead.model_validate(stats)
 
 
 @router.patch(
     "/{project_id}",
     response_model=ProjectRead,
 )
-def update_project(project_id: int, payload: ProjectUpdate):
-    ps = get_project_service()
+async def update_project(
+    project_id: int,
+    payload: ProjectUpdate,
+    response: Response,
+    if_match: Optional[str] = Header(
+        None,
+        description="Only update if the project still has this ETag (412 otherwise).",
+    ),
+    ps: AsyncProjectService = Depends(get_project_service),
+):
     update_data = payload.model_dump(exclude_unset=True)
 
+    expected_version = None
+    if if_match is not None:
+        version = await ps.get_project_version(project_id)
+        if version is None or not etag_matches(
+            if_match, entity_etag("project", project_id, version), weak=False
+        ):
+            raise precondition_failed()
+        expected_version = version
+
     try:
-        project = ps.update_project(project_id, **update_data)
+        project = await ps.update_project(
+            project_id,
+            expected_version=expected_version,
+            **update_data,
+        )
+        response.headers[ETAG_HEADER] = entity_etag("project", project.id, project.version)
         return ProjectRead.model_validate(project)
+    except VersionConflict:
+        if if_match is not None:
+            raise precondition_failed()
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Project was modified concurrently",
+        )
     except LookupError:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -89,8 +284,10 @@ def update_project(project_id: int, payload: ProjectUpdate):
     "/{project_id}",
     status_code=status.HTTP_204_NO_CONTENT,
 )
-def delete_project(project_id: int):
-    ps = get_project_service()
-    ps.delete_project(project_id)
+async def delete_project(
+    project_id: int,
+    ps: AsyncProjectService = Depends(get_project_service),
+):
+    await ps.delete_project(project_id)
     # 204 → نیازی به بدنه‌ی پاسخ نیست
     return None
@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from ..controller_schemas.task_responses import TaskRead, TaskSearchHit
+from ..dependencies import get_task_service
+from ..pagination import apply_page_headers
+from todo.config import MAX_PAGE_SIZE
+from todo.services.async_services import AsyncTaskService
+
+router = APIRouter()
+
+
+@router.get(
+    "/tasks",
+    response_model=List[TaskSearchHit],
+    summary="Full-text search over task titles and descriptions",
+)
+async def search_tasks(
+    response: Response,
+    q: str = Query(
+        ...,
+        min_length=1,
+        max_length=200,
+        description='Search terms; on PostgreSQL also "phrases", or, and -excluded words.',
+    ),
+    limit: int = Query(20, ge=1, le=MAX_PAGE_SIZE, description="Page size."),
+    cursor: Optional[str] = Query(
+        None,
+        description="Opaque cursor taken from the X-Next-Cursor header of the previous page.",
+    ),
+    ts: AsyncTaskService = Depends(get_task_service),
+):
+    """
+    Returns matching tasks of all projects, best match first.
+    """
+    try:
+        page = await ts.search_tasks(q, limit=limit, cursor=cursor)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e),
+        )
+    apply_page_headers(response, page)
+    return [
+        TaskSearchHit(**TaskRead.model_validate(task).model_dump(), rank=rank)
+        for task, rank in page.items
+    ]
@@ -1,36 +1,160 @@
 from __future__ import annotations
 
-from typing import List
+from datetime import datetime
+from typing import List, Literal, Optional
 
-from fastapi import APIRouter, HTTPException, status
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response, status
 from ..controller_schemas.task_requests import TaskCreate, TaskUpdate
 from ..controller_schemas.task_responses import TaskRead
-from todo.services.task_service import TaskService
-from todo.services.app_factory import build_services
+from ..dependencies import get_task_service
+from ..etags import (
+    ETAG_HEADER,
+    entity_etag,
+    etag_matches,
+    fingerprint_etag,
+    not_modified,
+    precondition_failed,
+)
+from ..pagination import apply_page_headers
+from ..serialization import (
+    TASK_LIST,
+    fields_query_description,
+    json_list_response,
+    json_response,
+    parse_fields,
+    sparse_adapter,
+)
+from todo.config import MAX_PAGE_SIZE
+from todo.exceptions.service_exceptions import VersionConflict
+from todo.repositories.task_repository import TaskFilter
+from todo.services.async_services import AsyncTaskService
 
 # ❗ بدون prefix و بدون tags
 router = APIRouter()
+# Custom-method routes ("/{project_id}/tasks:batch") mounted under /projects
+batch_router = APIRouter()
+
 
+def _list_etag(project_id: int, fingerprint) -> str:
+    return fingerprint_etag("tasks", project_id, *fingerprint)
 
-def get_task_service() -> TaskService:
-    _, ts = build_services()
-    return ts
+
+def _fingerprint(tasks) -> tuple[int, int, int]:
+    # same tuple as TaskRepository.list_fingerprint, from already loaded
+    # tasks or rows
+    return (
+        len(tasks),
+        max((t.id for t in tasks), default=0),
+        sum(t.version for t in tasks),
+    )
 
 
 @router.get(
     "/",
     response_model=List[TaskRead],
+    description="With `fields`, only the requested fields are returned.",
 )
-def list_tasks(project_id: int):
-    ts = get_task_service()
+async def list_tasks(
+    project_id: int,
+    response: Response,
+    limit: Optional[int] = Query(
+        None,
+        ge=1,
+        le=MAX_PAGE_SIZE,
+        description="Page size. When set (or a cursor is given) the list is paginated.",
+    ),
+    cursor: Optional[str] = Query(
+        None,
+        description="Opaque cursor taken from the X-Next-Cursor header of the previous page.",
+    ),
+    order_by: Literal["id", "-id", "deadline", "-deadline", "closed_at", "-closed_at"] = Query(
+        "id",
+        description="Sort key; '-' sorts descending. Tasks without a deadline / closed_at come last.",
+    ),
+    status_filter: Optional[List[str]] = Query(
+        None,
+        alias="status",
+        description="Only tasks with one of these statuses (repeatable).",
+    ),
+    deadline_from: Optional[datetime] = Query(
+        None,
+        description="Only tasks with a deadline at or after this time.",
+    ),
+    deadline_to: Optional[datetime] = Query(
+        None,
+        description="Only tasks with a deadline before this time.",
+    ),
+    has_deadline: Optional[bool] = Query(
+        None,
+        description="Only tasks with (true) or without (false) a deadline.",
+    ),
+    state: Optional[Literal["open", "closed"]] = Query(
+        None,
+        description="open: status is not done; closed: status is done.",
+    ),
+    total: Optional[Literal["exact", "estimate"]] = Query(
+        None,
+        description="Also return the number of tasks in the project in X-Total-Count.",
+    ),
+    fields: Optional[str] = Query(None, description=fields_query_description(TaskRead)),
+    if_none_match: Optional[str] = Header(
+        None,
+        description="ETag of a previous response; 304 if the task list is unchanged.",
+    ),
+    ts: AsyncTaskService = Depends(get_task_service),
+):
+    filters = TaskFilter(
+        statuses=status_filter or (),
+        deadline_from=deadline_from,
+        deadline_to=deadline_to,
+        has_deadline=has_deadline,
+        state=state,
+    )
+    paged = limit is not None or cursor is not None or total is not None
+    full_list = not paged and order_by == "id" and filters.is_empty()
     try:
-        tasks = ts.list_tasks(project_id)
-        return [TaskRead.model_validate(t) for t in tasks]
+        selected = parse_fields(fields, TaskRead)
+        adapter = TASK_LIST if selected is None else sparse_adapter(TaskRead, selected, many=True)
+        etag: Optional[str] = None
+        if if_none_match is not None or not full_list:
+            # the live fingerprint still equal to the client's ETag means
+            # the list is unchanged: 304 without reading any row
+            etag = _list_etag(project_id, await ts.task_list_fingerprint(project_id))
+            if etag_matches(if_none_match, etag):
+                return not_modified(etag)
+
+        if full_list:
+            # the rows may come from the read cache: tag exactly what is sent
+            rows = await ts.list_task_rows(project_id, fields=selected)
+            response.headers[ETAG_HEADER] = _list_etag(project_id, _fingerprint(rows))
+            return json_list_response(adapter, rows, response)
+
+        page = await ts.list_tasks_page(
+            project_id,
+            # unpaginated: every matching task, like the plain list
+            limit=limit or (MAX_PAGE_SIZE if paged else None),
+            cursor=cursor,
+            order_by=order_by,
+            total=total,
+            filters=filters,
+            fields=selected,
+        )
+        apply_page_headers(response, page)
+        # pages are never cached; a write between the fingerprint and the
+        # page only makes the ETag outdated, and it never matches again
+        if etag is not None:  # always computed above for pages
+            response.headers[ETAG_HEADER] = etag
+        return json_list_response(adapter, page.items, response)
     except LookupError:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Project not found",
         )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e),
+        )
 
 
 @router.post(
@@ -38,10 +162,13 @@ def list_tasks(project_id: int):
     response_model=TaskRead,
     status_code=status.HTTP_201_CREATED,
 )
-def create_task(project_id: int, payload: TaskCreate):
-    ts = get_task_service()
+async def create_task(
+    project_id: int,
+    payload: TaskCreate,
+    ts: AsyncTaskService = Depends(get_task_service),
+):
     try:
-        task = ts.create_task(
+        task = await ts.create_task(
             project_id=project_id,
             title=payload.title,
             description=payload.description,
@@ -60,36 +187,122 @@ def create_task(project_id: int, payload: TaskCreate):
         )
 
 
+@batch_router.post(
+    "/{project_id}/tasks:batch",
+    response_model=List[TaskRead],
+    status_code=status.HTTP_201_CREATED,
+)
+async def create_tasks_batch(
+    project_id: int,
+    payload: List[TaskCreate],
+    ts: AsyncTaskService = Depends(get_task_service),
+):
+    """Creates all given tasks in one transaction, or none of them."""
+    try:
+        tasks = await ts.create_tasks(
+            project_id,
+            [item.model_dump() for item in payload],
+        )
+        return [TaskRead.model_validate(t) for t in tasks]
+    except LookupError:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Project not found",
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e),
+        )
+
+
 @router.get(
     "/{task_id}",
     response_model=TaskRead,
+    description="With `fields`, only the requested fields are returned.",
 )
-def get_task(project_id: int, task_id: int):
-    ts = get_task_service()
-    task = ts.get_task(project_id, task_id)
+async def get_task(
+    project_id: int,
+    task_id: int,
+    response: Response,
+    fields: Optional[str] = Query(None, description=fields_query_description(TaskRead)),
+    if_none_match: Optional[str] = Header(
+        None,
+        description="ETag of a previous response; 304 if the task is unchanged.",
+    ),
+    ts: AsyncTaskService = Depends(get_task_service),
+):
+    try:
+        selected = parse_fields(fields, TaskRead)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e),
+        )
+
+    if if_none_match is not None:
+        # only the version is read, not the row
+        version = await ts.get_task_version(project_id, task_id)
+        if version is not None:
+            etag = entity_etag("task", task_id, version)
+            if etag_matches(if_none_match, etag):
+                return not_modified(etag)
+
+    task = await ts.get_task(project_id, task_id, fields=selected)
     if task is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Task not found",
         )
-    return TaskRead.model_validate(task)
+    response.headers[ETAG_HEADER] = entity_etag("task", task.id, task.version)
+    if selected is None:
+        return TaskRead.model_validate(task)
+    return json_response(sparse_adapter(TaskRead, selected), task, response)
 
 
 @router.patch(
     "/{task_id}",
     response_model=TaskRead,
 )
-def update_task(project_id: int, task_id: int, payload: TaskUpdate):
-    ts = get_task_service()
+async def update_task(
+    project_id: int,
+    task_id: int,
+    payload: TaskUpdate,
+    response: Response,
+    if_match: Optional[str] = Header(
+        None,
+        description="Only update if the task still has this ETag (412 otherwise).",
+    ),
+    ts: AsyncTaskService = Depends(get_task_service),
+):
     update_data = payload.model_dump(exclude_unset=True)
 
+    expected_version = None
+    if if_match is not None:
+        version = await ts.get_task_version(project_id, task_id)
+        if version is None or not etag_matches(
+            if_match, entity_etag("task", task_id, version), weak=False
+        ):
+            raise precondition_failed()
+        # re-checked by the UPDATE itself, so a concurrent write still fails
+        expected_version = version
+
     try:
-        task = ts.update_task(
+        task = await ts.update_task(
             project_id=project_id,
             task_id=task_id,
+            expected_version=expected_version,
             **update_data,
         )
+        response.headers[ETAG_HEADER] = entity_etag("task", task.id, task.version)
         return TaskRead.model_validate(task)
+    except VersionConflict:
+        if if_match is not None:
+            raise precondition_failed()
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Task was modified concurrently",
+        )
     except LookupError:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -106,7 +319,10 @@ def update_task(project_id: int, task_id: int, payload: TaskUpdate):
     "/{task_id}",
     status_code=status.HTTP_204_NO_CONTENT,
 )
-def delete_task(project_id: int, task_id: int):
-    ts = get_task_service()
-    ts.delete_task(project_id, task_id)
+async def delete_task(
+    project_id: int,
+    task_id: int,
+    ts: AsyncTaskService = Depends(get_task_service),
+):
+    await ts.delete_task(project_id, task_id)
     return None
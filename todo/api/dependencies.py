@@ -0,0 +1,144 @@
+from __future__ import annotations
+
+from typing import AsyncIterator, Iterator
+
+from fastapi import Depends, Request, Response
+
+from todo.api.events import TaskEventBroker
+from todo.config import CACHE_ENABLED, DB_ASYNC, READ_YOUR_WRITES_SECONDS
+from todo.db.session import ReadSessionLocal, SessionLocal, get_replicas
+from todo.db.unit_of_work import UnitOfWork
+from todo.services.async_services import (
+    AsyncProjectService,
+    AsyncTaskService,
+    in_threadpool,
+    on_async_session,
+)
+from todo.services.container import AppContainer, build_container
+
+
+# Cookie pinning a client's reads to the primary right after it wrote
+PRIMARY_PIN_COOKIE = "todo_read_primary"
+_READ_METHODS = ("GET", "HEAD")
+
+
+def _pinned_to_primary(request: Request, response: Response) -> bool:
+    """Whether the request must see the primary's current state.
+
+    True for writes and for the reads of a client that wrote recently:
+    writes set a short-lived cookie, and while the client sends it back its
+    reads skip the replicas and the read cache, so it always sees its own
+    updates. The cookie keeps the guarantee across worker processes without
+    shared state.
+    """
+    if request.method not in _READ_METHODS:
+        if get_replicas() or CACHE_ENABLED:
+            response.set_cookie(
+                PRIMARY_PIN_COOKIE,
+                "1",
+                max_age=READ_YOUR_WRITES_SECONDS,
+                httponly=True,
+                samesite="lax",
+            )
+        return True
+    return PRIMARY_PIN_COOKIE in request.cookies
+
+
+def get_unit_of_work(request: Request, response: Response) -> Iterator[UnitOfWork]:
+    """One session and transaction per request, shared by every repository call.
+
+    Services commit explicitly; whatever is left uncommitted (e.g. after an
+    error) is rolled back when the request finishes. Safe requests read a
+    replica unless the client is pinned to the primary (see above).
+    """
+    pinned = _pinned_to_primary(request, response)
+    factory = ReadSessionLocal if get_replicas() and not pinned else SessionLocal
+    with UnitOfWork(factory, pinned=pinned) as uow:
+        yield uow
+
+
+def get_container(request: Request) -> AppContainer:
+    """The process-wide AppContainer built by the app's lifespan (see main.py).
+
+    Override this dependency (``app.dependency_overrides[get_container]``)
+    to run the API on other repositories or services.
+    """
+    container = getattr(request.app.state, "container", None)
+    if container is None:
+        # lifespan did not run (e.g. a TestClient used without ``with``)
+        container = request.app.state.container = build_container()
+    return container
+
+
+def get_task_events(request: Request) -> TaskEventBroker:
+    """The worker's task event broker, created by the app's lifespan (see main.py)."""
+    broker = getattr(request.app.state, "task_events", None)
+    if broker is None:
+        broker = request.app.state.task_events = TaskEventBroker()
+    return broker
+
+
+# -------- sync stack (default): services run in the threadpool --------
+def _sync_project_service(
+    uow: UnitOfWork = Depends(get_unit_of_work),
+    container: AppContainer = Depends(get_container),
+) -> AsyncProjectService:
+    return in_threadpool(container.project_service, uow)
+
+
+def _sync_task_service(
+    uow: UnitOfWork = Depends(get_unit_of_work),
+    container: AppContainer = Depends(get_container),
+) -> AsyncTaskService:
+    return in_threadpool(container.task_service, uow)
+
+
+def get_export_task_service(container: AppContainer = Depends(get_container)) -> AsyncTaskService:
+    """Task service for streamed responses.
+
+    A streamed body is produced after the request's unit of work has ended,
+    so exports run without one: the repositories open their own (replica)
+    session while the body is being sent.
+    """
+    return in_threadpool(container.task_service)
+
+
+def get_streaming_project_service(container: AppContainer = Depends(get_container)) -> AsyncProjectService:
+    """Project service without a unit of work, for long-lived streams (see above)."""
+    return in_threadpool(container.project_service)
+
+
+# -------- async stack (DB_ASYNC=true): services run on an AsyncSession --------
+async def get_async_unit_of_work(request: Request, response: Response) -> AsyncIterator:
+    """Async counterpart of ``get_unit_of_work``, routing reads the same way."""
+    # imported lazily: the async engine needs the optional asyncpg driver
+    from todo.db.async_session import (
+        AsyncReadSessionLocal,
+        AsyncSessionLocal,
+        AsyncUnitOfWork,
+        get_async_replicas,
+    )
+
+    pinned = _pinned_to_primary(request, response)
+    factory = AsyncReadSessionLocal if get_async_replicas() and not pinned else AsyncSessionLocal
+    async with AsyncUnitOfWork(factory, pinned=pinned) as uow:
+        yield uow
+
+
+async def _async_project_service(
+    uow=Depends(get_async_unit_of_work),
+    container: AppContainer = Depends(get_container),
+) -> AsyncProjectService:
+    return on_async_session(uow, container.project_service)
+
+
+async def _async_task_service(
+    uow=Depends(get_async_unit_of_work),
+    container: AppContainer = Depends(get_container),
+) -> AsyncTaskService:
+    return on_async_session(uow, container.task_service)
+
+
+# Controllers depend on these; tests can swap them via app.dependency_overrides.
+get_project_service = _async_project_service if DB_ASYNC else _sync_project_service
+get_task_service = _async_task_service if DB_ASYNC else _sync_task_service
@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+import hashlib
+from typing import Optional
+
+from fastapi import HTTPException, Response, status
+
+ETAG_HEADER = "ETag"
+
+
+def entity_etag(kind: str, entity_id: int, version: int) -> str:
+    """Strong ETag of a single row, derived from its version column."""
+    return f'"{kind}-{entity_id}-v{version}"'
+
+
+def fingerprint_etag(kind: str, *parts: object) -> str:
+    """Strong ETag of a collection, derived from a fingerprint of its rows."""
+    digest = hashlib.blake2b(repr(parts).encode(), digest_size=12).hexdigest()
+    return f'"{kind}-{digest}"'
+
+
+def etag_matches(header: Optional[str], etag: str, weak: bool = True) -> bool:
+    """Evaluates an If-None-Match (``weak=True``) or If-Match header against ``etag``.
+
+    If-None-Match uses the weak comparison (a ``W/`` prefix is ignored),
+    If-Match the strong one (weak tags never match).
+    """
+    if header is None:
+        return False
+    for candidate in (c.strip() for c in header.split(",")):
+        if candidate == "*":
+            return True
+        if candidate.startswith("W/"):
+            if not weak:
+                continue
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
+
+
+def not_modified(etag: str) -> Response:
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={ETAG_HEADER: etag})
+
+
+def precondition_failed() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_412_PRECONDITION_FAILED,
+        detail="Resource has been modified",
+    )
@@ -0,0 +1,310 @@
+"""Fan-out of task change notifications to Server-Sent Events clients.
+
+Each worker process holds one ``LISTEN task_events`` connection, watched by
+the event loop itself (``add_reader``, no thread), and hands every
+notification to the subscriptions of its project. Each subscription has a
+bounded queue: a client that stops reading never blocks the listener or
+the other clients. Once its queue is full, its backlog is replaced by a
+single ``reset`` event telling it to reload the project's tasks, which is
+also what every client gets after the listener reconnected (notifications
+sent meanwhile are lost). A connection that dies silently never becomes
+readable, so the listener also runs a ``SELECT 1`` on it every
+``TASK_EVENTS_HEARTBEAT_SECONDS`` and reconnects when that fails.
+
+Streams never end on their own, while uvicorn only runs the lifespan
+shutdown once every open response has finished: ``end_streams_on_exit``
+ends them as soon as the worker is told to stop.
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import signal
+import threading
+from collections import defaultdict
+from typing import Any, Callable, Dict, Optional, Set
+
+from sqlalchemy.engine import Engine
+
+from todo.config import (
+    TASK_EVENTS_ENABLED,
+    TASK_EVENTS_HEARTBEAT_SECONDS,
+    TASK_EVENTS_QUEUE_SIZE,
+)
+from todo.db.session import get_engine
+from todo.db.task_events import CHANNEL
+
+EVENT_STREAM_MEDIA_TYPE = "text/event-stream"
+# Client reconnect delay announced at the start of a stream (milliseconds)
+RETRY_MS = 3000
+# Listener reconnect backoff (seconds)
+RECONNECT_DELAYS = (1, 2, 5, 10, 30)
+# A listener ``SELECT 1`` taking longer than this counts as a lost connection
+PING_TIMEOUT = 5
+
+
+def format_sse(event: str, data: str) -> str:
+    """One SSE frame; ``data`` must be a single line (compact JSON is)."""
+    return f"event: {event}\ndata: {data}\n\n"
+
+
+RESET = format_sse("reset", "{}")
+KEEP_ALIVE = ": keep-alive\n\n"
+# Last frame of a stream ended by the server; EventSource then reconnects
+# (to another worker) after RETRY_MS
+END_OF_STREAM = ": end of stream\n\n"
+
+
+class Subscription:
+    """One client's bounded queue of pre-formatted SSE frames."""
+
+    def __init__(self, project_id: int, maxsize: int) -> None:
+        self.project_id = project_id
+        self._queue: asyncio.Queue[str] = asyncio.Queue(maxsize)
+        self.resets = 0
+        self.ended = False
+
+    async def get(self) -> str:
+        return await self._queue.get()
+
+    def offer(self, frame: str) -> None:
+        """Queues ``frame`` without ever waiting (called by the listener)."""
+        if self.ended:
+            return
+        try:
+            self._queue.put_nowait(frame)
+        except asyncio.QueueFull:
+            self.reset()
+
+    def reset(self) -> None:
+        """Drops the backlog; the client is told to reload instead."""
+        if self.ended:
+            return
+        self._clear()
+        self._queue.put_nowait(RESET)
+        self.resets += 1
+
+    def end(self) -> None:
+        """Drops the backlog and queues END_OF_STREAM, the last frame sent."""
+        if self.ended:
+            return
+        self.ended = True
+        self._clear()
+        self._queue.put_nowait(END_OF_STREAM)
+
+    def _clear(self) -> None:
+        while not self._queue.empty():
+            self._queue.get_nowait()
+
+
+class TaskEventBroker:
+    """The worker's LISTEN connection and the subscriptions it feeds."""
+
+    def __init__(
+        self,
+        engine_factory: Callable[[], Engine] = get_engine,
+        queue_size: int = TASK_EVENTS_QUEUE_SIZE,
+    ) -> None:
+        self._engine_factory = engine_factory
+        self.queue_size = queue_size
+        self._subscriptions: Dict[int, Set[Subscription]] = defaultdict(set)
+        self._conn: Any = None  # DBAPI (psycopg2) connection
+        self._fd: Optional[int] = None
+        self._lock = asyncio.Lock()
+        self._reconnecting: Optional[asyncio.Task] = None
+        self._pinging: Optional[asyncio.Task] = None
+        self._closed = False
+
+    @property
+    def available(self) -> bool:
+        """Whether there are events to stream (Postgres with events enabled)."""
+        return TASK_EVENTS_ENABLED and self._engine_factory().dialect.name == "postgresql"
+
+    def subscriber_count(self) -> int:
+        return sum(len(subs) for subs in self._subscriptions.values())
+
+    async def subscribe(self, project_id: int) -> Subscription:
+        """Registers a client of ``project_id``, starting the listener on first use.
+
+        Raises RuntimeError once the broker is shutting down.
+        """
+        if self._closed:
+            raise RuntimeError("Task event broker is closed")
+        if self._conn is None and self._reconnecting is None:
+            async with self._lock:
+                if self._conn is None:
+                    await self._listen()
+        sub = Subscription(project_id, self.queue_size)
+        self._subscriptions[project_id].add(sub)
+        return sub
+
+    def unsubscribe(self, sub: Subscription) -> None:
+        subs = self._subscriptions.get(sub.project_id)
+        if subs is not None:
+            subs.discard(sub)
+            if not subs:
+                del self._subscriptions[sub.project_id]
+
+    def end_streams(self) -> None:
+        """Ends every open stream and refuses new ones (worker shutdown)."""
+        self._closed = True
+        for subs in self._subscriptions.values():
+            for sub in subs:
+                sub.end()
+
+    def end_streams_on_exit(self) -> Callable[[], None]:
+        """Calls ``end_streams`` when the worker gets SIGINT or SIGTERM.
+
+        Wraps the handlers the server installed (uvicorn's ``handle_exit``),
+        which still run afterwards; a signal without a Python handler is left
+        alone. Returns a function that puts the wrapped handlers back. Signal
+        handlers can only be set from the main thread; elsewhere (e.g. the
+        TestClient's portal) this does nothing.
+        """
+        if threading.current_thread() is not threading.main_thread():
+            return lambda: None
+        loop = asyncio.get_running_loop()
+        wrapped: Dict[int, Callable] = {}
+
+        def on_exit(signum: int, frame: Any) -> None:
+            loop.call_soon_threadsafe(self.end_streams)
+            wrapped[signum](signum, frame)
+
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            previous = signal.getsignal(sig)
+            if callable(previous):
+                wrapped[sig] = previous
+                signal.signal(sig, on_exit)
+
+        def restore() -> None:
+            for sig, previous in wrapped.items():
+                if signal.getsignal(sig) is on_exit:
+                    signal.signal(sig, previous)
+
+        return restore
+
+    async def close(self) -> None:
+        self.end_streams()
+        for task in (self._reconnecting, self._pinging):
+            if task is not None:
+                task.cancel()
+        self._reconnecting = self._pinging = None
+        self._disconnect()
+
+    # -------- listener connection --------
+    async def _listen(self) -> None:
+        loop = asyncio.get_running_loop()
+        conn = await loop.run_in_executor(None, self._connect)
+        if self._closed:
+            _close_quietly(conn)
+            raise RuntimeError("Task event broker is closed")
+        fd = conn.fileno()
+        self._conn, self._fd = conn, fd
+        loop.add_reader(fd, self._on_readable)
+        if self._pinging is None:
+            self._pinging = loop.create_task(self._ping_forever())
+
+    def _connect(self) -> Any:
+        # detached from the pool: the connection lives as long as the worker
+        # and must not count against (or be recycled by) the request pool
+        proxied = self._engine_factory().raw_connection()
+        conn: Any = proxied.driver_connection
+        proxied.detach()
+        conn.autocommit = True
+        with conn.cursor() as cursor:
+            cursor.execute(f"LISTEN {CHANNEL}")
+        return conn
+
+    def _on_readable(self) -> None:
+        try:
+            self._conn.poll()
+        except Exception:
+            self._lost()
+            return
+        self._drain()
+
+    def _drain(self) -> None:
+        while self._conn.notifies:
+            self._dispatch(self._conn.notifies.pop(0).payload)
+
+    async def _ping_forever(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            await asyncio.sleep(TASK_EVENTS_HEARTBEAT_SECONDS)
+            conn, fd = self._conn, self._fd
+            if conn is None or fd is None:  # reconnecting
+                continue
+            # the ping runs on an executor thread: the loop must not poll the
+            # connection meanwhile; notifications it receives are kept in
+            # conn.notifies and dispatched right after
+            loop.remove_reader(fd)
+            try:
+                await asyncio.wait_for(loop.run_in_executor(None, _ping, conn), PING_TIMEOUT)
+            except Exception:
+                if self._conn is conn:
+                    self._lost()
+                continue
+            if self._conn is conn:
+                loop.add_reader(fd, self._on_readable)
+                self._drain()
+
+    def _lost(self) -> None:
+        """Drops a failed connection and reconnects in the background."""
+        self._disconnect()
+        if not self._closed and self._reconnecting is None:
+            self._reconnecting = asyncio.get_running_loop().create_task(self._reconnect())
+
+    def _dispatch(self, payload: str) -> None:
+        try:
+            event = json.loads(payload)
+            subs = self._subscriptions.get(event["project_id"])
+            op = event["op"]
+        except (ValueError, KeyError, TypeError):
+            return
+        if not subs:
+            return
+        # formatted once, shared by every client of the project
+        frame = format_sse(op, payload)
+        for sub in tuple(subs):
+            sub.offer(frame)
+
+    async def _reconnect(self) -> None:
+        attempt = 0
+        while True:
+            await asyncio.sleep(RECONNECT_DELAYS[min(attempt, len(RECONNECT_DELAYS) - 1)])
+            if self._closed:
+                return
+            try:
+                await self._listen()
+            except Exception:
+                attempt += 1
+                continue
+            break
+        self._reconnecting = None
+        for subs in self._subscriptions.values():
+            for sub in subs:
+                sub.reset()
+
+    def _disconnect(self) -> None:
+        conn, fd = self._conn, self._fd
+        self._conn = self._fd = None
+        if conn is None:
+            return
+        loop = asyncio.get_running_loop()
+        if fd is not None:
+            loop.remove_reader(fd)
+        # a ping that timed out may still hold the connection: close it on
+        # an executor thread rather than block the loop behind it
+        loop.run_in_executor(None, _close_quietly, conn)
+
+
+def _ping(conn: Any) -> None:
+    with conn.cursor() as cursor:
+        cursor.execute("SELECT 1")
+
+
+def _close_quietly(conn: Any) -> None:
+    try:
+        conn.close()
+    except Exception:
+        pass
@@ -0,0 +1,20 @@
+from __future__ import annotations
+
+from fastapi import Response
+
+from todo.repositories.pagination import Page
+
+# Response headers carrying keyset pagination metadata. List endpoints keep
+# returning a plain JSON array so existing clients are unaffected.
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+TOTAL_COUNT_HEADER = "X-Total-Count"
+TOTAL_ESTIMATED_HEADER = "X-Total-Count-Estimated"
+
+
+def apply_page_headers(response: Response, page: Page) -> None:
+    """Copies cursor and total information of ``page`` onto ``response``."""
+    if page.next_cursor is not None:
+        response.headers[NEXT_CURSOR_HEADER] = page.next_cursor
+    if page.total is not None:
+        response.headers[TOTAL_COUNT_HEADER] = str(page.total)
+        response.headers[TOTAL_ESTIMATED_HEADER] = "true" if page.total_is_estimate else "false"
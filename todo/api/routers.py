@@ -1,5 +1,12 @@
 from fastapi import APIRouter
-from .controllers import project_controller, task_controller, maintenance_controller
+from .controllers import (
+    events_controller,
+    export_controller,
+    maintenance_controller,
+    project_controller,
+    search_controller,
+    task_controller,
+)
 
 router = APIRouter()
 
@@ -16,6 +23,18 @@ router.include_router(
     prefix="/projects/{project_id}/tasks",
     tags=["Tasks"],
 )
+router.include_router(
+    task_controller.batch_router,
+    prefix="/projects",
+    tags=["Tasks"],
+)
+
+# Live task changes (Server-Sent Events)
+router.include_router(
+    events_controller.router,
+    prefix="/projects",
+    tags=["Events"],
+)
 
 # Maintenance (autoclose)
 router.include_router(
@@ -23,3 +42,17 @@ router.include_router(
     prefix="/maintenance",
     tags=["Maintenance"],
 )
+
+# Streaming exports
+router.include_router(
+    export_controller.router,
+    prefix="/export",
+    tags=["Export"],
+)
+
+# Search
+router.include_router(
+    search_controller.router,
+    prefix="/search",
+    tags=["Search"],
+)
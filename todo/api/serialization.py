@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Type
+
+from fastapi import Response
+from pydantic import BaseModel, ConfigDict, TypeAdapter, create_model
+
+from .controller_schemas.task_responses import TaskRead
+
+JSON_MEDIA_TYPE = "application/json"
+
+# Built once: creating a TypeAdapter compiles its validator and serializer
+TASK_LIST = TypeAdapter(List[TaskRead])
+
+
+def parse_fields(raw: Optional[str], model: Type[BaseModel]) -> Optional[Tuple[str, ...]]:
+    """Parses a ``?fields=a,b`` sparse fieldset into field names of ``model``.
+
+    Returns None (all fields) when the parameter is absent; the names come
+    back in schema order. Raises ValueError for unknown or missing names.
+    """
+    if raw is None:
+        return None
+    requested = {name.strip() for name in raw.split(",") if name.strip()}
+    if not requested:
+        raise ValueError("fields must name at least one field")
+    unknown = requested - set(model.model_fields)
+    if unknown:
+        raise ValueError(f"Unknown field(s): {', '.join(sorted(unknown))}")
+    return tuple(name for name in model.model_fields if name in requested)
+
+
+@lru_cache(maxsize=256)
+def sparse_model(model: Type[BaseModel], fields: Tuple[str, ...]) -> Type[BaseModel]:
+    """``model`` reduced to ``fields``; built once per fieldset."""
+    definitions: Dict[str, Any] = {
+        name: (model.model_fields[name].annotation, ...) for name in fields
+    }
+    return create_model(
+        f"{model.__name__}Fields",
+        __config__=ConfigDict(from_attributes=True),
+        **definitions,
+    )
+
+
+@lru_cache(maxsize=256)
+def sparse_adapter(
+    model: Type[BaseModel],
+    fields: Tuple[str, ...],
+    many: bool = False,
+) -> TypeAdapter:
+    """TypeAdapter for one (or a list of) ``model`` restricted to ``fields``."""
+    partial = sparse_model(model, fields)
+    # built at runtime, so mypy cannot check it as a type
+    return TypeAdapter(List[partial] if many else partial)  # type: ignore[valid-type]
+
+
+def json_response(adapter: TypeAdapter, content: Any, response: Response) -> Response:
+    """Validates ``content`` in one pass and returns it as an encoded JSON response.
+
+    ``content`` may hold ORM instances or column rows (read by attribute).
+    By default FastAPI validates a returned value once more against the
+    route's ``response_model`` and encodes it via ``jsonable_encoder`` and
+    ``json.dumps``; here pydantic-core validates and writes the JSON bytes
+    directly. The route keeps its ``response_model`` for the OpenAPI schema.
+
+    Headers already set on ``response`` (ETag, pagination) are carried over,
+    as FastAPI does not merge them into a returned Response.
+    """
+    body = adapter.dump_json(adapter.validate_python(content, from_attributes=True))
+    out = Response(content=body, media_type=JSON_MEDIA_TYPE)
+    out.headers.raw.extend(response.headers.raw)
+    return out
+
+
+def json_list_response(adapter: TypeAdapter, items: Iterable[Any], response: Response) -> Response:
+    """``json_response`` for a list endpoint."""
+    return json_response(adapter, list(items), response)
+
+
+def fields_query_description(model: Type[BaseModel]) -> str:
+    return (
+        "Comma-separated sparse fieldset; the response only contains these fields "
+        f"and only their columns are read. One or more of: {', '.join(model.model_fields)}."
+    )
@@ -0,0 +1,86 @@
+"""Streaming a blocking iterator from one dedicated thread.
+
+Starlette advances a sync body iterator with ``iterate_in_threadpool``, i.e.
+every chunk may be pulled on a different threadpool thread. That is wrong
+for iterators holding a Session and a server-side cursor, which belong to
+the thread that opened them. ``iterate_in_thread`` runs the whole iterator,
+from its first ``next`` to its ``close``, on a thread of its own and hands
+the chunks over through a small bounded queue, so a slow client also slows
+down the reads instead of buffering the export in memory.
+
+The threads come from one bounded executor per worker
+(``EXPORT_MAX_CONCURRENT``, by default the connection pool's size): each
+stream holds a connection until it ends, so further streams wait for a
+free thread instead of opening threads and draining the pool without limit.
+"""
+from __future__ import annotations
+
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import AsyncIterator, Iterator, TypeVar
+
+from todo.config import EXPORT_MAX_CONCURRENT
+
+T = TypeVar("T")
+
+# Chunks read ahead of the client
+QUEUE_SIZE = 4
+
+_DONE = object()
+
+_producers = ThreadPoolExecutor(
+    max_workers=max(EXPORT_MAX_CONCURRENT, 1),
+    thread_name_prefix="stream-producer",
+)
+
+
+class _Failed:
+    def __init__(self, error: BaseException) -> None:
+        self.error = error
+
+
+async def iterate_in_thread(iterator: Iterator[T], maxsize: int = QUEUE_SIZE) -> AsyncIterator[T]:
+    """Yields the items of ``iterator``, which is only ever touched by one thread."""
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue = asyncio.Queue(maxsize)
+    stop = threading.Event()
+
+    def put(item: object) -> None:
+        # blocks while the queue is full
+        asyncio.run_coroutine_threadsafe(queue.put(item), loop).result()
+
+    def produce() -> None:
+        try:
+            if stop.is_set():  # client gone while waiting for a thread
+                return
+            for item in iterator:
+                if stop.is_set():
+                    break
+                put(item)
+        except BaseException as e:  # re-raised by the consumer
+            if not stop.is_set():
+                put(_Failed(e))
+            return
+        finally:
+            close = getattr(iterator, "close", None)
+            if close is not None:
+                close()
+        if not stop.is_set():
+            put(_DONE)
+
+    _producers.submit(produce)
+    try:
+        while True:
+            item = await queue.get()
+            if item is _DONE:
+                return
+            if isinstance(item, _Failed):
+                raise item.error
+            yield item
+    finally:
+        # client gone or stream finished: unblock a pending put; the
+        # producer then stops and closes the iterator on its own thread
+        stop.set()
+        while not queue.empty():
+            queue.get_nowait()
@@ -1,48 +1,196 @@
 from __future__ import annotations
-from datetime import datetime
-from todo.services.app_factory import build_services
-from todo.repositories.task_repository import SqlAlchemyTaskRepository
-from todo.db.session import SessionLocal
+
+import argparse
+import multiprocessing
 import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
 
+from todo.services.app_factory import build_services
 
-def run(dry_run: bool = False) -> int:
-    # Build the service instances
-    ps, ts = build_services()
-    task_repo = SqlAlchemyTaskRepository(SessionLocal)
+# How many overdue tasks a dry-run prints
+DRY_RUN_SAMPLE_SIZE = 10
+# Rows per transaction of each worker when --workers comes without --batch-size
+DEFAULT_WORKER_BATCH_SIZE = 1000
 
-    # Get the overdue tasks
-    candidates = list(task_repo.list_overdue_open())  # ✅ Sized
-    if not candidates:
-        print("No overdue open tasks.")
-        return 0
 
-    print(f"Found {len(candidates)} overdue open tasks.")
-    affected = 0
+@dataclass
+class AutocloseStats:
+    closed: int
+    batches: int
+    seconds: float
+
+    @property
+    def rate(self) -> float:
+        """Tasks closed per second."""
+        return self.closed / self.seconds if self.seconds else 0.0
 
-    for t in candidates:
-        if dry_run:
-            print(f"DRY-RUN would close: [#{t.id}] {t.title} (deadline={t.deadline})")
-            continue
 
-        # Update task to 'done' status and set closed_at
-        ts.update_task_status(
-            task_id=t.id,
-            status="done",
-            closed_at=datetime.utcnow()
+def run(
+    dry_run: bool = False,
+    batch_size: Optional[int] = None,
+    limit: Optional[int] = None,
+    workers: int = 1,
+) -> int:
+    """Close all overdue, non-done tasks and return how many were closed.
+
+    Tasks are closed by the repository with set-based UPDATEs, either all at
+    once or ``batch_size`` rows per transaction; each committed batch is
+    reported as it finishes. With ``workers`` > 1 that many processes close
+    disjoint batches concurrently (see ``run_workers``).
+    """
+    if workers > 1 and not dry_run:
+        total, per_worker = run_workers(
+            workers,
+            batch_size or DEFAULT_WORKER_BATCH_SIZE,
+            limit=limit,
+        )
+        for number, stats in enumerate(per_worker, 1):
+            print(
+                f"Worker {number}: closed {stats.closed} tasks in {stats.batches} batches "
+                f"({stats.rate:.0f} tasks/s)"
+            )
+        if not total.closed:
+            print("No overdue open tasks.")
+            return 0
+        print(
+            f"Done. Closed {total.closed} tasks with {workers} workers in "
+            f"{total.seconds:.1f}s ({total.rate:.0f} tasks/s)."
         )
+        return total.closed
 
-        print(f"Closed: [#{t.id}] {t.title}")
-        affected += 1
+    _, ts = build_services()
 
     if dry_run:
+        overdue = ts.count_overdue_open()
+        if limit is not None:
+            overdue = min(overdue, limit)
+        if not overdue:
+            print("No overdue open tasks.")
+            return 0
+
+        print(f"Dry-run: would close {overdue} overdue open tasks, for example:")
+        for t in ts.list_overdue_open(limit=min(overdue, DRY_RUN_SAMPLE_SIZE)):
+            print(f"- [#{t.id}] {t.title} (deadline={t.deadline})")
         print("Dry-run done. No changes committed.")
         return 0
 
+    affected = 0
+    for ids in ts.iter_autoclose_overdue(batch_size=batch_size, limit=limit):
+        affected += len(ids)
+        print(f"Closed {len(ids)} tasks (total {affected}): {_format_ids(ids)}")
+
+    if not affected:
+        print("No overdue open tasks.")
+        return 0
+
     print(f"Done. Closed {affected} tasks.")
     return affected
 
 
+def run_workers(
+    workers: int,
+    batch_size: int,
+    limit: Optional[int] = None,
+    verbose: bool = True,
+) -> Tuple[AutocloseStats, List[AutocloseStats]]:
+    """Close overdue tasks with a pool of ``workers`` processes.
+
+    Each worker claims ``batch_size`` tasks at a time with ``SELECT ... FOR
+    UPDATE SKIP LOCKED``, closes them and commits, until none is left; a
+    ``limit`` is split evenly between the workers. As every batch is its own
+    transaction, an interrupted run keeps what it committed and can simply be
+    started again. Returns the aggregate (wall clock) and per-worker stats.
+    """
+    if limit is None:
+        limits: List[Optional[int]] = [None] * workers
+    else:
+        share, extra = divmod(limit, workers)
+        limits = [share + (1 if i < extra else 0) for i in range(workers)]
+
+    # spawn: every worker opens its own engine and connection
+    context = multiprocessing.get_context("spawn")
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+        futures = [
+            pool.submit(_close_as_worker, number, batch_size, worker_limit, verbose)
+            for number, worker_limit in enumerate(limits, 1)
+        ]
+        per_worker = [f.result() for f in futures]
+    total = AutocloseStats(
+        closed=sum(s.closed for s in per_worker),
+        batches=sum(s.batches for s in per_worker),
+        seconds=time.perf_counter() - start,
+    )
+    return total, per_worker
+
+
+def _close_as_worker(
+    number: int,
+    batch_size: int,
+    limit: Optional[int],
+    verbose: bool,
+) -> AutocloseStats:
+    _, ts = build_services()
+    start = time.perf_counter()
+    closed = batches = 0
+    for ids in ts.iter_autoclose_overdue(batch_size=batch_size, limit=limit, skip_locked=True):
+        closed += len(ids)
+        batches += 1
+        if verbose:
+            print(f"[worker {number}] closed {len(ids)} tasks (total {closed})", flush=True)
+    return AutocloseStats(closed, batches, time.perf_counter() - start)
+
+
+def _format_ids(ids: list[int], shown: int = 10) -> str:
+    head = ", ".join(f"#{i}" for i in ids[:shown])
+    return head if len(ids) <= shown else f"{head}, ... (+{len(ids) - shown} more)"
+
+
+def _positive_int(raw: str) -> int:
+    value = int(raw)
+    if value < 1:
+        raise argparse.ArgumentTypeError("must be a positive integer")
+    return value
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Close overdue open tasks.")
+    parser.add_argument(
+        "--dry", "--dry-run",
+        dest="dry_run",
+        action="store_true",
+        help="only count overdue tasks and print a sample",
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=_positive_int,
+        default=None,
+        help="close at most this many tasks per transaction (default: one statement)",
+    )
+    parser.add_argument(
+        "--limit",
+        type=_positive_int,
+        default=None,
+        help="stop after closing this many tasks",
+    )
+    parser.add_argument(
+        "--workers",
+        type=_positive_int,
+        default=1,
+        help="close concurrently with this many processes, each claiming its own "
+        f"batches (default batch size {DEFAULT_WORKER_BATCH_SIZE})",
+    )
+    args = parser.parse_args(argv)
+    return run(
+        dry_run=args.dry_run,
+        batch_size=args.batch_size,
+        limit=args.limit,
+        workers=args.workers,
+    )
+
+
 if __name__ == "__main__":
-    dry = any(a in ("--dry", "--dry-run") for a in sys.argv[1:])
-    run(dry_run=dry)
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+import importlib.util
+import sys
+import time
+from typing import Any, Callable, Optional
+
+from main import app
+from todo.api import dependencies as deps
+from todo.services.container import build_container
+
+# Endpoints exercised per stack: one row, and a project's task list
+PATHS = ("/projects/{id}", "/projects/{id}/tasks/")
+
+
+async def _get(app: Any, path: str) -> int:
+    """Sends one GET straight to the ASGI app (no socket, no HTTP client)."""
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": b"",
+        "root_path": "",
+        "headers": [(b"host", b"benchmark")],
+        "client": ("127.0.0.1", 0),
+        "server": ("benchmark", 80),
+    }
+    status = 0
+
+    async def receive() -> dict:
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message: dict) -> None:
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+
+    await app(scope, receive, send)
+    return status
+
+
+async def _drive(app: Any, path: str, requests: int, concurrency: int) -> float:
+    """Requests per second with ``concurrency`` clients sharing ``requests``."""
+    remaining = requests
+    failures = []
+
+    async def client() -> None:
+        nonlocal remaining
+        while remaining > 0:
+            remaining -= 1
+            status = await _get(app, path)
+            if status != 200:
+                failures.append(status)
+
+    await _get(app, path)  # warm up pools and caches of compiled statements
+    start = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    if failures:
+        raise RuntimeError(f"GET {path} answered {failures[0]} ({len(failures)} failures)")
+    return requests / elapsed
+
+
+def _stacks() -> dict[str, tuple[Callable, Callable]]:
+    stacks: dict[str, tuple[Callable, Callable]] = {
+        "sync (threadpool)": (deps._sync_project_service, deps._sync_task_service),
+    }
+    if importlib.util.find_spec("asyncpg") is None:
+        print("asyncpg is not installed (the 'async' extra); skipping the async stack.\n")
+    else:
+        stacks["async (AsyncEngine)"] = (deps._async_project_service, deps._async_task_service)
+    return stacks
+
+
+async def _compare(project_id: int, requests: int, concurrency: int) -> None:
+    stacks = _stacks()
+    print(f"{'stack':<22} " + " ".join(f"{p:>24}" for p in PATHS))
+    for name, (project_service, task_service) in stacks.items():
+        app.dependency_overrides[deps.get_project_service] = project_service
+        app.dependency_overrides[deps.get_task_service] = task_service
+        rates = [
+            await _drive(app, path.format(id=project_id), requests, concurrency)
+            for path in PATHS
+        ]
+        print(f"{name:<22} " + " ".join(f"{r:>18.0f} req/s" for r in rates))
+
+
+def run(
+    project_id: Optional[int] = None,
+    requests: int = 2000,
+    concurrency: int = 32,
+) -> int:
+    """Print the requests/second of both database stacks on the same endpoints.
+
+    Requests go straight into the ASGI app, so the numbers leave out the
+    HTTP server and network but include routing, validation, the database
+    round trips and serialization. The read cache is off for both stacks.
+    Reads an existing project (the first one by default); nothing is written.
+    """
+    container = app.state.container = build_container(cache_enabled=False)
+    try:
+        if project_id is None:
+            page = container.project_service.list_projects_page(limit=1)
+            if not page.items:
+                print("No project to read; create one or pass --project.")
+                return 1
+            project_id = page.items[0].id
+
+        print(f"project #{project_id}: {requests} requests, {concurrency} concurrent clients\n")
+        # one event loop for everything: the async engine's pool is bound to it
+        asyncio.run(_compare(project_id, requests, concurrency))
+    finally:
+        app.dependency_overrides.clear()
+        container.close()
+    return 0
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Compare the request throughput of the sync and async database stacks.",
+    )
+    parser.add_argument("--project", type=int, default=None, help="project to read (default: first)")
+    parser.add_argument("--requests", type=int, default=2000, help="per endpoint and stack")
+    parser.add_argument("--concurrency", type=int, default=32, help="concurrent clients")
+    args = parser.parse_args(argv)
+    return run(project_id=args.project, requests=args.requests, concurrency=args.concurrency)
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
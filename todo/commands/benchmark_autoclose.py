@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+import argparse
+import sys
+from typing import Optional
+
+from sqlalchemy import func, select, text
+from sqlalchemy.engine import Connection
+
+from todo.commands.autoclose_overdue import run_workers
+from todo.db.session import get_engine
+from todo.models.task import Task
+
+SEED_PROJECT = "autoclose-benchmark-seed"
+
+
+def _seed(conn: Connection, tasks: int) -> int:
+    project_id = conn.execute(
+        text("INSERT INTO projects (name) VALUES (:name) RETURNING id"),
+        {"name": SEED_PROJECT},
+    ).scalar_one()
+    conn.execute(
+        text(
+            """
+            INSERT INTO tasks (project_id, title, status, deadline)
+            SELECT :project_id, 'overdue ' || g, 'todo',
+                   now() - interval '1 day' - g * interval '1 second'
+            FROM generate_series(1, :n) AS g
+            """
+        ),
+        {"project_id": project_id, "n": tasks},
+    )
+    conn.execute(text("ANALYZE tasks"))
+    return project_id
+
+
+def _overdue_open(conn: Connection) -> int:
+    return conn.execute(
+        select(func.count())
+        .select_from(Task)
+        .where(Task.status != "done", Task.deadline < func.now())
+    ).scalar_one()
+
+
+def run(
+    tasks: int = 200_000,
+    workers: tuple[int, ...] = (1, 2, 4, 8),
+    batch_size: int = 1000,
+) -> int:
+    """Close ``tasks`` seeded overdue tasks with each worker count and print the scaling.
+
+    The workers close *every* overdue task, so the benchmark refuses to run
+    while the database holds overdue open tasks of its own; use a scratch
+    database. The seed project (and its tasks) is deleted after each run.
+    Wall times include starting the worker processes.
+    """
+    engine = get_engine()
+    if engine.dialect.name != "postgresql":
+        print(f"Needs PostgreSQL (SKIP LOCKED), not {engine.dialect.name}.")
+        return 0
+    with engine.connect() as conn:
+        existing = _overdue_open(conn)
+    if existing:
+        print(f"The database already holds {existing} overdue open tasks; use a scratch database.")
+        return 1
+
+    print(f"{tasks} overdue tasks per run, batches of {batch_size}\n")
+    print(f"{'workers':>7} {'seconds':>8} {'tasks/s':>9} {'speedup':>8} {'efficiency':>10}")
+    baseline = None
+    for count in workers:
+        with engine.begin() as conn:
+            project_id = _seed(conn, tasks)
+        try:
+            total, _ = run_workers(count, batch_size, verbose=False)
+        finally:
+            with engine.begin() as conn:
+                conn.execute(text("DELETE FROM projects WHERE id = :id"), {"id": project_id})
+        if total.closed != tasks:
+            print(f"{count:>7} closed {total.closed} of {tasks} tasks; aborting.")
+            return 1
+        baseline = baseline or total.rate
+        speedup = total.rate / baseline
+        print(
+            f"{count:>7} {total.seconds:>8.2f} {total.rate:>9.0f} "
+            f"{speedup:>7.2f}x {speedup / count:>9.0%}"
+        )
+    return 0
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Benchmark parallel autoclose workers on seeded overdue tasks (scratch database).",
+    )
+    parser.add_argument("--tasks", type=int, default=200_000, help="seeded per run")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        nargs="+",
+        default=[1, 2, 4, 8],
+        help="worker counts to compare; the first is the baseline",
+    )
+    parser.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args(argv)
+    return run(tasks=args.tasks, workers=tuple(args.workers), batch_size=args.batch_size)
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
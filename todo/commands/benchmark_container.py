@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+import argparse
+import statistics
+import sys
+import time
+from typing import Callable, Optional
+
+from todo.db.unit_of_work import UnitOfWork, bind_unit_of_work
+from todo.services.app_factory import build_services
+from todo.services.async_services import in_threadpool
+from todo.services.container import build_container
+
+
+def _time(fn: Callable[[], object], requests: int, repeat: int) -> float:
+    """Median cost of one call of ``fn`` in microseconds."""
+    runs = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(requests):
+            fn()
+        runs.append((time.perf_counter() - start) / requests * 1e6)
+    return statistics.median(runs)
+
+
+def run(requests: int = 100_000, repeat: int = 5) -> int:
+    """Print the per-request cost of providing a service, before and after the container.
+
+    Before, each request built two repositories and two services (with the
+    read cache, two more wrappers) for each service dependency. No database
+    is needed: nothing here opens a session.
+    """
+    uow = UnitOfWork()
+    container = build_container()
+
+    def before() -> object:
+        ps, _ = build_services(uow)
+        return in_threadpool(ps)
+
+    def after() -> object:
+        return in_threadpool(container.project_service, uow)
+
+    def bind() -> object:
+        # paid once per service call instead
+        with bind_unit_of_work(uow):
+            return None
+
+    print(f"{requests} requests, median of {repeat} runs\n")
+    print(f"{'provider':<36} {'us/request':>10}")
+    old = _time(before, requests, repeat)
+    new = _time(after, requests, repeat)
+    print(f"{'before: build_services per request':<36} {old:>10.2f}")
+    print(f"{'after: shared AppContainer':<36} {new:>10.2f}")
+    print(f"{'  + bind_unit_of_work per call':<36} {_time(bind, requests, repeat):>10.2f}")
+    print(f"\nremoved per service dependency: {old - new:.2f} us")
+    return 0
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Benchmark the per-request cost of building services vs. the shared container.",
+    )
+    parser.add_argument("--requests", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=5, help="runs per provider")
+    args = parser.parse_args(argv)
+    return run(requests=args.requests, repeat=args.repeat)
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
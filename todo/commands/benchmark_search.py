@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+import argparse
+import statistics
+import sys
+import time
+from typing import Optional
+
+from sqlalchemy import select, text
+from sqlalchemy.engine import Connection
+
+from todo.db.session import get_engine
+from todo.models.task import Task
+from todo.repositories.task_search import match_and_rank
+
+SEED_PROJECT = "search-benchmark-seed"
+# 64 words: each title word matches ~1/64 of the rows, a pair ~1/4096
+WORDS = (
+    "alpha bravo charlie delta echo foxtrot golf hotel india juliet kilo lima "
+    "mike november oscar papa quebec romeo sierra tango uniform victor whiskey "
+    "xray yankee zulu report review deploy invoice meeting budget design draft "
+    "release backup migrate refactor upgrade audit contract payroll hiring "
+    "onboarding roadmap sprint backlog bugfix hotfix feature schema index cache "
+    "replica cluster network storage license renewal training workshop survey "
+    "newsletter webinar"
+).split()
+QUERIES = (
+    "alpha",            # common single word (~1.5% of rows)
+    "alpha bravo",      # two words, both required
+    '"deploy invoice"',  # phrase
+    "4242",             # (almost) unique token
+    "zzzz",             # no hit
+)
+
+
+def _seed(conn: Connection, tasks: int) -> None:
+    project_id = conn.execute(
+        text("INSERT INTO projects (name) VALUES (:name) RETURNING id"),
+        {"name": SEED_PROJECT},
+    ).scalar_one()
+    conn.execute(
+        text(
+            """
+            INSERT INTO tasks (project_id, title, description, status)
+            SELECT :project_id,
+                   w[1 + g % 64] || ' ' || w[1 + (g / 64) % 64] || ' ' || g,
+                   w[1 + (g * 31) % 64] || ' ' || w[1 + (g / 4096) % 64],
+                   'todo'
+            FROM generate_series(1, :n) AS g, (SELECT CAST(:words AS text[]) AS w) AS v
+            """
+        ),
+        {"project_id": project_id, "n": tasks, "words": list(WORDS)},
+    )
+    conn.execute(text("ANALYZE tasks"))
+
+
+def _time_query(conn: Connection, query: str, limit: int, repeat: int) -> list[float]:
+    match, rank = match_and_rank(conn.dialect.name, query)
+    stmt = (
+        select(Task.id, rank.label("rank"))
+        .where(match)
+        .order_by(rank.desc(), Task.id.asc())
+        .limit(limit + 1)
+    )
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        conn.execute(stmt).all()
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def run(tasks: int = 1_000_000, limit: int = 20, repeat: int = 20, seed: bool = True) -> int:
+    """Time the search query on a seeded dataset and print latency percentiles.
+
+    With ``seed`` the rows are inserted in a transaction that is rolled back
+    afterwards. Seeding a million tasks takes a while (the generated column
+    and GIN index are maintained on insert).
+    """
+    engine = get_engine()
+    if seed and engine.dialect.name != "postgresql":
+        print(f"Seeding needs PostgreSQL, not {engine.dialect.name}; use --no-seed.")
+        return 0
+
+    with engine.connect() as conn:
+        trans = conn.begin()
+        try:
+            if seed:
+                print(f"Seeding {tasks} tasks ...")
+                start = time.perf_counter()
+                _seed(conn, tasks)
+                print(f"Seeded in {time.perf_counter() - start:.1f}s.\n")
+
+            print(f"{'query':<20} {'p50 ms':>8} {'p95 ms':>8} {'max ms':>8}")
+            for query in QUERIES:
+                timings = sorted(_time_query(conn, query, limit, repeat))
+                p95 = timings[min(len(timings) - 1, int(len(timings) * 0.95))]
+                print(
+                    f"{query:<20} {statistics.median(timings):>8.2f} "
+                    f"{p95:>8.2f} {timings[-1]:>8.2f}"
+                )
+        finally:
+            trans.rollback()
+    return 0
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Benchmark task full-text search on a seeded (rolled back) dataset.",
+    )
+    parser.add_argument("--tasks", type=int, default=1_000_000)
+    parser.add_argument("--limit", type=int, default=20, help="page size of each query")
+    parser.add_argument("--repeat", type=int, default=20, help="runs per query")
+    parser.add_argument(
+        "--no-seed",
+        dest="seed",
+        action="store_false",
+        help="benchmark the existing data instead of seeding",
+    )
+    args = parser.parse_args(argv)
+    return run(tasks=args.tasks, limit=args.limit, repeat=args.repeat, seed=args.seed)
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, List, NamedTuple, Optional
+
+from fastapi.encoders import jsonable_encoder
+
+from todo.api.controller_schemas.task_responses import TaskRead
+from todo.api.serialization import TASK_LIST
+from todo.models.task import Task
+from todo.repositories.task_repository import TASK_ROW_COLUMNS
+
+class TaskRow(NamedTuple):
+    """Stands in for sqlalchemy.Row: a named tuple of TASK_ROW_COLUMNS."""
+
+    id: int
+    project_id: int
+    title: str
+    description: Optional[str]
+    status: str
+    deadline: Optional[datetime]
+    closed_at: Optional[datetime]
+    version: int
+
+
+def _tasks(n: int) -> List[Task]:
+    start = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    return [
+        Task(
+            id=i,
+            project_id=1 + i % 50,
+            title=f"Task number {i}",
+            description=None if i % 3 else f"Description of task {i}",
+            status=("todo", "doing", "done")[i % 3],
+            deadline=start + timedelta(hours=i) if i % 2 else None,
+            closed_at=start + timedelta(hours=i) if i % 3 == 2 else None,
+            version=1,
+        )
+        for i in range(1, n + 1)
+    ]
+
+
+def _before(tasks: List[Task]) -> bytes:
+    # what the list endpoint did: model_validate per task in the controller,
+    # then FastAPI's response_model validation, jsonable_encoder and json.dumps
+    content = [TaskRead.model_validate(t) for t in tasks]
+    validated = TASK_LIST.validate_python([m.model_dump() for m in content])
+    encoded = jsonable_encoder(TASK_LIST.dump_python(validated, mode="json"))
+    return json.dumps(encoded, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def _after(items: List[Any]) -> bytes:
+    # json_list_response
+    return TASK_LIST.dump_json(TASK_LIST.validate_python(items, from_attributes=True))
+
+
+def _time(fn: Callable[[List[Any]], bytes], items: List[Any], repeat: int) -> list[float]:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(items)
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def run(tasks: int = 10_000, repeat: int = 10) -> int:
+    """Print the per-row cost of serializing a task list, old path vs. fast path.
+
+    Runs without a database: ORM instances and rows are built in memory.
+    """
+    orm = _tasks(tasks)
+    rows = [TaskRow(**{c.key: getattr(t, c.key) for c in TASK_ROW_COLUMNS}) for t in orm]
+    if json.loads(_before(orm)) != json.loads(_after(rows)):
+        print("Fast path output differs from the response_model path!")
+        return 1
+
+    cases = (
+        ("before (ORM, response_model)", _before, orm),
+        ("after (ORM, TypeAdapter)", _after, orm),
+        ("after (rows, TypeAdapter)", _after, rows),
+    )
+    print(f"{tasks} tasks, {repeat} runs each\n")
+    print(f"{'path':<32} {'total ms':>9} {'us/row':>8}")
+    baseline = None
+    for name, fn, items in cases:
+        median = statistics.median(_time(fn, items, repeat))
+        baseline = baseline or median
+        print(
+            f"{name:<32} {median * 1000:>9.2f} {median / tasks * 1e6:>8.2f}"
+            f"  ({baseline / median:.1f}x)"
+        )
+    return 0
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Benchmark task list serialization (response_model vs. TypeAdapter fast path).",
+    )
+    parser.add_argument("--tasks", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=10, help="runs per path")
+    args = parser.parse_args(argv)
+    return run(tasks=args.tasks, repeat=args.repeat)
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
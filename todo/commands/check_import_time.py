@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+import argparse
+import os
+import subprocess
+import sys
+from typing import Optional
+
+# Entry points of short-lived processes; they must start without the web stack
+COMMAND_MODULES = (
+    "todo.commands.autoclose_overdue",
+    "todo.commands.export_tasks",
+    "todo.commands.import_legacy_projects",
+    "todo.commands.scheduler",
+    "legacy.cli",
+    # what every command starts with: importing and building its services
+    "todo.services.app_factory",
+)
+# Statements run right after the import, timed with it (no database I/O:
+# the engine is created lazily)
+CONSTRUCTION = {
+    "todo.services.app_factory": "todo.services.app_factory.build_services()",
+}
+# Per module; IMPORT_TIME_BUDGET_MS raises it for slow CI machines
+DEFAULT_BUDGET_MS = float(os.getenv("IMPORT_TIME_BUDGET_MS", "500"))
+# Every command needs the ORM: on machines where importing it alone takes
+# more than half the budget, the budget is this many times that floor
+FLOOR_MODULE = "sqlalchemy.orm"
+FLOOR_FACTOR = 2.0
+# Web stack, and the DB driver (only loaded once an engine is created)
+FORBIDDEN_PREFIXES = ("fastapi", "starlette", "pydantic", "uvicorn", "psycopg2")
+
+
+def measure(module: str) -> tuple[int, list[str]]:
+    """Imports ``module`` in a fresh interpreter under ``-X importtime``.
+
+    Returns its cumulative import time in microseconds, plus the time of
+    its CONSTRUCTION statement if any, and the names of every module
+    imported along the way.
+    """
+    code = f"import {module}"
+    statement = CONSTRUCTION.get(module)
+    if statement is not None:
+        code += (
+            "\nimport time\n_start = time.perf_counter()\n"
+            f"{statement}\nprint(round((time.perf_counter() - _start) * 1e6))"
+        )
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{result.stderr.strip()}")
+
+    total = int(result.stdout.strip() or 0) if statement is not None else 0
+    imported = []
+    for line in result.stderr.splitlines():
+        # "import time:   self [us] | cumulative | imported package"
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        _, cumulative, name = (part.strip() for part in line[len("import time:"):].split("|"))
+        imported.append(name)
+        if name == module:
+            total += int(cumulative)
+    return total, imported
+
+
+def check(module: str, budget_ms: float = DEFAULT_BUDGET_MS, repeat: int = 3) -> tuple[float, str]:
+    """Returns ``module``'s import time in ms (fastest of ``repeat`` runs) and its status."""
+    runs = [measure(module) for _ in range(repeat)]
+    total = min(t for t, _ in runs) / 1000
+    heavy = sorted({name for name in runs[0][1] if name.split(".")[0] in FORBIDDEN_PREFIXES})
+    if heavy:
+        return total, f"imports {', '.join(heavy[:5])}{' ...' if len(heavy) > 5 else ''}"
+    if total > budget_ms:
+        return total, f"over budget ({budget_ms:.0f} ms)"
+    return total, "ok"
+
+
+def scaled_budget(budget_ms: float = DEFAULT_BUDGET_MS, repeat: int = 3) -> float:
+    """``budget_ms``, raised on machines that import FLOOR_MODULE slowly."""
+    floor = min(measure(FLOOR_MODULE)[0] for _ in range(repeat)) / 1000
+    return max(budget_ms, FLOOR_FACTOR * floor)
+
+
+def run(
+    budget_ms: float = DEFAULT_BUDGET_MS,
+    repeat: int = 3,
+    modules: tuple[str, ...] = COMMAND_MODULES,
+) -> int:
+    """Return the number of command modules over budget or importing the web stack.
+
+    The fastest of ``repeat`` runs counts, to smooth out a cold disk cache.
+    """
+    failures = 0
+    print(f"{'module':<42} {'import ms':>10}  status")
+    for module in modules:
+        total, status = check(module, budget_ms, repeat)
+        if status != "ok":
+            failures += 1
+        print(f"{module:<42} {total:>10.1f}  {status}")
+    return failures
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Fail if a command's import time exceeds its budget or it imports the web stack.",
+    )
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS, help="per module")
+    parser.add_argument("--repeat", type=int, default=3, help="fresh interpreters per module")
+    parser.add_argument("modules", nargs="*", help="modules to check (default: all commands)")
+    args = parser.parse_args(argv)
+    failures = run(
+        budget_ms=args.budget_ms,
+        repeat=args.repeat,
+        modules=tuple(args.modules) or COMMAND_MODULES,
+    )
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,261 @@
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from datetime import datetime, timedelta, timezone
+from typing import Any, Iterator, Optional
+
+from sqlalchemy import func, select, text
+from sqlalchemy.engine import Connection
+
+from todo.db.session import get_engine
+from todo.models.project import Project
+from todo.models.task import Task
+from todo.repositories.task_repository import SqlAlchemyTaskRepository
+from todo.repositories.task_search import match_and_rank
+
+SEED_PREFIX = "explain-seed-"
+
+
+def hot_queries(project_id: int, now: datetime) -> dict[str, Any]:
+    """The query shapes issued by the repositories on hot paths."""
+    overdue = SqlAlchemyTaskRepository._overdue_open(now)
+    search_match, search_rank = match_and_rank("postgresql", "12345")
+    return {
+        "tasks.list_by_project": (
+            select(Task)
+            .where(Task.project_id == project_id)
+            .order_by(Task.id.asc())
+        ),
+        "tasks.list_by_project_page": (
+            select(Task)
+            .where(Task.project_id == project_id)
+            .where(Task.id > 0)
+            .order_by(Task.id.asc())
+            .limit(51)
+        ),
+        "tasks.query_page(status)": (
+            select(Task)
+            .where(Task.project_id == project_id, Task.status.in_(["todo", "doing"]))
+            .order_by(Task.id.asc())
+            .limit(51)
+        ),
+        "tasks.query_page(deadline range)": (
+            select(Task)
+            .where(
+                Task.project_id == project_id,
+                Task.deadline >= now,
+                Task.deadline < now + timedelta(days=7),
+            )
+            .order_by(Task.deadline.asc().nulls_last(), Task.id.asc())
+            .limit(51)
+        ),
+        "tasks.list_by_project_page(-deadline)": (
+            select(Task)
+            .where(Task.project_id == project_id)
+            .order_by(Task.deadline.desc().nulls_last(), Task.id.desc())
+            .limit(51)
+        ),
+        "tasks.query_page(closed, -closed_at)": (
+            select(Task)
+            .where(Task.project_id == project_id, Task.status == "done")
+            .order_by(Task.closed_at.desc().nulls_last(), Task.id.desc())
+            .limit(51)
+        ),
+        "tasks.list_overdue_open": (
+            select(Task).where(overdue).order_by(Task.deadline.asc())
+        ),
+        "tasks.count_overdue_open": (
+            select(func.count()).select_from(Task).where(overdue)
+        ),
+        "tasks.close_overdue_open(batch)": (
+            select(Task.id)
+            .where(overdue)
+            .order_by(Task.deadline.asc(), Task.id.asc())
+            .limit(1000)
+        ),
+        "tasks.close_overdue_open(skip_locked)": (
+            select(Task.id)
+            .where(overdue)
+            .order_by(Task.deadline.asc(), Task.id.asc())
+            .limit(1000)
+            .with_for_update(skip_locked=True)
+        ),
+        "tasks.search": (
+            select(Task, search_rank)
+            .where(search_match)
+            .order_by(search_rank.desc(), Task.id.asc())
+            .limit(21)
+        ),
+        "projects.search": (
+            select(Project)
+            .where(func.lower(Project.name).like(f"{SEED_PREFIX}1%"))
+            .order_by(Project.name.asc(), Project.id.asc())
+            .limit(10)
+        ),
+        "projects.search(trigram)": (
+            select(Project)
+            .where(func.lower(Project.name).bool_op("%")("explain-sead-12"))
+            .order_by(func.similarity(func.lower(Project.name), "explain-sead-12").desc())
+            .limit(10)
+        ),
+        "projects.task_stats": (
+            select(Project.id, Task.status, func.count(Task.id), func.max(Task.closed_at))
+            .select_from(Project)
+            .outerjoin(Task, Task.project_id == Project.id)
+            .where(Project.id == project_id)
+            .group_by(Project.id, Task.status)
+        ),
+        "projects.list_page": (
+            select(Project).where(Project.id > 0).order_by(Project.id.asc()).limit(51)
+        ),
+    }
+
+
+def _seed(conn: Connection, projects: int, tasks: int) -> None:
+    conn.execute(
+        text(
+            "INSERT INTO projects (name, description) "
+            "SELECT :prefix || g, NULL FROM generate_series(1, :n) AS g"
+        ),
+        {"prefix": SEED_PREFIX, "n": projects},
+    )
+    # ~10% open tasks, ~1% overdue, a third without deadline
+    conn.execute(
+        text(
+            """
+            INSERT INTO tasks (project_id, title, status, deadline)
+            SELECT p.id,
+                   'seed task ' || g,
+                   CASE WHEN g % 10 = 0 THEN 'todo' ELSE 'done' END,
+                   CASE
+                       WHEN g % 100 = 0 THEN now() - interval '1 day'
+                       WHEN g % 3 = 0 THEN NULL
+                       ELSE now() + g * interval '1 minute'
+                   END
+            FROM generate_series(1, :n) AS g
+            JOIN (
+                SELECT id, row_number() OVER (ORDER BY id) AS rn
+                FROM projects
+                WHERE name LIKE :prefix || '%'
+            ) AS p ON p.rn = 1 + g % :projects
+            """
+        ),
+        {"n": tasks, "prefix": SEED_PREFIX, "projects": projects},
+    )
+    conn.execute(text("ANALYZE projects"))
+    conn.execute(text("ANALYZE tasks"))
+
+
+def _explain(conn: Connection, stmt: Any) -> dict:
+    compiled = stmt.compile(dialect=conn.dialect, compile_kwargs={"render_postcompile": True})
+    raw = conn.exec_driver_sql(
+        "EXPLAIN (FORMAT JSON) " + str(compiled),
+        compiled.params,
+    ).scalar_one()
+    plan = raw if isinstance(raw, list) else json.loads(raw)
+    return plan[0]["Plan"]
+
+
+def _walk(node: dict) -> Iterator[dict]:
+    yield node
+    for child in node.get("Plans", []):
+        yield from _walk(child)
+
+
+def check(conn: Connection, threshold: int) -> list[str]:
+    """EXPLAINs every hot query and returns the ones that seq-scan a big table."""
+    sizes: dict[str, float] = {
+        relname: reltuples
+        for relname, reltuples in conn.execute(
+            text(
+                "SELECT relname, reltuples FROM pg_class "
+                "WHERE relname IN ('projects', 'tasks') AND relkind = 'r'"
+            )
+        )
+    }
+    project_id = conn.execute(
+        select(func.coalesce(func.min(Task.project_id), 0))
+    ).scalar_one()
+
+    failures: list[str] = []
+    now = datetime.now(timezone.utc)
+    for name, stmt in hot_queries(project_id, now).items():
+        plan = _explain(conn, stmt)
+        scans = [
+            n["Relation Name"]
+            for n in _walk(plan)
+            if n["Node Type"] == "Seq Scan"
+            and sizes.get(n["Relation Name"], 0) >= threshold
+        ]
+        verdict = "SEQ SCAN on " + ", ".join(scans) if scans else "ok"
+        print(f"{name:<34} {plan['Node Type']:<24} {verdict}")
+        if scans:
+            failures.append(name)
+    return failures
+
+
+def run(
+    seed_projects: int = 200,
+    seed_tasks: int = 100_000,
+    threshold: int = 10_000,
+    seed: bool = True,
+) -> int:
+    """Return the number of hot queries whose plan falls back to a seq scan.
+
+    With ``seed`` the tables are filled inside a transaction that is rolled
+    back afterwards, so the check can run against any disposable database
+    that has the current migrations applied.
+    """
+    engine = get_engine()
+    if engine.dialect.name != "postgresql":
+        print(f"Query plan check needs PostgreSQL, not {engine.dialect.name}.")
+        return 0
+
+    with engine.connect() as conn:
+        trans = conn.begin()
+        try:
+            if seed:
+                _seed(conn, seed_projects, seed_tasks)
+            failures = check(conn, threshold)
+        finally:
+            trans.rollback()
+
+    if failures:
+        print(f"\n{len(failures)} hot queries fall back to a seq scan.")
+    else:
+        print("\nAll hot queries use an index.")
+    return len(failures)
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="EXPLAIN the repositories' hot queries and fail on seq scans.",
+    )
+    parser.add_argument("--seed-projects", type=int, default=200)
+    parser.add_argument("--seed-tasks", type=int, default=100_000)
+    parser.add_argument(
+        "--threshold",
+        type=int,
+        default=10_000,
+        help="tolerate seq scans on tables with fewer rows than this",
+    )
+    parser.add_argument(
+        "--no-seed",
+        dest="seed",
+        action="store_false",
+        help="check against the existing data instead of seeding",
+    )
+    args = parser.parse_args(argv)
+    failures = run(
+        seed_projects=args.seed_projects,
+        seed_tasks=args.seed_tasks,
+        threshold=args.threshold,
+        seed=args.seed,
+    )
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+import argparse
+import sys
+from typing import List, Optional
+
+from sqlalchemy import create_engine
+
+from todo.db.base import Base
+from todo.db.session import DATABASE_URL
+import todo.models  # noqa: F401  (registers every table)
+
+
+def run(urls: List[str]) -> int:
+    """Create the mapped tables (and the ``projects`` quota counter) in each database.
+
+    For local databases such as SQLite files, where the Postgres-only
+    migrations cannot run; Postgres is set up with ``alembic upgrade head``.
+    Existing tables are left alone.
+    """
+    for url in urls:
+        engine = create_engine(url, future=True)
+        try:
+            Base.metadata.create_all(engine)
+        finally:
+            engine.dispose()
+        print(f"schema ready: {engine.url.render_as_string(hide_password=True)}")
+    return 0
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Create the tables without migrations (local SQLite databases).",
+    )
+    parser.add_argument(
+        "urls",
+        nargs="*",
+        metavar="URL",
+        help="databases to set up (default: DATABASE_URL)",
+    )
+    args = parser.parse_args(argv)
+    return run(args.urls or [DATABASE_URL])
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
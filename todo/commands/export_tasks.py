@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import argparse
+import sys
+from typing import List, Optional
+
+from todo.services.app_factory import build_services
+from todo.services.task_export import EXPORT_FORMATS
+
+
+def run(
+    output: str = "-",
+    fmt: str = "ndjson",
+    project_id: Optional[int] = None,
+    statuses: Optional[List[str]] = None,
+    compress: bool = False,
+) -> int:
+    """Write tasks as NDJSON or CSV to ``output`` ("-" for stdout); return the bytes written.
+
+    Same stream as ``GET /export/tasks``: rows come from a server-side
+    cursor and are written chunk by chunk.
+    """
+    _, ts = build_services()
+    chunks = ts.export_tasks(
+        fmt=fmt,
+        project_id=project_id,
+        statuses=statuses,
+        compress=compress,
+    )
+
+    written = 0
+    if output == "-":
+        out = sys.stdout.buffer
+        for chunk in chunks:
+            written += out.write(chunk)
+        out.flush()
+    else:
+        with open(output, "wb") as out:
+            for chunk in chunks:
+                written += out.write(chunk)
+        print(f"Wrote {written} bytes to {output}.", file=sys.stderr)
+    return written
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Export tasks as NDJSON or CSV.")
+    parser.add_argument(
+        "-o", "--output",
+        default="-",
+        help="file to write (default: stdout); a .gz suffix implies --gzip",
+    )
+    parser.add_argument(
+        "--format",
+        dest="fmt",
+        choices=EXPORT_FORMATS,
+        default="ndjson",
+        help="output format (default: ndjson)",
+    )
+    parser.add_argument(
+        "--project",
+        dest="project_id",
+        type=int,
+        default=None,
+        help="only export tasks of this project",
+    )
+    parser.add_argument(
+        "--status",
+        dest="statuses",
+        action="append",
+        default=None,
+        help="only export tasks with this status (repeatable)",
+    )
+    parser.add_argument(
+        "--gzip",
+        action="store_true",
+        help="gzip the output",
+    )
+    args = parser.parse_args(argv)
+    try:
+        run(
+            output=args.output,
+            fmt=args.fmt,
+            project_id=args.project_id,
+            statuses=args.statuses,
+            compress=args.gzip or args.output.endswith(".gz"),
+        )
+    except (LookupError, ValueError) as e:
+        parser.exit(2, f"error: {e}\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,385 @@
+from __future__ import annotations
+
+import argparse
+import codecs
+import io
+import json
+import os
+import sys
+from datetime import datetime, time, timezone
+from typing import Any, BinaryIO, Iterator, List, Optional, Tuple
+
+from sqlalchemy import insert, select
+from sqlalchemy.orm import Session
+
+from todo.config import ALLOWED_STATUSES, MAX_NUMBER_OF_PROJECTS, MAX_NUMBER_OF_TASKS
+from todo.db.session import SessionLocal
+from todo.exceptions.service_exceptions import QuotaExceeded
+from todo.models.import_checkpoint import ImportCheckpoint
+from todo.models.project import Project
+from todo.models.task import Task
+from todo.repositories.quota import claim_project_slot
+
+READ_SIZE = 1 << 16
+_WHITESPACE = " \t\r\n\ufeff"
+
+# Column limits of the current schema
+_NAME_LEN = 200
+_TITLE_LEN = 200
+_DESCRIPTION_LEN = 1000
+
+
+class JsonArrayReader:
+    """Streams the elements of a top-level JSON array from a binary file.
+
+    Only the element being decoded is held in memory. Yields
+    ``(element, offset)`` where ``offset`` is the byte position just past the
+    element; ``JsonArrayReader(fp, resume_at=offset)`` continues from there.
+    """
+
+    def __init__(self, fp: BinaryIO, resume_at: int = 0) -> None:
+        self._fp = fp
+        self._resume_at = resume_at
+        self._decoder = json.JSONDecoder()
+        self._bytes = codecs.getincrementaldecoder("utf-8")()
+        self._buf = ""
+        self._pos = 0
+        self._base = resume_at  # byte offset of self._buf[0]
+        self._eof = False
+
+    def __iter__(self) -> Iterator[Tuple[Any, int]]:
+        self._fp.seek(self._resume_at)
+        state = "after" if self._resume_at else "open"
+        while True:
+            c = self._peek()
+            if state == "open":
+                if c != "[":
+                    raise ValueError("Expected a JSON array")
+                self._pos += 1
+                state = "first"
+            elif state == "first" and c == "]":
+                return
+            elif state == "after":
+                if c == "]":
+                    return
+                if c != ",":
+                    raise ValueError(f"Expected ',' or ']' at byte {self._offset()}")
+                self._pos += 1
+                state = "value"
+            else:
+                yield self._decode(), self._base
+                state = "after"
+
+    def _offset(self) -> int:
+        return self._base + len(self._buf[:self._pos].encode("utf-8"))
+
+    def _compact(self) -> None:
+        self._base = self._offset()
+        self._buf = self._buf[self._pos:]
+        self._pos = 0
+
+    def _fill(self, size: int = READ_SIZE) -> bool:
+        if self._eof:
+            return False
+        data = self._fp.read(size)
+        if not data:
+            self._buf += self._bytes.decode(b"", final=True)
+            self._eof = True
+            return False
+        self._buf += self._bytes.decode(data)
+        return True
+
+    def _peek(self) -> str:
+        while True:
+            while self._pos < len(self._buf) and self._buf[self._pos] in _WHITESPACE:
+                self._pos += 1
+            if self._pos < len(self._buf):
+                return self._buf[self._pos]
+            if not self._fill():
+                raise ValueError("Unexpected end of file")
+
+    def _decode(self) -> Any:
+        self._compact()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buf, self._pos)
+            except json.JSONDecodeError:
+                # incomplete element: read more (doubling, so big elements
+                # are re-parsed only a logarithmic number of times)
+                if not self._fill(max(READ_SIZE, len(self._buf))):
+                    raise
+                continue
+            self._pos = end
+            self._compact()
+            return value
+
+
+# -------- legacy → current model mapping --------
+def _clip(value: Any, length: int) -> Optional[str]:
+    if value is None:
+        return None
+    return str(value)[:length]
+
+
+def _parse_datetime(raw: Any, end_of_day: bool = False) -> Optional[datetime]:
+    """Parses ISO dates/datetimes; date-only deadlines mean the end of that day (UTC)."""
+    if raw in (None, "", "null"):
+        return None
+    text = str(raw).strip()
+    try:
+        value = datetime.fromisoformat(text)
+    except ValueError:
+        return None
+    if end_of_day and len(text) == 10:
+        value = datetime.combine(value.date(), time(23, 59, 59))
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value
+
+
+def _map_task(raw: dict, now: datetime) -> dict:
+    status = str(raw.get("status") or "").strip().lower()
+    if status not in ALLOWED_STATUSES:
+        status = "todo"
+    # done tasks keep their legacy closing time, else they close at import
+    closed_at = (_parse_datetime(raw.get("closed_at")) or now) if status == "done" else None
+    return {
+        "title": _clip(raw.get("title") or "(untitled)", _TITLE_LEN),
+        "description": _clip(raw.get("description"), _DESCRIPTION_LEN),
+        "status": status,
+        "deadline": _parse_datetime(raw.get("deadline"), end_of_day=True),
+        "closed_at": closed_at,
+    }
+
+
+def _legacy_name(name: str, legacy_id: Any, n: int = 1) -> str:
+    suffix = f" (legacy #{legacy_id})" if n == 1 else f" (legacy #{legacy_id}-{n})"
+    return name[: _NAME_LEN - len(suffix)] + suffix
+
+
+def _assign_names(s: Session, batch: List[dict]) -> List[str]:
+    """Resolves unique project names; legacy data may repeat a name."""
+    wanted = [
+        (str(p.get("name") or f"Legacy project #{p.get('project_id')}")[:_NAME_LEN], p.get("project_id"))
+        for p in batch
+    ]
+    candidates = {name for name, _ in wanted} | {_legacy_name(n, i) for n, i in wanted}
+    taken = set(s.scalars(select(Project.name).where(Project.name.in_(candidates))))
+
+    names = []
+    for name, legacy_id in wanted:
+        candidate, n = name, 1
+        while candidate in taken:
+            candidate = _legacy_name(name, legacy_id, n)
+            n += 1
+        taken.add(candidate)
+        names.append(candidate)
+    return names
+
+
+# -------- loading --------
+def _copy_value(value: Any) -> str:
+    if value is None:
+        return r"\N"
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return (
+        str(value)
+        .replace("\\", "\\\\")
+        .replace("\t", "\\t")
+        .replace("\n", "\\n")
+        .replace("\r", "\\r")
+    )
+
+
+def _insert_tasks(s: Session, rows: List[dict]) -> None:
+    if not rows:
+        return
+    columns = ["project_id", "title", "description", "status", "deadline", "closed_at"]
+    bind = s.get_bind()
+    if bind.dialect.name == "postgresql" and bind.dialect.driver == "psycopg2":
+        buf = io.StringIO()
+        for row in rows:
+            buf.write("\t".join(_copy_value(row[c]) for c in columns))
+            buf.write("\n")
+        buf.seek(0)
+        dbapi_conn: Any = s.connection().connection.dbapi_connection
+        with dbapi_conn.cursor() as cur:
+            cur.copy_expert(f"COPY tasks ({', '.join(columns)}) FROM STDIN", buf)
+        return
+    s.execute(insert(Task), rows)
+
+
+def _check_task_quota(batch: List[dict]) -> None:
+    for p in batch:
+        n = len(p.get("tasks") or [])
+        if n > MAX_NUMBER_OF_TASKS:
+            raise QuotaExceeded(
+                f"Legacy project #{p.get('project_id')} has {n} tasks, "
+                f"more than MAX_NUMBER_OF_TASKS ({MAX_NUMBER_OF_TASKS})"
+            )
+
+
+def _load_batch(source: str, batch: List[dict], end_offset: int) -> Tuple[int, int]:
+    """Inserts one batch and advances the checkpoint in the same transaction.
+
+    Raises QuotaExceeded, before writing anything, if a project has more
+    than MAX_NUMBER_OF_TASKS tasks or the batch does not fit in
+    MAX_NUMBER_OF_PROJECTS (its slots are claimed like the API claims one).
+    """
+    _check_task_quota(batch)
+    now = datetime.now(timezone.utc)
+    with SessionLocal() as s:
+        try:
+            claim_project_slot(s, MAX_NUMBER_OF_PROJECTS, n=len(batch))
+        except QuotaExceeded:
+            raise QuotaExceeded(
+                f"Importing {len(batch)} more projects would exceed "
+                f"MAX_NUMBER_OF_PROJECTS ({MAX_NUMBER_OF_PROJECTS})"
+            ) from None
+        names = _assign_names(s, batch)
+        tasks_per_project = [[_map_task(t, now) for t in (p.get("tasks") or [])] for p in batch]
+        project_ids = s.scalars(
+            insert(Project).returning(Project.id, sort_by_parameter_order=True),
+            [
+                {
+                    "name": name,
+                    "description": _clip(p.get("description"), _DESCRIPTION_LEN),
+                    "created_at": _parse_datetime(p.get("created_at")) or now,
+                    "task_count": len(tasks),
+                }
+                for p, name, tasks in zip(batch, names, tasks_per_project)
+            ],
+        ).all()
+
+        task_rows = [
+            {"project_id": project_id, **task}
+            for project_id, tasks in zip(project_ids, tasks_per_project)
+            for task in tasks
+        ]
+        _insert_tasks(s, task_rows)
+
+        checkpoint = s.get_one(ImportCheckpoint, source)
+        checkpoint.byte_offset = end_offset
+        checkpoint.projects_imported += len(batch)
+        checkpoint.tasks_imported += len(task_rows)
+        s.commit()
+        return len(batch), len(task_rows)
+
+
+def _start(source: str, restart: bool) -> ImportCheckpoint:
+    with SessionLocal() as s:
+        checkpoint = s.get(ImportCheckpoint, source)
+        if checkpoint is None or restart:
+            if checkpoint is not None:
+                s.delete(checkpoint)
+                s.flush()
+            checkpoint = ImportCheckpoint(
+                source=source,
+                byte_offset=0,
+                projects_imported=0,
+                tasks_imported=0,
+                finished=False,
+            )
+            s.add(checkpoint)
+            s.commit()
+            s.refresh(checkpoint)
+        s.expunge(checkpoint)
+        return checkpoint
+
+
+def _finish(source: str) -> None:
+    with SessionLocal() as s:
+        s.get_one(ImportCheckpoint, source).finished = True
+        s.commit()
+
+
+def run(
+    path: str,
+    batch_size: int = 500,
+    max_batch_tasks: int = 20_000,
+    restart: bool = False,
+) -> int:
+    """Import a Phase 1 projects.json file and return the number of projects loaded.
+
+    The file is parsed one project at a time. Projects and their tasks are
+    loaded in batches (tasks via COPY on psycopg2); each batch commits together
+    with the import checkpoint, so rerunning after an interruption resumes
+    at the first project that was not yet committed. ``restart`` ignores an
+    existing checkpoint (already imported rows are not removed).
+
+    The quotas apply as to the API: a batch exceeding them raises
+    QuotaExceeded, keeping the batches committed before it.
+    """
+    source = os.path.abspath(path)[-500:]
+    checkpoint = _start(source, restart)
+    if checkpoint.finished:
+        print(f"{path} was already imported ({checkpoint.projects_imported} projects). "
+              "Use --restart to import it again.")
+        return 0
+    if checkpoint.byte_offset:
+        print(f"Resuming at byte {checkpoint.byte_offset} "
+              f"({checkpoint.projects_imported} projects already imported).")
+
+    projects = tasks = 0
+    with open(path, "rb") as fp:
+        batch: List[dict] = []
+        batch_tasks = 0
+        offset = checkpoint.byte_offset
+        for element, offset in JsonArrayReader(fp, resume_at=checkpoint.byte_offset):
+            if not isinstance(element, dict):
+                raise ValueError(f"Expected a project object before byte {offset}")
+            batch.append(element)
+            batch_tasks += len(element.get("tasks") or [])
+            if len(batch) >= batch_size or batch_tasks >= max_batch_tasks:
+                p, t = _load_batch(source, batch, offset)
+                projects, tasks = projects + p, tasks + t
+                print(f"Imported {projects} projects / {tasks} tasks (byte {offset}).")
+                batch, batch_tasks = [], 0
+        if batch:
+            p, t = _load_batch(source, batch, offset)
+            projects, tasks = projects + p, tasks + t
+
+    _finish(source)
+    print(f"Done. Imported {projects} projects and {tasks} tasks from {path}.")
+    return projects
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Import a Phase 1 projects.json file into the database.",
+    )
+    parser.add_argument("path", help="path to the legacy projects.json")
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=500,
+        help="projects per transaction (default: 500)",
+    )
+    parser.add_argument(
+        "--max-batch-tasks",
+        type=int,
+        default=20_000,
+        help="also commit once a batch holds this many tasks (default: 20000)",
+    )
+    parser.add_argument(
+        "--restart",
+        action="store_true",
+        help="ignore the saved checkpoint and read the file from the start",
+    )
+    args = parser.parse_args(argv)
+    try:
+        run(
+            args.path,
+            batch_size=args.batch_size,
+            max_batch_tasks=args.max_batch_tasks,
+            restart=args.restart,
+        )
+    except QuotaExceeded as e:
+        print(f"Import stopped: {e}. Raise the limit and rerun to resume.", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -1,15 +1,248 @@
-# todo/commands/scheduler.py
-import time
-import schedule
-from todo.commands.autoclose_overdue import run
+from __future__ import annotations
 
-def main():
-    schedule.every(15).minutes.do(run)
+import argparse
+import heapq
+import signal
+import sys
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Tuple
+
+from todo.db.leader import leader_lock
+from todo.db.session import get_engine
+from todo.services.app_factory import build_services
+
+LOCK_NAME = "todo-autoclose-scheduler"
+# How often new and changed deadlines are picked up, i.e. how late a task
+# created (or rescheduled) with a deadline in the near future may close
+REFRESH_SECONDS = 5.0
+# Edits whose transaction commits later than its updated_at (now() is the
+# transaction start) or DB/host clock skew stay within this margin
+CHANGE_MARGIN = timedelta(seconds=60)
+
+
+def _utc(value: datetime) -> datetime:
+    # SQLite hands back naive datetimes; they are stored as UTC
+    return value if value.tzinfo is not None else value.replace(tzinfo=timezone.utc)
+
+
+class DeadlineHeap:
+    """Min-heap of ``(deadline, task id)`` with lazy deletion.
+
+    A task whose deadline changes is pushed again; its old entry stays in
+    the heap and is skipped once it surfaces, as ``known`` no longer
+    matches it.
+    """
+
+    def __init__(self) -> None:
+        self._heap: List[Tuple[datetime, int]] = []
+        self.known: Dict[int, datetime] = {}
+
+    def __len__(self) -> int:
+        return len(self.known)
+
+    def push(self, task_id: int, deadline: datetime) -> None:
+        deadline = _utc(deadline)
+        if self.known.get(task_id) == deadline:
+            return
+        self.known[task_id] = deadline
+        heapq.heappush(self._heap, (deadline, task_id))
+
+    def next_deadline(self) -> Optional[datetime]:
+        self._skip_stale()
+        return self._heap[0][0] if self._heap else None
+
+    def pop_due(self, now: datetime) -> List[int]:
+        """Removes and returns the ids of every task due at ``now``."""
+        due = []
+        while self.next_deadline() is not None and self._heap[0][0] <= now:
+            _, task_id = heapq.heappop(self._heap)
+            del self.known[task_id]
+            due.append(task_id)
+        return due
+
+    def clear(self) -> None:
+        self._heap.clear()
+        self.known.clear()
+
+    def _skip_stale(self) -> None:
+        while self._heap and self.known.get(self._heap[0][1]) != self._heap[0][0]:
+            heapq.heappop(self._heap)
+
+
+class AutocloseScheduler:
+    """Closes overdue tasks when their deadline passes, on the leader only.
+
+    The heap holds the open tasks due within ``horizon``. Every ``refresh``
+    it is topped up incrementally: tasks due in the newly covered part of
+    the window, plus tasks changed since the last refresh. When a deadline
+    passes the scheduler runs the regular set-based autoclose, which is
+    idempotent: an entry that went stale (task closed, deleted or
+    rescheduled meanwhile) costs one UPDATE that matches nothing.
+    """
+
+    def __init__(
+        self,
+        ts,
+        lock,
+        refresh: timedelta = timedelta(seconds=REFRESH_SECONDS),
+        horizon: timedelta = timedelta(hours=1),
+        batch_size: Optional[int] = None,
+    ) -> None:
+        self.ts = ts
+        self.lock = lock
+        self.refresh = refresh
+        self.horizon = horizon
+        self.batch_size = batch_size
+        self.heap = DeadlineHeap()
+        self.stopping = threading.Event()
+        self._window_end: Optional[datetime] = None
+        self._changed_since: Optional[datetime] = None
+        self._next_refresh: Optional[datetime] = None
+
+    def run_forever(self) -> None:
+        try:
+            while not self.stopping.is_set():
+                try:
+                    if not self.lock.acquire():
+                        if self._window_end is not None:
+                            print("Leadership lost; standing by.")
+                        self._lose_leadership()
+                        # standby: retry on the refresh interval
+                        self.stopping.wait(self.refresh.total_seconds())
+                        continue
+                    self.step()
+                except Exception as exc:  # e.g. the database went away
+                    print(f"Scheduler error, retrying: {exc}", file=sys.stderr)
+                    # start over with a catch-up run once the database is back
+                    self._lose_leadership()
+                    self.stopping.wait(self.refresh.total_seconds())
+        finally:
+            self.lock.release()
+
+    def step(self) -> None:
+        """One leader iteration: refresh if due, close what is due, then sleep."""
+        now = datetime.now(timezone.utc)
+        if self._window_end is None or self._next_refresh is None:
+            print("Leader: catching up on overdue tasks.")
+            self.close_overdue()
+            next_refresh = self.load(now)
+        elif now >= self._next_refresh:
+            next_refresh = self.load(now)
+        else:
+            next_refresh = self._next_refresh
+
+        if self.heap.pop_due(now):
+            self.close_overdue()
+
+        wake = min(next_refresh, self.heap.next_deadline() or next_refresh)
+        self.stopping.wait(max((wake - datetime.now(timezone.utc)).total_seconds(), 0))
+
+    def load(self, now: datetime) -> datetime:
+        """Reads the deadlines due by ``now + horizon`` into the heap.
+
+        The first call reads the whole window, later ones only what the
+        previous window did not cover and what changed since. Returns the
+        time of the next refresh.
+        """
+        until = now + self.horizon
+        for task_id, deadline, _ in self.ts.upcoming_deadlines(
+            until,
+            after=self._window_end,
+            changed_since=self._changed_since,
+        ):
+            self.heap.push(task_id, deadline)
+        self._window_end = until
+        self._changed_since = now - CHANGE_MARGIN
+        self._next_refresh = now + self.refresh
+        return self._next_refresh
+
+    def close_overdue(self) -> int:
+        closed = 0
+        for ids in self.ts.iter_autoclose_overdue(batch_size=self.batch_size):
+            closed += len(ids)
+        if closed:
+            print(f"{datetime.now(timezone.utc):%Y-%m-%d %H:%M:%S} closed {closed} tasks")
+        return closed
+
+    def stop(self, *_: object) -> None:
+        self.stopping.set()
+
+    def _lose_leadership(self) -> None:
+        self.heap.clear()
+        self._window_end = self._changed_since = self._next_refresh = None
+
+
+def run(
+    refresh_seconds: float = REFRESH_SECONDS,
+    horizon_seconds: float = 3600.0,
+    batch_size: Optional[int] = None,
+) -> int:
+    """Run the autoclose scheduler until SIGINT/SIGTERM.
+
+    Any number of replicas may run; only the one holding the leader lock
+    closes tasks, the others take over once it goes away.
+    """
+    _, ts = build_services()
+    scheduler = AutocloseScheduler(
+        ts,
+        leader_lock(get_engine(), LOCK_NAME),
+        refresh=timedelta(seconds=refresh_seconds),
+        horizon=timedelta(seconds=horizon_seconds),
+        batch_size=batch_size,
+    )
+    signal.signal(signal.SIGINT, scheduler.stop)
+    signal.signal(signal.SIGTERM, scheduler.stop)
+
+    print("Scheduler started; closing tasks as their deadlines pass. Ctrl+C to stop.")
+    scheduler.run_forever()
+    print("Scheduler stopped.")
+    return 0
+
+
+def _positive_float(raw: str) -> float:
+    value = float(raw)
+    if value <= 0:
+        raise argparse.ArgumentTypeError("must be positive")
+    return value
+
+
+def _positive_int(raw: str) -> int:
+    value = int(raw)
+    if value < 1:
+        raise argparse.ArgumentTypeError("must be a positive integer")
+    return value
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Close overdue open tasks as their deadlines pass (one leader among replicas).",
+    )
+    parser.add_argument(
+        "--refresh-seconds",
+        type=_positive_float,
+        default=REFRESH_SECONDS,
+        help="how often to pick up new and changed deadlines; also the standby retry interval",
+    )
+    parser.add_argument(
+        "--horizon-seconds",
+        type=_positive_float,
+        default=3600.0,
+        help="how far ahead deadlines are held in memory",
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=_positive_int,
+        default=None,
+        help="close at most this many tasks per transaction (default: one statement)",
+    )
+    args = parser.parse_args(argv)
+    return run(
+        refresh_seconds=args.refresh_seconds,
+        horizon_seconds=args.horizon_seconds,
+        batch_size=args.batch_size,
+    )
 
-    print("Scheduler started. Running every 15 minutes. Ctrl+C to stop.")
-    while True:
-        schedule.run_pending()
-        time.sleep(1)
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main(sys.argv[1:]))
@@ -20,6 +20,23 @@ def _getint(name: str, default: int) -> int:
         return default
 
 
+def _getfloat(name: str, default: float) -> float:
+    raw = os.getenv(name)
+    if raw is None:
+        return default
+    try:
+        return float(raw)
+    except ValueError:
+        return default
+
+
+def _getbool(name: str, default: bool) -> bool:
+    raw = os.getenv(name)
+    if raw is None:
+        return default
+    return raw.strip().lower() in ("1", "true", "yes", "on")
+
+
 def _getlist(name: str, default_csv: str) -> List[str]:
     raw = os.getenv(name, default_csv)
     return [x.strip() for x in raw.split(",") if x.strip()]
@@ -28,3 +45,49 @@ def _getlist(name: str, default_csv: str) -> List[str]:
 MAX_NUMBER_OF_PROJECTS = _getint("MAX_NUMBER_OF_PROJECTS", 5)
 MAX_NUMBER_OF_TASKS = _getint("MAX_NUMBER_OF_TASKS", 20)
 ALLOWED_STATUSES = _getlist("ALLOWED_STATUSES", "todo,doing,done")
+
+# Upper bound for the ``limit`` query parameter of paginated list endpoints
+MAX_PAGE_SIZE = _getint("MAX_PAGE_SIZE", 500)
+# Upper bound for the number of tasks in one POST .../tasks:batch request
+MAX_BATCH_SIZE = _getint("MAX_BATCH_SIZE", 1000)
+# Rows fetched per round trip from the server-side cursor of task exports
+EXPORT_CHUNK_SIZE = _getint("EXPORT_CHUNK_SIZE", 1000)
+
+# Database connection pool (see todo/db/session.py). Size workers so that
+# workers * (DB_POOL_SIZE + DB_MAX_OVERFLOW) stays below Postgres max_connections.
+DB_POOL_SIZE = _getint("DB_POOL_SIZE", 5)
+DB_MAX_OVERFLOW = _getint("DB_MAX_OVERFLOW", 10)
+DB_POOL_TIMEOUT = _getfloat("DB_POOL_TIMEOUT", 30.0)
+DB_POOL_RECYCLE = _getint("DB_POOL_RECYCLE", -1)
+DB_POOL_PRE_PING = _getbool("DB_POOL_PRE_PING", False)
+# Task exports streamed at once per worker: each holds a pooled connection
+# (and a producer thread) until it ends, further exports wait for a slot
+EXPORT_MAX_CONCURRENT = _getint("EXPORT_MAX_CONCURRENT", DB_POOL_SIZE)
+
+# Serve the API on SQLAlchemy's AsyncEngine (asyncpg) instead of running the
+# sync stack in Starlette's threadpool. Requires the "async" extra.
+DB_ASYNC = _getbool("DB_ASYNC", False)
+
+# Read replicas: GET requests and standalone repository reads go to one of
+# these (comma-separated SQLAlchemy URLs); writes always use the primary.
+DB_REPLICA_URLS = _getlist("DB_REPLICA_URLS", "")
+DB_REPLICA_STRATEGY = os.getenv("DB_REPLICA_STRATEGY", "round_robin")
+# After a write, the same client reads from the primary for this many seconds
+READ_YOUR_WRITES_SECONDS = _getint("READ_YOUR_WRITES_SECONDS", 5)
+
+# In-process read-through cache for projects and task lists (API only, per
+# worker). Off by default: writes by other workers and by commands show up
+# only after CACHE_TTL_SECONDS, except to clients pinned to the primary
+CACHE_ENABLED = _getbool("CACHE_ENABLED", False)
+CACHE_TTL_SECONDS = _getfloat("CACHE_TTL_SECONDS", 30.0)
+CACHE_MAX_ENTRIES = _getint("CACHE_MAX_ENTRIES", 1024)
+
+# Live task events (GET /projects/{id}/events): triggers NOTIFY every task
+# write on Postgres, one LISTEN connection per worker fans them out to SSE
+# clients. Disabling it turns the endpoint off (501)
+TASK_EVENTS_ENABLED = _getbool("TASK_EVENTS_ENABLED", True)
+# Events buffered per client; a client falling further behind gets one
+# "reset" event (reload the tasks) instead of the backlog
+TASK_EVENTS_QUEUE_SIZE = _getint("TASK_EVENTS_QUEUE_SIZE", 100)
+# Keep-alive comment interval of idle event streams
+TASK_EVENTS_HEARTBEAT_SECONDS = _getfloat("TASK_EVENTS_HEARTBEAT_SECONDS", 15.0)
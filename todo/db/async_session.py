@@ -0,0 +1,141 @@
+from __future__ import annotations
+
+import threading
+from typing import Any, Callable, Optional, TypeVar
+
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+from sqlalchemy.orm import Session
+
+from todo.config import (
+    DB_MAX_OVERFLOW,
+    DB_POOL_PRE_PING,
+    DB_POOL_RECYCLE,
+    DB_POOL_SIZE,
+    DB_POOL_TIMEOUT,
+    DB_REPLICA_STRATEGY,
+    DB_REPLICA_URLS,
+)
+from todo.db.replicas import ReplicaSet
+from todo.db.session import _REPLICA_KEY, DATABASE_URL
+from todo.db.unit_of_work import UnitOfWork
+
+T = TypeVar("T")
+
+
+def async_url(url: str) -> str:
+    """``url`` with its driver swapped to asyncpg (the same database)."""
+    parsed = make_url(url)
+    if parsed.get_backend_name() != "postgresql":
+        raise ValueError(f"DB_ASYNC needs a PostgreSQL database, not {parsed.drivername!r}")
+    return parsed.set(drivername="postgresql+asyncpg").render_as_string(hide_password=False)
+
+
+def _create_async_engine(url: str) -> AsyncEngine:
+    return create_async_engine(
+        async_url(url),
+        echo=False,
+        pool_size=DB_POOL_SIZE,
+        max_overflow=DB_MAX_OVERFLOW,
+        pool_timeout=DB_POOL_TIMEOUT,
+        pool_recycle=DB_POOL_RECYCLE,
+        pool_pre_ping=DB_POOL_PRE_PING,
+    )
+
+
+_async_engine: Optional[AsyncEngine] = None
+_async_replicas: Optional[ReplicaSet[AsyncEngine]] = None
+_lock = threading.Lock()
+
+
+def get_async_engine() -> AsyncEngine:
+    """The primary's async engine, created on first use (see ``get_engine``)."""
+    global _async_engine
+    if _async_engine is None:
+        with _lock:
+            if _async_engine is None:
+                _async_engine = _create_async_engine(DATABASE_URL)
+    return _async_engine
+
+
+def get_async_replicas() -> ReplicaSet[AsyncEngine]:
+    """The replicas' async engines (possibly none), created on first use."""
+    global _async_replicas
+    if _async_replicas is None:
+        with _lock:
+            if _async_replicas is None:
+                _async_replicas = ReplicaSet(
+                    [_create_async_engine(url) for url in DB_REPLICA_URLS],
+                    strategy=DB_REPLICA_STRATEGY,
+                )
+    return _async_replicas
+
+
+class _LazyAsyncSessionmaker(async_sessionmaker):
+    """async_sessionmaker bound to the primary once the first session is made."""
+
+    def __call__(self, **local_kw: Any) -> AsyncSession:
+        if self.kw.get("bind") is None:
+            self.configure(bind=get_async_engine())
+        return super().__call__(**local_kw)
+
+
+# expire_on_commit=False: attributes can't be lazily reloaded outside the
+# greenlet that runs the ORM, so loaded objects must stay usable after commit.
+AsyncSessionLocal = _LazyAsyncSessionmaker(
+    autoflush=False,
+    expire_on_commit=False,
+)
+
+
+def AsyncReadSessionLocal(**kw: Any) -> AsyncSession:
+    """AsyncSession for read-only work, on a replica when any are configured."""
+    replicas = get_async_replicas()
+    if replicas:
+        s = AsyncSessionLocal(bind=replicas.pick(), **kw)
+        s.info[_REPLICA_KEY] = True
+        return s
+    return AsyncSessionLocal(**kw)
+
+
+class AsyncUnitOfWork:
+    """Request-scoped AsyncSession on which whole service use-cases run.
+
+    ``run(fn)`` executes ``fn`` with a sync ``UnitOfWork`` wrapping the
+    AsyncSession's ``sync_session`` via ``AsyncSession.run_sync``: the
+    repositories and services run unchanged, while every statement goes
+    through the async driver on the event loop.
+    """
+
+    def __init__(self, session_factory=AsyncSessionLocal, pinned: bool = False) -> None:
+        self._factory = session_factory
+        self.pinned = pinned
+        self.session: Optional[AsyncSession] = None
+
+    async def __aenter__(self) -> "AsyncUnitOfWork":
+        self.session = self._factory()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        session, self.session = self.session, None
+        if session is None:
+            return
+        try:
+            if exc_type is not None:
+                await session.rollback()
+        finally:
+            await session.close()
+
+    async def run(self, fn: Callable[[UnitOfWork], T]) -> T:
+        if self.session is None:
+            raise RuntimeError("AsyncUnitOfWork is not active")
+
+        def call(sync_session: Session) -> T:
+            return fn(UnitOfWork.for_session(sync_session, pinned=self.pinned))
+
+        return await self.session.run_sync(call)
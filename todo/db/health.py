@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+import time
+from typing import Any
+
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+
+
+def pool_status(engine: Engine) -> dict[str, Any]:
+    """Snapshot of the engine's connection pool counters."""
+    pool = engine.pool
+    status: dict[str, Any] = {"class": type(pool).__name__}
+    # QueuePool exposes these; NullPool/StaticPool don't
+    for name in ("size", "checkedin", "checkedout", "overflow"):
+        getter = getattr(pool, name, None)
+        if callable(getter):
+            status[name] = getter()
+    if "checkedin" in status:
+        status["idle"] = status.pop("checkedin")
+    return status
+
+
+def check_database(engine: Engine) -> dict[str, Any]:
+    """Checks out a connection and runs a timed ``SELECT 1``.
+
+    ``checkout_ms`` is how long the probe waited for a pooled connection,
+    which grows with the pool's wait queue when all connections are busy.
+    Raises whatever the driver raises if the database is unreachable.
+    """
+    started = time.perf_counter()
+    with engine.connect() as conn:
+        checked_out = time.perf_counter()
+        conn.execute(text("SELECT 1")).scalar_one()
+        finished = time.perf_counter()
+    return {
+        "checkout_ms": round((checked_out - started) * 1000, 3),
+        "select_1_ms": round((finished - checked_out) * 1000, 3),
+    }
@@ -0,0 +1,154 @@
+"""Single-leader election for background workers.
+
+On Postgres the leader holds a session-level advisory lock on a dedicated
+connection: the lock is released by the server as soon as that connection
+goes away, so a crashed leader never blocks its standbys. Other databases
+(SQLite) fall back to an exclusive lock on a local file, which only
+coordinates processes on the same machine; that is the deployment SQLite
+supports anyway.
+"""
+from __future__ import annotations
+
+import hashlib
+import os
+import sys
+import tempfile
+from typing import Any, Optional
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection, Engine
+
+
+def lock_key(name: str) -> int:
+    """Stable signed 64-bit advisory lock key for ``name``."""
+    digest = hashlib.blake2b(name.encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "big", signed=True)
+
+
+class AdvisoryLeaderLock:
+    """Leadership through ``pg_try_advisory_lock`` on a connection of its own."""
+
+    def __init__(self, engine: Engine, name: str) -> None:
+        self.engine = engine
+        self.name = name
+        self.key = lock_key(name)
+        self._conn: Optional[Connection] = None
+
+    def acquire(self) -> bool:
+        """Tries to become leader without waiting; True if this process leads."""
+        if self._conn is not None:
+            return self.is_held()
+        conn = self.engine.connect()
+        try:
+            got = conn.execute(
+                text("SELECT pg_try_advisory_lock(:key)"), {"key": self.key}
+            ).scalar()
+            # end the implicit transaction; the session-level lock survives it
+            conn.commit()
+        except Exception:
+            conn.close()
+            raise
+        if not got:
+            conn.close()
+            return False
+        self._conn = conn
+        return True
+
+    def is_held(self) -> bool:
+        """Whether the lock is still held, i.e. its connection is alive."""
+        if self._conn is None:
+            return False
+        try:
+            self._conn.execute(text("SELECT 1"))
+            self._conn.commit()
+            return True
+        except Exception:
+            self._drop()
+            return False
+
+    def release(self) -> None:
+        if self._conn is None:
+            return
+        try:
+            self._conn.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": self.key})
+            self._conn.commit()
+        except Exception:
+            pass  # connection already gone, and the lock with it
+        finally:
+            self._drop()
+
+    def _drop(self) -> None:
+        conn, self._conn = self._conn, None
+        if conn is None:
+            return
+        try:
+            # invalidate: a pooled connection must not keep the lock alive
+            conn.invalidate()
+            conn.close()
+        except Exception:
+            pass
+
+
+class FileLeaderLock:
+    """Leadership through an exclusive lock on a local file (non-blocking)."""
+
+    def __init__(self, name: str, directory: Optional[str] = None) -> None:
+        self.name = name
+        self.path = os.path.join(directory or tempfile.gettempdir(), f"{name}.lock")
+        self._fd: Optional[int] = None
+
+    def acquire(self) -> bool:
+        if self._fd is not None:
+            return True
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        if not _try_lock_file(fd):
+            os.close(fd)
+            return False
+        self._fd = fd
+        return True
+
+    def is_held(self) -> bool:
+        return self._fd is not None
+
+    def release(self) -> None:
+        fd, self._fd = self._fd, None
+        if fd is not None:
+            _unlock_file(fd)
+            os.close(fd)
+
+
+if sys.platform == "win32":
+    import msvcrt
+
+    def _try_lock_file(fd: int) -> bool:
+        try:
+            msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+            return True
+        except OSError:
+            return False
+
+    def _unlock_file(fd: int) -> None:
+        os.lseek(fd, 0, os.SEEK_SET)
+        msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+
+else:
+    import fcntl
+
+    def _try_lock_file(fd: int) -> bool:
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            return True
+        except OSError:
+            return False
+
+    def _unlock_file(fd: int) -> None:
+        fcntl.flock(fd, fcntl.LOCK_UN)
+
+
+def leader_lock(engine: Engine, name: str) -> Any:
+    """The leader lock suited to ``engine``'s database (see module docstring)."""
+    if engine.dialect.name == "postgresql":
+        return AdvisoryLeaderLock(engine, name)
+    # one lock file per database
+    database = lock_key(str(engine.url)) & 0xFFFFFFFF
+    return FileLeaderLock(f"{name}-{database:08x}")
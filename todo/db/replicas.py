@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+import itertools
+import threading
+from typing import Any, Generic, List, Sequence, TypeVar
+
+STRATEGIES = ("round_robin", "least_connections")
+
+# Engine or AsyncEngine
+E = TypeVar("E")
+
+
+class ReplicaSet(Generic[E]):
+    """Chooses the read replica engine for a new read-only session."""
+
+    def __init__(self, engines: Sequence[E], strategy: str = "round_robin") -> None:
+        if strategy not in STRATEGIES:
+            raise ValueError(f"Unknown replica strategy: {strategy!r}")
+        self.engines: List[E] = list(engines)
+        self.strategy = strategy
+        self._cycle = itertools.cycle(self.engines)
+        self._lock = threading.Lock()
+
+    def __bool__(self) -> bool:
+        return bool(self.engines)
+
+    def pick(self) -> E:
+        if not self.engines:
+            raise LookupError("No read replicas configured")
+        if self.strategy == "least_connections":
+            return min(self.engines, key=_checked_out)
+        with self._lock:
+            return next(self._cycle)
+
+
+def _checked_out(engine: Any) -> int:
+    # QueuePool.checkedout(); pools without it count as idle
+    return getattr(engine.pool, "checkedout", lambda: 0)()
@@ -1,9 +1,23 @@
 from __future__ import annotations
 
 import os
+import threading
+from typing import Any, Optional
 
 from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session, sessionmaker
+
+from todo.config import (
+    DB_MAX_OVERFLOW,
+    DB_POOL_PRE_PING,
+    DB_POOL_RECYCLE,
+    DB_POOL_SIZE,
+    DB_POOL_TIMEOUT,
+    DB_REPLICA_STRATEGY,
+    DB_REPLICA_URLS,
+)
+from todo.db.replicas import ReplicaSet
 
 DB_USER = os.getenv("DB_USER", "todolist")
 DB_PASSWORD = os.getenv("DB_PASSWORD", "secret")
@@ -11,17 +25,96 @@ DB_HOST = os.getenv("DB_HOST", "127.0.0.1")
 DB_PORT = os.getenv("DB_PORT", "5433")
 DB_NAME = os.getenv("DB_NAME", "todolist")
 
-DATABASE_URL = (
+# DATABASE_URL overrides the DB_* parts (e.g. sqlite:///primary.db locally)
+DATABASE_URL = os.getenv("DATABASE_URL") or (
     f"postgresql+psycopg2://{DB_USER}:{DB_PASSWORD}"
     f"@{DB_HOST}:{DB_PORT}/{DB_NAME}"
 )
 
-engine = create_engine(DATABASE_URL, echo=False, future=True)
 
-SessionLocal = sessionmaker(
-    bind=engine,
+def _create_engine(url: str):
+    return create_engine(
+        url,
+        echo=False,
+        future=True,
+        pool_size=DB_POOL_SIZE,
+        max_overflow=DB_MAX_OVERFLOW,
+        pool_timeout=DB_POOL_TIMEOUT,
+        pool_recycle=DB_POOL_RECYCLE,
+        pool_pre_ping=DB_POOL_PRE_PING,
+    )
+
+
+_engine: Optional[Engine] = None
+_replicas: Optional[ReplicaSet] = None
+_lock = threading.Lock()
+
+
+def get_engine() -> Engine:
+    """The primary engine, created on first use.
+
+    Importing this module stays cheap (no dialect / DBAPI import, no pool)
+    for commands that never reach the database or only do so later.
+    """
+    global _engine
+    if _engine is None:
+        with _lock:
+            if _engine is None:
+                _engine = _create_engine(DATABASE_URL)
+    return _engine
+
+
+def get_replicas() -> ReplicaSet:
+    """The read replica engines (possibly none), created on first use."""
+    global _replicas
+    if _replicas is None:
+        with _lock:
+            if _replicas is None:
+                _replicas = ReplicaSet(
+                    [_create_engine(url) for url in DB_REPLICA_URLS],
+                    strategy=DB_REPLICA_STRATEGY,
+                )
+    return _replicas
+
+
+def __getattr__(name: str) -> Any:
+    # ``from todo.db.session import engine`` keeps working, but builds the engine
+    if name == "engine":
+        return get_engine()
+    if name == "replicas":
+        return get_replicas()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+class _LazySessionmaker(sessionmaker):
+    """sessionmaker bound to the primary engine once the first session is made."""
+
+    def __call__(self, **local_kw: Any) -> Session:
+        if self.kw.get("bind") is None:
+            self.configure(bind=get_engine())
+        return super().__call__(**local_kw)
+
+
+SessionLocal = _LazySessionmaker(
     autoflush=False,
     autocommit=False,
     future=True,
 )
 
+
+# Session.info flag marking a session bound to a read replica
+_REPLICA_KEY = "replica"
+
+
+def ReadSessionLocal(**kw):
+    """Session for read-only work: bound to a replica when any are configured."""
+    replicas = get_replicas()
+    if replicas:
+        s = SessionLocal(bind=replicas.pick(), **kw)
+        s.info[_REPLICA_KEY] = True
+        return s
+    return SessionLocal(**kw)
+
+
+def on_replica(s: Session) -> bool:
+    return bool(s.info.get(_REPLICA_KEY, False))
@@ -0,0 +1,123 @@
+"""Change notifications for live task views (``GET /projects/{id}/events``).
+
+Statement-level triggers on ``tasks`` and ``projects`` send a JSON event on
+the ``task_events`` channel with ``pg_notify`` for every write, whoever
+makes it: the API, the commands, autoclose or the importer's COPY. They
+run inside the writing statement, so a write stays one round trip, and
+Postgres delivers the events to listeners only once the transaction
+commits (never if it rolls back).
+
+One event per project and statement: ``{"op": ..., "project_id": ...,
+"task_ids": [...]}`` with ``op`` one of ``created``, ``updated``, ``closed``
+(status changed to done), ``deleted`` and ``project_deleted``, plus the
+row ``version`` when a single task changed. Updates that leave a row as it
+was are not announced. The tasks deleted along with their project are
+covered by its ``project_deleted`` event.
+
+The triggers are created by the migrations; ``create_all`` on Postgres
+creates them as well. Other databases have no LISTEN/NOTIFY.
+"""
+from __future__ import annotations
+
+from sqlalchemy import DDL, event
+
+from todo.db.base import Base
+
+CHANNEL = "task_events"
+# NOTIFY payloads are limited to 8000 bytes; longer id lists are cut and
+# flagged, subscribers then reload the project's tasks
+MAX_IDS_PER_EVENT = 500
+
+CREATE_TRIGGERS = (
+    f"""
+    CREATE OR REPLACE FUNCTION task_events_payload(
+        op text, project_id integer, task_ids integer[], version integer
+    ) RETURNS text LANGUAGE sql IMMUTABLE AS $$
+        SELECT (
+            jsonb_build_object(
+                'op', op,
+                'project_id', project_id,
+                'task_ids', to_jsonb(task_ids[1:{MAX_IDS_PER_EVENT}])
+            )
+            || CASE WHEN cardinality(task_ids) > {MAX_IDS_PER_EVENT}
+                    THEN jsonb_build_object('truncated', true, 'count', cardinality(task_ids))
+                    ELSE '{{}}'::jsonb END
+            || CASE WHEN cardinality(task_ids) = 1
+                    THEN jsonb_build_object('version', version)
+                    ELSE '{{}}'::jsonb END
+        )::text
+    $$
+    """,
+    f"""
+    CREATE OR REPLACE FUNCTION task_events_notify() RETURNS trigger
+    LANGUAGE plpgsql AS $$
+    BEGIN
+        IF TG_OP = 'INSERT' THEN
+            PERFORM pg_notify('{CHANNEL}', task_events_payload('created', project_id, ids, version))
+            FROM (
+                SELECT project_id, array_agg(id ORDER BY id) AS ids, max(version) AS version
+                FROM new_rows
+                GROUP BY project_id
+            ) AS changed;
+        ELSIF TG_OP = 'UPDATE' THEN
+            PERFORM pg_notify('{CHANNEL}', task_events_payload(op, project_id, ids, version))
+            FROM (
+                SELECT n.project_id,
+                       CASE WHEN n.status = 'done' AND o.status <> 'done'
+                            THEN 'closed' ELSE 'updated' END AS op,
+                       array_agg(n.id ORDER BY n.id) AS ids,
+                       max(n.version) AS version
+                FROM new_rows AS n
+                JOIN old_rows AS o ON o.id = n.id
+                WHERE n IS DISTINCT FROM o
+                GROUP BY 1, 2
+            ) AS changed;
+        ELSE
+            -- rows removed by a project's ON DELETE CASCADE: project_deleted says it
+            PERFORM pg_notify('{CHANNEL}', task_events_payload('deleted', project_id, ids, NULL))
+            FROM (
+                SELECT o.project_id, array_agg(o.id ORDER BY o.id) AS ids
+                FROM old_rows AS o
+                WHERE EXISTS (SELECT 1 FROM projects AS p WHERE p.id = o.project_id)
+                GROUP BY o.project_id
+            ) AS changed;
+        END IF;
+        RETURN NULL;
+    END
+    $$
+    """,
+    f"""
+    CREATE OR REPLACE FUNCTION project_events_notify() RETURNS trigger
+    LANGUAGE plpgsql AS $$
+    BEGIN
+        PERFORM pg_notify('{CHANNEL}', task_events_payload('project_deleted', id, '{{}}', NULL))
+        FROM old_rows;
+        RETURN NULL;
+    END
+    $$
+    """,
+    # transition tables allow one event per trigger
+    """
+    CREATE TRIGGER tasks_notify_insert AFTER INSERT ON tasks
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION task_events_notify()
+    """,
+    """
+    CREATE TRIGGER tasks_notify_update AFTER UPDATE ON tasks
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION task_events_notify()
+    """,
+    """
+    CREATE TRIGGER tasks_notify_delete AFTER DELETE ON tasks
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION task_events_notify()
+    """,
+    """
+    CREATE TRIGGER projects_notify_delete AFTER DELETE ON projects
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION project_events_notify()
+    """,
+)
+
+for _statement in CREATE_TRIGGERS:
+    event.listen(Base.metadata, "after_create", DDL(_statement).execute_if(dialect="postgresql"))
@@ -0,0 +1,181 @@
+from __future__ import annotations
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Iterator, List, Optional, Protocol
+
+from sqlalchemy.orm import Session
+
+from todo.db.session import SessionLocal, on_replica
+
+# Session.info flag marking a session owned by a UnitOfWork
+_UOW_KEY = "unit_of_work"
+
+# Unit of work of the use-case running in this context (see bind_unit_of_work)
+_current: ContextVar[Optional["UnitOfWork"]] = ContextVar("unit_of_work", default=None)
+
+
+class TransactionScope(Protocol):
+    """What services and cached repositories need of their ``uow``.
+
+    Implemented by UnitOfWork and by CURRENT_UNIT_OF_WORK (see below).
+    """
+
+    def commit(self) -> None: ...
+    def rollback(self) -> None: ...
+    def call_after_transaction(self, callback: Callable[[], None]) -> None: ...
+
+
+class UnitOfWork:
+    """One Session and one transaction shared by every repository call.
+
+    Repositories built with ``uow.session_factory`` borrow the shared session
+    instead of opening their own and only flush their writes, so the identity
+    map is reused across calls and the owner decides when to ``commit()``.
+    Anything not committed when the unit of work exits is rolled back.
+
+    ``pinned`` marks a use-case that must read the primary's current state
+    (read-your-writes): cached repositories then go to the database.
+    """
+
+    def __init__(self, session_factory=SessionLocal, pinned: bool = False) -> None:
+        self._factory = session_factory
+        self.pinned = pinned
+        self.session: Optional[Session] = None
+        self._after_transaction: List[Callable[[], None]] = []
+
+    @classmethod
+    def for_session(cls, session: Session, pinned: bool = False) -> "UnitOfWork":
+        """Wraps a session opened elsewhere (e.g. ``AsyncSession.sync_session``).
+
+        The caller keeps ownership: the returned unit of work only commits.
+        """
+        uow = cls(session_factory=None, pinned=pinned)
+        uow.session = session
+        session.info[_UOW_KEY] = True
+        return uow
+
+    def __enter__(self) -> "UnitOfWork":
+        # Objects stay loaded after commit so responses can be built from them
+        # without another round trip.
+        self.session = self._factory(expire_on_commit=False)
+        self.session.info[_UOW_KEY] = True
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        session = self._active_session()
+        try:
+            if exc_type is not None:
+                session.rollback()
+        finally:
+            session.close()
+            self.session = None
+            self._run_after_transaction()
+
+    @property
+    def on_replica(self) -> bool:
+        """Whether the shared session reads a replica (see ReadSessionLocal)."""
+        return self.session is not None and on_replica(self.session)
+
+    def commit(self) -> None:
+        self._active_session().commit()
+        self._run_after_transaction()
+
+    def rollback(self) -> None:
+        self._active_session().rollback()
+        self._run_after_transaction()
+
+    def call_after_transaction(self, callback: Callable[[], None]) -> None:
+        """Runs ``callback`` once the current transaction commits or rolls back."""
+        self._after_transaction.append(callback)
+
+    def _run_after_transaction(self) -> None:
+        callbacks, self._after_transaction = self._after_transaction, []
+        for callback in callbacks:
+            callback()
+
+    @contextmanager
+    def session_factory(self) -> Iterator[Session]:
+        """Drop-in replacement for ``SessionLocal`` that yields the shared session."""
+        yield self._active_session()
+
+    def _active_session(self) -> Session:
+        if self.session is None:
+            raise RuntimeError("UnitOfWork is not active")
+        return self.session
+
+
+def in_unit_of_work(s: Session) -> bool:
+    return bool(s.info.get(_UOW_KEY, False))
+
+
+def complete(s: Session, *instances: Any) -> None:
+    """Finishes a repository write.
+
+    Inside a unit of work the changes are only flushed; standalone the
+    session is committed and ``instances`` are refreshed so they can be used
+    after the session closes.
+    """
+    if in_unit_of_work(s):
+        s.flush()
+        return
+    s.commit()
+    for obj in instances:
+        s.refresh(obj)
+
+
+@contextmanager
+def bind_unit_of_work(uow: Optional[UnitOfWork]) -> Iterator[Optional[UnitOfWork]]:
+    """Makes ``uow`` the current unit of work for the duration of the block.
+
+    Repositories and services built over ``current_session_factory`` /
+    ``CURRENT_UNIT_OF_WORK`` (see todo/services/container.py) then use it;
+    with ``None`` they run standalone.
+    """
+    token = _current.set(uow)
+    try:
+        yield uow
+    finally:
+        _current.reset(token)
+
+
+def current_unit_of_work() -> Optional[UnitOfWork]:
+    return _current.get()
+
+
+def current_session_factory(default: Callable[..., Session]) -> Callable[..., Any]:
+    """Session factory yielding the current unit of work's session, else ``default()``."""
+
+    def factory(**kw: Any) -> Any:
+        uow = _current.get()
+        if uow is None:
+            return default(**kw)
+        return uow.session_factory()
+
+    return factory
+
+
+class _CurrentUnitOfWork:
+    """Stands in for whichever unit of work is bound when a method is called.
+
+    Lets long-lived services and cached repositories take a ``uow`` argument
+    once; without a bound unit of work they behave as if given ``None``.
+    """
+
+    def commit(self) -> None:
+        uow = _current.get()
+        if uow is not None:
+            uow.commit()
+
+    def rollback(self) -> None:
+        uow = _current.get()
+        if uow is not None:
+            uow.rollback()
+
+    def call_after_transaction(self, callback: Callable[[], None]) -> None:
+        uow = _current.get()
+        if uow is not None:
+            uow.call_after_transaction(callback)
+
+
+CURRENT_UNIT_OF_WORK = _CurrentUnitOfWork()
@@ -3,5 +3,7 @@ from .service_exceptions import (
     ProjectNotFound,
     TaskNotFound,
     InvalidStatus,
+    QuotaExceeded,
+    VersionConflict,
 )
-__all__ = ["ProjectAlreadyExists", "ProjectNotFound", "TaskNotFound", "InvalidStatus"]
+__all__ = ["ProjectAlreadyExists", "ProjectNotFound", "TaskNotFound", "InvalidStatus", "QuotaExceeded", "VersionConflict"]
@@ -17,3 +17,13 @@ class TaskNotFound(Exception):
 class InvalidStatus(Exception):
     """Raised when a task status isn't within allowed statuses."""
     pass
+
+
+class QuotaExceeded(ValueError):
+    """Raised when MAX_NUMBER_OF_PROJECTS or MAX_NUMBER_OF_TASKS would be exceeded."""
+    pass
+
+
+class VersionConflict(Exception):
+    """Raised when a row changed since the version an update was based on."""
+    pass
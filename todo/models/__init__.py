@@ -0,0 +1,8 @@
+# Importing the package registers every table on ``Base.metadata``
+from todo.models.import_checkpoint import ImportCheckpoint
+from todo.models.project import Project
+from todo.models.quota_counter import QuotaCounter
+from todo.models.task import Task
+import todo.db.task_events  # noqa: F401,E402  (create_all also creates the NOTIFY triggers)
+
+__all__ = ["ImportCheckpoint", "Project", "QuotaCounter", "Task"]
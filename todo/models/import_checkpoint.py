@@ -0,0 +1,27 @@
+from __future__ import annotations
+
+from datetime import datetime
+
+from sqlalchemy import BigInteger, Boolean, DateTime, Integer, String, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from todo.db.base import Base
+
+
+class ImportCheckpoint(Base):
+    """Progress of a resumable import, committed together with each batch."""
+
+    __tablename__ = "import_checkpoints"
+
+    source: Mapped[str] = mapped_column(String(500), primary_key=True)
+    # Byte offset just past the last imported element of the source file
+    byte_offset: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    projects_imported: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    tasks_imported: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    finished: Mapped[bool] = mapped_column(Boolean, nullable=False, default=False)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, server_default=func.now(), onupdate=func.now()
+    )
+
+    def __repr__(self) -> str:
+        return f"<ImportCheckpoint {self.source!r} offset={self.byte_offset}>"
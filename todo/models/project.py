@@ -1,8 +1,9 @@
 from __future__ import annotations
 
 from typing import Optional, List
+from datetime import datetime
 
-from sqlalchemy import String, UniqueConstraint
+from sqlalchemy import DateTime, Integer, String, UniqueConstraint, func
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from todo.db.base import Base
@@ -15,10 +16,23 @@ class Project(Base):
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
     name: Mapped[str] = mapped_column(String(200), nullable=False)
     description: Mapped[Optional[str]] = mapped_column(String(1000), nullable=True)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, server_default=func.now()
+    )
+    # Maintained by the task repository; used to enforce MAX_NUMBER_OF_TASKS
+    task_count: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=0, server_default="0"
+    )
+    # Row version, bumped by every ORM update (optimistic locking, ETags).
+    # task_count changes are not part of the representation and keep it.
+    version: Mapped[int] = mapped_column(Integer, nullable=False, server_default="1")
+
+    __mapper_args__ = {"version_id_col": version}
 
     tasks: Mapped[List["Task"]] = relationship(
         "Task",
         back_populates="project",
+        order_by="Task.id",
         cascade="all, delete-orphan",
         passive_deletes=True,
     )
@@ -0,0 +1,31 @@
+from __future__ import annotations
+
+from sqlalchemy import DDL, Integer, String, event
+from sqlalchemy.orm import Mapped, mapped_column
+
+from todo.db.base import Base
+
+
+class QuotaCounter(Base):
+    """Maintained row count for a quota that has no parent row to live on.
+
+    Per-project task counts live on ``Project.task_count``; the global
+    project count lives here under the name ``"projects"``.
+    """
+
+    __tablename__ = "quota_counters"
+
+    name: Mapped[str] = mapped_column(String(50), primary_key=True)
+    used: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+
+    def __repr__(self) -> str:
+        return f"<QuotaCounter {self.name!r} used={self.used}>"
+
+
+# Tables made with ``create_all`` (local SQLite databases) start with the
+# counter row the migration seeds, so quota checks find it
+event.listen(
+    QuotaCounter.__table__,
+    "after_create",
+    DDL("INSERT INTO quota_counters (name, used) VALUES ('projects', 0)"),
+)
@@ -3,7 +3,7 @@ from __future__ import annotations
 from typing import Optional
 from datetime import datetime
 
-from sqlalchemy import String, DateTime, ForeignKey
+from sqlalchemy import String, DateTime, ForeignKey, Index, Integer, func, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from todo.db.base import Base
@@ -11,6 +11,43 @@ from todo.db.base import Base
 
 class Task(Base):
     __tablename__ = "tasks"
+    __table_args__ = (
+        # list_by_project: WHERE project_id = ? ORDER BY id
+        Index("ix_tasks_project_id_id", "project_id", "id"),
+        # query_page: status filters, deadline ranges / order, closed_at order
+        Index("ix_tasks_project_status_id", "project_id", "status", "id"),
+        Index("ix_tasks_project_deadline_id", "project_id", "deadline", "id"),
+        Index("ix_tasks_project_closed_at_id", "project_id", "closed_at", "id"),
+        # "-deadline" / "-closed_at" keep NULLs last, which a backward scan of
+        # the two above cannot (it yields DESC NULLS FIRST). SQLite has no
+        # NULLS LAST in indexes but sorts NULLs last when descending anyway.
+        Index(
+            "ix_tasks_project_deadline_desc_id",
+            "project_id",
+            text("deadline DESC NULLS LAST"),
+            text("id DESC"),
+        ).ddl_if(dialect="postgresql"),
+        Index(
+            "ix_tasks_project_closed_at_desc_id",
+            "project_id",
+            text("closed_at DESC NULLS LAST"),
+            text("id DESC"),
+        ).ddl_if(dialect="postgresql"),
+        # list_overdue_open / autoclose: open tasks ordered by deadline
+        Index(
+            "ix_tasks_open_deadline",
+            "deadline",
+            postgresql_where=text("status <> 'done'"),
+            sqlite_where=text("status <> 'done'"),
+        ),
+        # autoclose scheduler: open tasks changed since its last refresh
+        Index(
+            "ix_tasks_open_updated_at",
+            "updated_at",
+            postgresql_where=text("status <> 'done'"),
+            sqlite_where=text("status <> 'done'"),
+        ),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
     project_id: Mapped[int] = mapped_column(
@@ -23,6 +60,14 @@ class Task(Base):
     status: Mapped[str] = mapped_column(String(20), nullable=False, default="todo")
     deadline: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
     closed_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+    # Set on insert and by every ORM / Core UPDATE (see todo/commands/scheduler.py)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, server_default=func.now(), onupdate=func.now()
+    )
+    # Row version, bumped by every update (optimistic locking, ETags)
+    version: Mapped[int] = mapped_column(Integer, nullable=False, server_default="1")
+
+    __mapper_args__ = {"version_id_col": version}
 
     project = relationship("Project", back_populates="tasks")
 
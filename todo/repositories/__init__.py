@@ -1,9 +1,16 @@
+from .cache import CachedProjectRepository, CachedTaskRepository, TTLCache
+from .pagination import Page
 from .project_repository import ProjectRepository, SqlAlchemyProjectRepository
-from .task_repository import TaskRepository, SqlAlchemyTaskRepository
+from .task_repository import TaskFilter, TaskRepository, SqlAlchemyTaskRepository
 
 __all__ = [
+    "CachedProjectRepository",
+    "CachedTaskRepository",
+    "TTLCache",
+    "Page",
     "ProjectRepository",
     "SqlAlchemyProjectRepository",
+    "TaskFilter",
     "TaskRepository",
     "SqlAlchemyTaskRepository",
 ]
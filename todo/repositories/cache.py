@@ -0,0 +1,372 @@
+"""Read-through caching decorators for the repositories.
+
+``CachedProjectRepository`` / ``CachedTaskRepository`` wrap the SQLAlchemy
+repositories and serve ``get_by_id`` / ``list_all`` / ``task_stats``
+(projects) and ``list_by_project`` (tasks) from a process-local LRU cache with a TTL. Their
+own write methods invalidate the affected entries; inside a unit of work
+the entries are dropped again once the transaction commits or rolls back,
+so uncommitted rows never outlive it in the cache.
+
+Each worker process has its own cache: writes made by another process
+(another worker, or a command such as the scheduler or the importer) become
+visible after at most ``CACHE_TTL_SECONDS``. Use-cases that must see their
+own writes (``UnitOfWork.pinned``, see ``_pinned_to_primary`` in
+todo/api/dependencies.py) bypass the cache altogether.
+
+Only reads served by the primary are stored. A replica may lag behind, and
+a lagging row cached after a write would outlive the writer's
+read-your-writes pin; replica-routed requests still get the cached
+(primary) rows on a hit.
+"""
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Iterable, Iterator, List, Mapping, Optional, Sequence, Tuple
+
+from sqlalchemy import Row
+from sqlalchemy import inspect as sa_inspect
+
+from todo.config import CACHE_MAX_ENTRIES, CACHE_TTL_SECONDS
+from todo.db.unit_of_work import TransactionScope
+from todo.models.project import Project
+from todo.models.task import Task
+from todo.repositories.project_repository import ProjectRepository, ProjectStats
+from todo.repositories.task_repository import TaskRepository
+
+_MISSING = object()
+
+# ("kind", *ids), e.g. ("project", 3): invalidate_where matches on the kind
+Key = Tuple[Hashable, ...]
+
+
+class TTLCache:
+    """Thread-safe LRU cache whose entries expire ``ttl`` seconds after being stored."""
+
+    def __init__(
+        self,
+        maxsize: int = 1024,
+        ttl: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._clock = clock
+        self._data: "OrderedDict[Key, tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        # Bumped by every invalidation; loads that started before it are not stored
+        self._generation = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Key, default: Any = None) -> Any:
+        with self._lock:
+            item = self._data.get(key)
+            if item is None or item[0] <= self._clock():
+                if item is not None:
+                    del self._data[key]
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return item[1]
+
+    def set(self, key: Key, value: Any, generation: Optional[int] = None) -> None:
+        with self._lock:
+            if generation is not None and generation != self._generation:
+                return  # invalidated while the value was being loaded
+            self._data[key] = (self._clock() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def get_or_load(self, key: Key, load: Callable[[], Any], store: bool = True) -> Any:
+        """Returns the cached value or ``load()``, stored unless ``None`` or not ``store``."""
+        value = self.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+        generation = self._generation
+        value = load()
+        if value is not None and store:
+            self.set(key, value, generation)
+        return value
+
+    def invalidate(self, *keys: Key) -> None:
+        with self._lock:
+            self._generation += 1
+            for key in keys:
+                self._data.pop(key, None)
+
+    def invalidate_where(self, predicate: Callable[[Key], bool]) -> None:
+        with self._lock:
+            self._generation += 1
+            for key in [k for k in self._data if predicate(k)]:
+                del self._data[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._generation += 1
+            self._data.clear()
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else None,
+            }
+
+
+# Shared by all repositories of this process (see build_services / build_container)
+read_cache = TTLCache(maxsize=CACHE_MAX_ENTRIES, ttl=CACHE_TTL_SECONDS)
+
+
+def _snapshot(obj: Any) -> Any:
+    """Copies an ORM instance's column values into a new, session-less instance.
+
+    Cached values are shared between requests and threads, so they must not
+    be bound to (or be mutated through) the session that loaded them.
+    """
+    mapper = sa_inspect(obj).mapper
+    return mapper.class_(**{attr.key: getattr(obj, attr.key) for attr in mapper.column_attrs})
+
+
+def _project_key(project_id: int) -> Key:
+    return ("project", project_id)
+
+
+def _tasks_key(project_id: int) -> Key:
+    return ("tasks", project_id)
+
+
+def _stats_key(project_id: Optional[int]) -> Key:
+    # None: the statistics of all projects
+    return ("project_stats", project_id)
+
+
+_PROJECT_LIST_KEY: Key = ("projects",)
+
+
+def _always() -> bool:
+    return True
+
+
+class _CachedRepository:
+    def __init__(
+        self,
+        inner: Any,
+        cache: TTLCache,
+        uow: Optional[TransactionScope] = None,
+        reads_primary: Callable[[], bool] = _always,
+        use_cache: Callable[[], bool] = _always,
+    ) -> None:
+        self.inner = inner
+        self.cache = cache
+        self.uow = uow
+        # whether reads made now go to the primary; only those are stored
+        self.reads_primary = reads_primary
+        # whether reads made now may be served from the cache at all
+        self.use_cache = use_cache
+
+    def __getattr__(self, name: str) -> Any:
+        # Everything that is not cached goes straight to the wrapped repository
+        if name == "inner":
+            raise AttributeError(name)
+        return getattr(self.inner, name)
+
+    def _get_or_load(self, key: Key, load: Callable[[], Any]) -> Any:
+        if not self.use_cache():
+            return load()
+        return self.cache.get_or_load(key, load, store=self.reads_primary())
+
+    def _after_write(self, drop: Callable[[], None]) -> None:
+        drop()
+        if self.uow is not None:
+            # again once the transaction ends: reads made in between may
+            # have cached rows that were not committed (yet)
+            self.uow.call_after_transaction(drop)
+
+    def _invalidate(self, *keys: Key) -> None:
+        self._after_write(lambda: self.cache.invalidate(*keys))
+
+    def _invalidate_stats(self) -> None:
+        # a project's entry and the all-projects entry both change
+        self._after_write(
+            lambda: self.cache.invalidate_where(lambda key: key[0] == "project_stats")
+        )
+
+
+class CachedProjectRepository(_CachedRepository):
+    """ProjectRepository caching ``get_by_id``, ``list_all`` and ``task_stats``.
+
+    Not a subclass of the protocol: its stub methods would shadow the
+    delegation to the wrapped repository.
+    """
+
+    inner: ProjectRepository
+
+    def create(
+        self,
+        name: str,
+        description: Optional[str] = None,
+        max_projects: Optional[int] = None,
+    ) -> Project:
+        project = self.inner.create(name=name, description=description, max_projects=max_projects)
+        self._invalidate(_PROJECT_LIST_KEY, _project_key(project.id))
+        self._invalidate_stats()
+        return project
+
+    def update(
+        self,
+        project_id: int,
+        expected_version: Optional[int] = None,
+        **fields: Any,
+    ) -> Project:
+        project = self.inner.update(project_id, expected_version=expected_version, **fields)
+        self._invalidate(_PROJECT_LIST_KEY, _project_key(project_id))
+        return project
+
+    def delete(self, project_id: int) -> None:
+        self.inner.delete(project_id)
+        # tasks are deleted by the FK cascade
+        self._invalidate(_PROJECT_LIST_KEY, _project_key(project_id), _tasks_key(project_id))
+        self._invalidate_stats()
+
+    def get_by_id(
+        self,
+        project_id: int,
+        with_tasks: bool = False,
+        fields: Optional[Sequence[str]] = None,
+    ) -> Optional[Project]:
+        if with_tasks or fields is not None:
+            # snapshots carry no relationships and every column: not cached
+            return self.inner.get_by_id(project_id, with_tasks=with_tasks, fields=fields)
+
+        def load() -> Optional[Project]:
+            project = self.inner.get_by_id(project_id)
+            return None if project is None else _snapshot(project)
+
+        return self._get_or_load(_project_key(project_id), load)
+
+    def list_all(
+        self,
+        with_tasks: bool = False,
+        fields: Optional[Sequence[str]] = None,
+    ) -> Iterable[Project]:
+        if with_tasks or fields is not None:
+            return self.inner.list_all(with_tasks=with_tasks, fields=fields)
+        return list(
+            self._get_or_load(
+                _PROJECT_LIST_KEY,
+                lambda: [_snapshot(p) for p in self.inner.list_all()],
+            )
+        )
+
+    def task_stats(self, project_id: Optional[int] = None) -> List[ProjectStats]:
+        # overdue / next_deadline also move with the clock: up to a TTL stale
+        return list(
+            self._get_or_load(
+                _stats_key(project_id),
+                lambda: self.inner.task_stats(project_id),
+            )
+        )
+
+
+class CachedTaskRepository(_CachedRepository):
+    """TaskRepository caching ``list_by_project`` (as rows, see ``list_rows_by_project``)."""
+
+    inner: TaskRepository
+
+    def _invalidate_project(self, project_id: int) -> None:
+        # the project row carries the task counter as well
+        self._invalidate(_tasks_key(project_id), _project_key(project_id), _PROJECT_LIST_KEY)
+        self._invalidate_stats()
+
+    def create(
+        self,
+        project_id: int,
+        title: str,
+        description: Optional[str] = None,
+        deadline=None,
+        max_tasks: Optional[int] = None,
+    ) -> Task:
+        task = self.inner.create(
+            project_id=project_id,
+            title=title,
+            description=description,
+            deadline=deadline,
+            max_tasks=max_tasks,
+        )
+        self._invalidate_project(project_id)
+        return task
+
+    def create_many(
+        self,
+        project_id: int,
+        items: Sequence[Mapping[str, Any]],
+        max_tasks: Optional[int] = None,
+    ) -> List[Task]:
+        tasks = self.inner.create_many(project_id, items, max_tasks=max_tasks)
+        self._invalidate_project(project_id)
+        return tasks
+
+    def update(
+        self,
+        task_id: int,
+        expected_version: Optional[int] = None,
+        **fields: Any,
+    ) -> Task:
+        task = self.inner.update(task_id, expected_version=expected_version, **fields)
+        self._invalidate(_tasks_key(task.project_id))
+        self._invalidate_stats()
+        return task
+
+    def delete(self, task_id: int) -> Optional[int]:
+        project_id = self.inner.delete(task_id)
+        if project_id is not None:
+            self._invalidate_project(project_id)
+        return project_id
+
+    def list_by_project(self, project_id: int) -> Iterable[Task]:
+        # session-less instances built from the cached rows, like _snapshot
+        return [Task(**row._mapping) for row in self.list_rows_by_project(project_id)]
+
+    def list_rows_by_project(
+        self,
+        project_id: int,
+        fields: Optional[Sequence[str]] = None,
+    ) -> List[Row]:
+        if fields is not None:
+            # sparse fieldsets are selected by the database, not cached
+            return self.inner.list_rows_by_project(project_id, fields=fields)
+        # rows are immutable tuples: cached as they are
+        return list(
+            self._get_or_load(
+                _tasks_key(project_id),
+                lambda: self.inner.list_rows_by_project(project_id),
+            )
+        )
+
+    def close_overdue_open(
+        self,
+        batch_size: Optional[int] = None,
+        limit: Optional[int] = None,
+        skip_locked: bool = False,
+    ) -> Iterator[List[int]]:
+        for ids in self.inner.close_overdue_open(
+            batch_size=batch_size,
+            limit=limit,
+            skip_locked=skip_locked,
+        ):
+            # a batch spans many projects: drop every cached task list
+            self._after_write(
+                lambda: self.cache.invalidate_where(
+                    lambda key: key[0] in ("tasks", "project_stats")
+                )
+            )
+            yield ids
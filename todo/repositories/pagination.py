@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+import base64
+import json
+from dataclasses import dataclass
+from typing import Any, Generic, List, Optional, TypeVar
+
+T = TypeVar("T")
+
+# Allowed values for the ``total`` argument of the paged repository methods.
+TOTAL_MODES = ("exact", "estimate")
+
+
+@dataclass
+class Page(Generic[T]):
+    """One page of a keyset-paginated listing."""
+
+    items: List[T]
+    next_cursor: Optional[str] = None
+    total: Optional[int] = None
+    total_is_estimate: bool = False
+
+
+def encode_cursor(key: List[Any]) -> str:
+    """Encodes a seek key (e.g. ``[id]`` or ``[deadline, id]``) as an opaque token."""
+    raw = json.dumps(key, default=_json_default, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> List[Any]:
+    """Decodes a token produced by ``encode_cursor``.
+
+    Raises ValueError for anything that was not produced by ``encode_cursor``.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        key = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except Exception as e:  # binascii.Error, UnicodeError, JSONDecodeError
+        raise ValueError("Invalid cursor") from e
+    if not isinstance(key, list) or not key:
+        raise ValueError("Invalid cursor")
+    return key
+
+
+def cursor_id(value: Any) -> int:
+    """Validates an id taken from a decoded cursor.
+
+    Raises ValueError (not TypeError) for anything but an integer, so a
+    forged cursor is reported like any other invalid one.
+    """
+    if isinstance(value, bool) or not isinstance(value, int):
+        raise ValueError("Invalid cursor")
+    return value
+
+
+def check_total_mode(total: Optional[str]) -> None:
+    if total is not None and total not in TOTAL_MODES:
+        raise ValueError(f"Invalid total mode: {total!r}")
+
+
+def _json_default(value: Any) -> Any:
+    # datetimes are the only non-JSON seek values we use (task deadlines)
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    raise TypeError(f"Cannot encode {type(value).__name__} in a cursor")
@@ -1,51 +1,168 @@
 from __future__ import annotations
 
-from typing import Any, Iterable, Optional, Protocol, List
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, Optional, Protocol, List, Sequence
 
-from sqlalchemy import select
-from sqlalchemy.orm import Session
+from sqlalchemy import Double, and_, case, cast, func, insert, literal, or_, select, text
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, load_only, selectinload
+from sqlalchemy.orm.exc import StaleDataError
 
 from todo.db.session import SessionLocal
+from todo.db.unit_of_work import complete, in_unit_of_work
+from todo.exceptions.service_exceptions import VersionConflict
 from todo.models.project import Project
+from todo.models.task import Task
+from todo.repositories.pagination import (
+    Page,
+    check_total_mode,
+    cursor_id,
+    decode_cursor,
+    encode_cursor,
+)
+from todo.repositories.quota import (
+    claim_project_slot,
+    project_slot_cte,
+    raise_project_quota_error,
+    release_project_slot,
+    supports_dml_cte,
+)
+
+
+@dataclass
+class ProjectStats:
+    """Task statistics of one project (see ProjectRepository.task_stats)."""
+
+    project_id: int
+    counts: Dict[str, int] = field(default_factory=dict)  # tasks per status
+    total: int = 0
+    overdue: int = 0
+    # earliest deadline of an open task that has not passed yet
+    next_deadline: Optional[datetime] = None
+    last_closed_at: Optional[datetime] = None
 
 
 class ProjectRepository(Protocol):
     """Abstraction for project persistence layer."""
 
-    def create(self, name: str, description: Optional[str] = None) -> Project: ...
-    def update(self, project_id: int, **fields: Any) -> Project: ...
+    def create(
+        self,
+        name: str,
+        description: Optional[str] = None,
+        max_projects: Optional[int] = None,
+    ) -> Project: ...
+    def update(
+        self,
+        project_id: int,
+        expected_version: Optional[int] = None,
+        **fields: Any,
+    ) -> Project: ...
     def delete(self, project_id: int) -> None: ...
-    def get_by_id(self, project_id: int) -> Optional[Project]: ...
+    def get_by_id(
+        self,
+        project_id: int,
+        with_tasks: bool = False,
+        fields: Optional[Sequence[str]] = None,
+    ) -> Optional[Project]: ...
+    def get_version(self, project_id: int) -> Optional[int]: ...
     def get_by_name(self, name: str) -> Optional[Project]: ...
-    def list_all(self) -> Iterable[Project]: ...
+    def search(self, query: str, limit: int) -> List[Project]: ...
+    def list_all(
+        self,
+        with_tasks: bool = False,
+        fields: Optional[Sequence[str]] = None,
+    ) -> Iterable[Project]: ...
+    def task_stats(self, project_id: Optional[int] = None) -> List[ProjectStats]: ...
+    def list_page(
+        self,
+        limit: int,
+        cursor: Optional[str] = None,
+        total: Optional[str] = None,
+        with_tasks: bool = False,
+        fields: Optional[Sequence[str]] = None,
+    ) -> Page[Project]: ...
 
 
 class SqlAlchemyProjectRepository(ProjectRepository):
     """SQLAlchemy implementation of ProjectRepository."""
 
-    def __init__(self, session_factory=SessionLocal) -> None:
+    def __init__(self, session_factory=SessionLocal, read_session_factory=None) -> None:
         self.session_factory = session_factory
+        # Reads use the primary unless a replica factory is passed (the API
+        # container does); commands and scripts then see their own writes.
+        self.read_session_factory = read_session_factory or session_factory
+
+    def create(
+        self,
+        name: str,
+        description: Optional[str] = None,
+        max_projects: Optional[int] = None,
+    ) -> Project:
+        """Inserts a project, claiming a slot of the global project quota.
 
-    def create(self, name: str, description: Optional[str] = None) -> Project:
+        Raises QuotaExceeded if ``max_projects`` projects already exist and
+        ValueError if the name is taken.
+        """
         with self.session_factory() as s:  # type: Session
-            project = Project(name=name, description=description)
-            s.add(project)
-            s.commit()
-            s.refresh(project)
-            return project
+            try:
+                if supports_dml_cte(s):
+                    slot = project_slot_cte(max_projects)
+                    columns = Project.__table__.c
+                    stmt = (
+                        insert(Project)
+                        .add_cte(slot)
+                        .from_select(
+                            ["name", "description", "task_count"],
+                            select(
+                                literal(name, columns.name.type),
+                                literal(description, columns.description.type),
+                                literal(0, columns.task_count.type),
+                            ).select_from(slot),
+                        )
+                        .returning(Project)
+                    )
+                    project = s.scalars(stmt).first()
+                    if project is None:
+                        raise_project_quota_error(s)
+                    if not in_unit_of_work(s):
+                        # RETURNING loaded every column: detach instead of
+                        # expiring on commit, so no refresh SELECT is needed.
+                        s.expunge(project)
+                        s.commit()
+                    return project
+
+                claim_project_slot(s, max_projects)
+                project = Project(name=name, description=description)
+                s.add(project)
+                complete(s, project)
+                return project
+            except IntegrityError as e:
+                s.rollback()
+                raise ValueError("Project with this name already exists") from e
 
-    def update(self, project_id: int, **fields: Any) -> Project:
+    def update(
+        self,
+        project_id: int,
+        expected_version: Optional[int] = None,
+        **fields: Any,
+    ) -> Project:
+        """Updates a project and bumps its version (see TaskRepository.update)."""
         with self.session_factory() as s:
             project: Project | None = s.get(Project, project_id)
             if project is None:
                 raise LookupError(f"Project #{project_id} not found")
+            if expected_version is not None and project.version != expected_version:
+                raise VersionConflict(f"Project #{project_id} has changed")
 
             for key, value in fields.items():
                 if value is not None:
                     setattr(project, key, value)
 
-            s.commit()
-            s.refresh(project)
+            try:
+                complete(s, project)
+            except StaleDataError as e:
+                raise VersionConflict(f"Project #{project_id} has changed") from e
             return project
 
     def delete(self, project_id: int) -> None:
@@ -54,14 +171,46 @@ class SqlAlchemyProjectRepository(ProjectRepository):
             if project is None:
                 return
             s.delete(project)
-            s.commit()
+            release_project_slot(s)
+            complete(s)
 
-    def get_by_id(self, project_id: int) -> Optional[Project]:
-        with self.session_factory() as s:
-            return s.get(Project, project_id)
+    def get_by_id(
+        self,
+        project_id: int,
+        with_tasks: bool = False,
+        fields: Optional[Sequence[str]] = None,
+    ) -> Optional[Project]:
+        with self.read_session_factory() as s:
+            return s.get(Project, project_id, options=self._load_options(with_tasks, fields))
+
+    @staticmethod
+    def _load_options(with_tasks: bool, fields: Optional[Sequence[str]] = None) -> list:
+        options = []
+        if with_tasks:
+            # one extra SELECT ... WHERE project_id IN (...) for all projects
+            # of the result, instead of a lazy load per project
+            options.append(selectinload(Project.tasks))
+        if fields is not None:
+            # sparse fieldset; id and version are always kept (ETags)
+            columns = Project.__mapper__.column_attrs
+            keep = {"id", "version", *fields}
+            unknown = keep - set(columns.keys())
+            if unknown:
+                raise ValueError(f"Unknown project field(s): {', '.join(sorted(unknown))}")
+            options.append(
+                load_only(*(getattr(Project, attr.key) for attr in columns if attr.key in keep))
+            )
+        return options
+
+    def get_version(self, project_id: int) -> Optional[int]:
+        """Returns the version of a project without loading the row."""
+        with self.read_session_factory() as s:
+            return s.execute(
+                select(Project.version).where(Project.id == project_id)
+            ).scalar()
 
     def get_by_name(self, name: str) -> Optional[Project]:
-        with self.session_factory() as s:
+        with self.read_session_factory() as s:
             row = (
                 s.execute(
                     select(Project)
@@ -73,13 +222,149 @@ class SqlAlchemyProjectRepository(ProjectRepository):
             )
             return row
 
-    def list_all(self) -> Iterable[Project]:
-        with self.session_factory() as s:
+    def search(self, query: str, limit: int) -> List[Project]:
+        """Typeahead lookup of projects by name, best match first.
+
+        Ranks an exact (case-insensitive) match first, then prefix matches,
+        then the rest; on Postgres ties are broken by trigram similarity and
+        misspelled names are found as well. Served by the pg_trgm GIN index on
+        ``lower(name)``; queries shorter than three characters (too short for
+        trigrams) only match prefixes, via the ``text_pattern_ops`` index.
+        """
+        q = query.lower()
+        pattern = q.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        name = func.lower(Project.name)
+        exact = name == q
+        prefix = name.like(f"{pattern}%", escape="\\")
+        substring = name.like(f"%{pattern}%", escape="\\")
+
+        with self.read_session_factory() as s:
+            if s.get_bind().dialect.name == "postgresql":
+                where = prefix if len(q) < 3 else or_(substring, name.bool_op("%")(q))
+                rank = case((exact, 3.0), (prefix, 2.0), else_=0.0) + cast(
+                    func.similarity(name, q), Double
+                )
+            else:
+                where = substring
+                rank = case((exact, 3), (prefix, 2), else_=1)
+
+            stmt = (
+                select(Project)
+                .where(where)
+                .order_by(rank.desc(), Project.name.asc(), Project.id.asc())
+                .limit(limit)
+            )
+            return list(s.execute(stmt).scalars().all())
+
+    def list_all(
+        self,
+        with_tasks: bool = False,
+        fields: Optional[Sequence[str]] = None,
+    ) -> Iterable[Project]:
+        with self.read_session_factory() as s:
             rows: List[Project] = (
                 s.execute(
-                    select(Project).order_by(Project.id.asc())
+                    select(Project)
+                    .options(*self._load_options(with_tasks, fields))
+                    .order_by(Project.id.asc())
                 )
                 .scalars()
                 .all()
             )
             return rows
+
+    def task_stats(self, project_id: Optional[int] = None) -> List[ProjectStats]:
+        """Task statistics of every project (or just ``project_id``), ordered by id.
+
+        One aggregate over ``projects LEFT JOIN tasks`` grouped by project and
+        status, instead of loading each project's tasks; projects without
+        tasks are included with zero counts.
+        """
+        now = datetime.now(timezone.utc)
+        is_open = Task.status != "done"
+        stmt = (
+            select(
+                Project.id,
+                Task.status,
+                func.count(Task.id),
+                func.count(case((and_(is_open, Task.deadline < now), 1))),
+                func.min(case((and_(is_open, Task.deadline >= now), Task.deadline))),
+                func.max(Task.closed_at),
+            )
+            .select_from(Project)
+            .outerjoin(Task, Task.project_id == Project.id)
+            .group_by(Project.id, Task.status)
+            .order_by(Project.id.asc())
+        )
+        if project_id is not None:
+            stmt = stmt.where(Project.id == project_id)
+
+        stats: Dict[int, ProjectStats] = {}
+        with self.read_session_factory() as s:
+            for pid, status, count, overdue, next_deadline, last_closed_at in s.execute(stmt):
+                st = stats.setdefault(pid, ProjectStats(project_id=pid))
+                if status is None:
+                    continue  # no tasks (status is NOT NULL)
+                st.counts[status] = count
+                st.total += count
+                st.overdue += overdue
+                if next_deadline is not None and (
+                    st.next_deadline is None or next_deadline < st.next_deadline
+                ):
+                    st.next_deadline = next_deadline
+                if last_closed_at is not None and (
+                    st.last_closed_at is None or last_closed_at > st.last_closed_at
+                ):
+                    st.last_closed_at = last_closed_at
+        return list(stats.values())
+
+    def list_page(
+        self,
+        limit: int,
+        cursor: Optional[str] = None,
+        total: Optional[str] = None,
+        with_tasks: bool = False,
+        fields: Optional[Sequence[str]] = None,
+    ) -> Page[Project]:
+        """Returns up to ``limit`` projects after ``cursor``, ordered by id.
+
+        Seeks on the primary key instead of using OFFSET, so every page costs
+        the same regardless of how deep the client has paged. ``total`` may be
+        ``"exact"`` (COUNT(*)) or ``"estimate"`` (planner statistics on
+        Postgres, exact elsewhere).
+        """
+        check_total_mode(total)
+        stmt = (
+            select(Project)
+            .options(*self._load_options(with_tasks, fields))
+            .order_by(Project.id.asc())
+            .limit(limit + 1)
+        )
+        if cursor is not None:
+            key = decode_cursor(cursor)
+            if key[0] != "id" or len(key) != 2:
+                raise ValueError("Invalid cursor")
+            stmt = stmt.where(Project.id > cursor_id(key[1]))
+
+        with self.read_session_factory() as s:
+            rows: List[Project] = list(s.execute(stmt).scalars().all())
+            page = Page(items=rows[:limit])
+            if len(rows) > limit:
+                page.next_cursor = encode_cursor(["id", rows[limit - 1].id])
+            if total is not None:
+                page.total, page.total_is_estimate = self._count(s, total)
+            return page
+
+    def _count(self, s: Session, total: str) -> tuple[int, bool]:
+        if total == "estimate" and s.get_bind().dialect.name == "postgresql":
+            estimate = s.execute(
+                text(
+                    "SELECT reltuples::bigint FROM pg_class "
+                    "WHERE oid = 'projects'::regclass"
+                )
+            ).scalar()
+            # reltuples is -1 until the table has been vacuumed/analyzed
+            if estimate is not None and estimate >= 0:
+                return int(estimate), True
+        exact = s.execute(select(func.count()).select_from(Project)).scalar_one()
+        return int(exact), False
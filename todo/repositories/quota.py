@@ -0,0 +1,106 @@
+"""Counter-based quota enforcement shared by the SQLAlchemy repositories.
+
+Each quota is a maintained counter row (``projects.task_count`` per project,
+``quota_counters['projects']`` for the project total). A slot is claimed with
+a conditional ``UPDATE ... SET n = n + k WHERE n + k <= limit`` inside the
+transaction that performs the insert: the row lock taken by the UPDATE
+serializes concurrent creators, and Postgres re-checks the condition after
+waiting on the lock, so the limit holds under any number of writers. On
+Postgres the UPDATE is embedded as a CTE of the INSERT, making a create a
+single statement.
+"""
+from __future__ import annotations
+
+from typing import NoReturn, Optional
+
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.selectable import CTE
+
+from todo.exceptions.service_exceptions import QuotaExceeded
+from todo.models.project import Project
+from todo.models.quota_counter import QuotaCounter
+
+PROJECTS_COUNTER = "projects"
+
+
+def supports_dml_cte(s: Session) -> bool:
+    """Whether UPDATE ... RETURNING can be used as a CTE of an INSERT."""
+    return s.get_bind().dialect.name == "postgresql"
+
+
+# -------- tasks per project --------
+def _task_slot_update(project_id: int, n: int, limit: Optional[int]):
+    stmt = (
+        update(Project)
+        .where(Project.id == project_id)
+        .values(task_count=Project.task_count + n)
+    )
+    if limit is not None:
+        stmt = stmt.where(Project.task_count + n <= limit)
+    return stmt.returning(Project.id)
+
+
+def task_slot_cte(project_id: int, n: int, limit: Optional[int]) -> CTE:
+    """CTE claiming ``n`` task slots; yields the project id when granted."""
+    return _task_slot_update(project_id, n, limit).cte("task_slot")
+
+
+def claim_task_slots(s: Session, project_id: int, n: int, limit: Optional[int]) -> None:
+    """Claims ``n`` task slots or raises LookupError / QuotaExceeded."""
+    if s.execute(_task_slot_update(project_id, n, limit)).first() is None:
+        raise_task_quota_error(s, project_id)
+
+
+def release_task_slots(s: Session, project_id: int, n: int = 1) -> None:
+    s.execute(
+        update(Project)
+        .where(Project.id == project_id)
+        .values(task_count=Project.task_count - n)
+    )
+
+
+def raise_task_quota_error(s: Session, project_id: int) -> NoReturn:
+    """Explains why a task slot was not granted (only runs on the failure path)."""
+    if s.get(Project, project_id) is None:
+        raise LookupError(f"Project #{project_id} not found")
+    raise QuotaExceeded("Maximum number of tasks for this project reached")
+
+
+# -------- projects --------
+def _project_slot_update(limit: Optional[int], n: int = 1):
+    stmt = (
+        update(QuotaCounter)
+        .where(QuotaCounter.name == PROJECTS_COUNTER)
+        .values(used=QuotaCounter.used + n)
+    )
+    if limit is not None:
+        stmt = stmt.where(QuotaCounter.used + n <= limit)
+    return stmt.returning(QuotaCounter.name)
+
+
+def project_slot_cte(limit: Optional[int]) -> CTE:
+    """CTE claiming one project slot; yields a row when granted."""
+    return _project_slot_update(limit).cte("project_slot")
+
+
+def claim_project_slot(s: Session, limit: Optional[int], n: int = 1) -> None:
+    """Claims ``n`` project slots (all or none) or raises QuotaExceeded."""
+    if s.execute(_project_slot_update(limit, n)).first() is None:
+        raise_project_quota_error(s)
+
+
+def release_project_slot(s: Session) -> None:
+    s.execute(
+        update(QuotaCounter)
+        .where(QuotaCounter.name == PROJECTS_COUNTER)
+        .values(used=QuotaCounter.used - 1)
+    )
+
+
+def raise_project_quota_error(s: Session) -> NoReturn:
+    """Explains why a project slot was not granted (only runs on the failure path)."""
+    if s.get(QuotaCounter, PROJECTS_COUNTER) is None:
+        # the row is created by the quota migration
+        raise RuntimeError("quota_counters is not initialised; run `alembic upgrade head`")
+    raise QuotaExceeded("Maximum number of projects reached")
@@ -1,13 +1,101 @@
 from __future__ import annotations
 
-from typing import Any, Iterable, Optional, Protocol
+from dataclasses import dataclass
+from typing import Any, Iterable, Iterator, List, Mapping, Optional, Protocol, Sequence, Tuple
 from datetime import datetime, timezone
 
-from sqlalchemy import select
-from sqlalchemy.orm import Session
+from sqlalchemy import ColumnElement, Row, and_, func, insert, literal, or_, select, update
+from sqlalchemy.orm import Session, load_only
+from sqlalchemy.orm.exc import StaleDataError
 
 from todo.db.session import SessionLocal
+from todo.db.unit_of_work import complete, in_unit_of_work
+from todo.exceptions.service_exceptions import VersionConflict
 from todo.models.task import Task
+from todo.repositories.pagination import (
+    Page,
+    check_total_mode,
+    cursor_id,
+    decode_cursor,
+    encode_cursor,
+)
+from todo.repositories.quota import (
+    claim_task_slots,
+    raise_task_quota_error,
+    release_task_slots,
+    supports_dml_cte,
+    task_slot_cte,
+)
+from todo.repositories.task_search import match_and_rank
+
+# Every mapped column, in the order of TaskRead; rows of these serialize
+# without building ORM instances (list_rows_by_project)
+TASK_ROW_COLUMNS = (
+    Task.id,
+    Task.project_id,
+    Task.title,
+    Task.description,
+    Task.status,
+    Task.deadline,
+    Task.closed_at,
+    Task.version,
+)
+
+
+
+def task_columns(fields: Optional[Sequence[str]] = None) -> tuple:
+    """TASK_ROW_COLUMNS restricted to the attribute names in ``fields`` (None: all).
+
+    ``id``, ``project_id`` and ``version`` are always kept: ownership
+    checks, cursors and ETags are built from them.
+    """
+    if fields is None:
+        return TASK_ROW_COLUMNS
+    keep = {"id", "project_id", "version", *fields}
+    unknown = keep - {c.key for c in TASK_ROW_COLUMNS}
+    if unknown:
+        raise ValueError(f"Unknown task field(s): {', '.join(sorted(unknown))}")
+    return tuple(c for c in TASK_ROW_COLUMNS if c.key in keep)
+
+
+# Orderings supported by ``query_page`` / ``list_by_project_page``;
+# a leading "-" sorts descending.
+TASK_PAGE_ORDERS = ("id", "-id", "deadline", "-deadline", "closed_at", "-closed_at")
+
+
+@dataclass
+class TaskFilter:
+    """Predicates of a task listing; unset fields do not filter."""
+
+    statuses: Sequence[str] = ()
+    deadline_from: Optional[datetime] = None  # inclusive
+    deadline_to: Optional[datetime] = None  # exclusive
+    has_deadline: Optional[bool] = None
+    # "open" (status other than done) or "closed" (done)
+    state: Optional[str] = None
+
+    def is_empty(self) -> bool:
+        return not self.clauses()
+
+    def clauses(self) -> List[ColumnElement[bool]]:
+        clauses: List[ColumnElement[bool]] = []
+        if self.statuses:
+            clauses.append(Task.status.in_(list(self.statuses)))
+        if self.deadline_from is not None:
+            clauses.append(Task.deadline >= self.deadline_from)
+        if self.deadline_to is not None:
+            clauses.append(Task.deadline < self.deadline_to)
+        if self.has_deadline is not None:
+            clauses.append(
+                Task.deadline.is_not(None) if self.has_deadline else Task.deadline.is_(None)
+            )
+        if self.state == "open":
+            clauses.append(Task.status != "done")
+        elif self.state == "closed":
+            clauses.append(Task.status == "done")
+        elif self.state is not None:
+            raise ValueError(f"Invalid state: {self.state!r}")
+        return clauses
 
 
 class TaskRepository(Protocol):
@@ -19,20 +107,87 @@ class TaskRepository(Protocol):
         title: str,
         description: Optional[str] = None,
         deadline: Optional[datetime] = None,
+        max_tasks: Optional[int] = None,
     ) -> Task: ...
 
-    def update(self, task_id: int, **fields: Any) -> Task: ...
-    def delete(self, task_id: int) -> None: ...
-    def get_by_id(self, task_id: int) -> Optional[Task]: ...
+    def create_many(
+        self,
+        project_id: int,
+        items: Sequence[Mapping[str, Any]],
+        max_tasks: Optional[int] = None,
+    ) -> List[Task]: ...
+
+    def update(
+        self,
+        task_id: int,
+        expected_version: Optional[int] = None,
+        **fields: Any,
+    ) -> Task: ...
+    def delete(self, task_id: int) -> Optional[int]: ...
+    def get_by_id(self, task_id: int, fields: Optional[Sequence[str]] = None) -> Optional[Task]: ...
+    def get_version(self, task_id: int) -> Optional[tuple[int, int]]: ...
+    def list_fingerprint(self, project_id: int) -> tuple[int, int, int]: ...
     def list_by_project(self, project_id: int) -> Iterable[Task]: ...
-    def list_overdue_open(self) -> Iterable[Task]: ...
+    def list_rows_by_project(
+        self,
+        project_id: int,
+        fields: Optional[Sequence[str]] = None,
+    ) -> List[Row]: ...
+    def list_by_project_page(
+        self,
+        project_id: int,
+        limit: Optional[int],
+        cursor: Optional[str] = None,
+        order_by: str = "id",
+        total: Optional[str] = None,
+        fields: Optional[Sequence[str]] = None,
+    ) -> Page[Task]: ...
+    def query_page(
+        self,
+        project_id: int,
+        filters: TaskFilter,
+        limit: Optional[int],
+        cursor: Optional[str] = None,
+        order_by: str = "id",
+        total: Optional[str] = None,
+        fields: Optional[Sequence[str]] = None,
+    ) -> Page[Task]: ...
+    def search(
+        self,
+        query: str,
+        limit: int,
+        cursor: Optional[str] = None,
+    ) -> Page[Tuple[Task, float]]: ...
+    def iter_rows(
+        self,
+        project_id: Optional[int] = None,
+        statuses: Optional[Sequence[str]] = None,
+        chunk_size: int = 1000,
+    ) -> Iterator[Sequence[Any]]: ...
+    def list_open_deadlines(
+        self,
+        until: datetime,
+        after: Optional[datetime] = None,
+        changed_since: Optional[datetime] = None,
+    ) -> List[Tuple[int, datetime, datetime]]: ...
+    def list_overdue_open(self, limit: Optional[int] = None) -> Iterable[Task]: ...
+    def count_overdue_open(self) -> int: ...
+    def close_overdue_open(
+        self,
+        batch_size: Optional[int] = None,
+        limit: Optional[int] = None,
+        skip_locked: bool = False,
+    ) -> Iterator[List[int]]: ...
 
 
 class SqlAlchemyTaskRepository(TaskRepository):
     """SQLAlchemy implementation of TaskRepository."""
 
-    def __init__(self, session_factory=SessionLocal) -> None:
+    def __init__(self, session_factory=SessionLocal, read_session_factory=None) -> None:
         self.session_factory = session_factory
+        # Reads use the primary unless a replica factory is passed (the API
+        # container does); commands and scripts then see their own writes.
+        self.read_session_factory = read_session_factory or session_factory
 
     def create(
         self,
@@ -40,8 +195,43 @@ class SqlAlchemyTaskRepository(TaskRepository):
         title: str,
         description: Optional[str] = None,
         deadline: Optional[datetime] = None,
+        max_tasks: Optional[int] = None,
     ) -> Task:
+        """Inserts a task, claiming a slot of the project's task quota.
+
+        Raises LookupError if the project does not exist and QuotaExceeded if
+        it already holds ``max_tasks`` tasks.
+        """
         with self.session_factory() as s:  # type: Session
+            if supports_dml_cte(s):
+                slot = task_slot_cte(project_id, 1, max_tasks)
+                columns = Task.__table__.c
+                stmt = (
+                    insert(Task)
+                    .add_cte(slot)
+                    .from_select(
+                        ["project_id", "title", "description", "status", "deadline"],
+                        select(
+                            slot.c.id,
+                            literal(title, columns.title.type),
+                            literal(description, columns.description.type),
+                            literal("todo", columns.status.type),
+                            literal(deadline, columns.deadline.type),
+                        ),
+                    )
+                    .returning(Task)
+                )
+                task = s.scalars(stmt).first()
+                if task is None:
+                    raise_task_quota_error(s, project_id)
+                if not in_unit_of_work(s):
+                    # RETURNING loaded every column: detach instead of
+                    # expiring on commit, so no refresh SELECT is needed.
+                    s.expunge(task)
+                    s.commit()
+                return task
+
+            claim_task_slots(s, project_id, 1, max_tasks)
             task = Task(
                 project_id=project_id,
                 title=title,
@@ -49,38 +239,125 @@ class SqlAlchemyTaskRepository(TaskRepository):
                 deadline=deadline,
             )
             s.add(task)
-            s.commit()
-            s.refresh(task)
+            complete(s, task)
             return task
 
-    def update(self, task_id: int, **fields: Any) -> Task:
+    def create_many(
+        self,
+        project_id: int,
+        items: Sequence[Mapping[str, Any]],
+        max_tasks: Optional[int] = None,
+    ) -> List[Task]:
+        """Inserts several tasks atomically, claiming their quota slots at once.
+
+        ``items`` are mappings with ``title`` and optional ``description`` /
+        ``deadline``. The rows go out as one multi-row ``INSERT ... RETURNING``
+        (SQLAlchemy's insertmanyvalues) in the transaction that claimed the
+        slots, so either every task is created or none is. Raises LookupError
+        / QuotaExceeded like ``create``.
+        """
+        if not items:
+            return []
+        rows = [
+            {
+                "project_id": project_id,
+                "title": item["title"],
+                "description": item.get("description"),
+                "status": "todo",
+                "deadline": item.get("deadline"),
+            }
+            for item in items
+        ]
+        with self.session_factory() as s:  # type: Session
+            claim_task_slots(s, project_id, len(rows), max_tasks)
+            tasks = list(
+                s.scalars(
+                    insert(Task).returning(Task, sort_by_parameter_order=True),
+                    rows,
+                ).all()
+            )
+            if not in_unit_of_work(s):
+                # RETURNING loaded every column: detach instead of expiring
+                # on commit, so no per-row refresh is needed.
+                for task in tasks:
+                    s.expunge(task)
+                s.commit()
+            return tasks
+
+    def update(
+        self,
+        task_id: int,
+        expected_version: Optional[int] = None,
+        **fields: Any,
+    ) -> Task:
+        """Updates a task and, if any value changed, bumps its version.
+
+        The UPDATE is guarded by the version that was loaded, so a concurrent
+        change raises VersionConflict instead of being overwritten; so does an
+        ``expected_version`` that is no longer current.
+        """
         with self.session_factory() as s:
             task = s.get(Task, task_id)
             if task is None:
                 raise LookupError(f"Task #{task_id} not found")
+            if expected_version is not None and task.version != expected_version:
+                raise VersionConflict(f"Task #{task_id} has changed")
 
             for key, value in fields.items():
                 if value is not None:
                     setattr(task, key, value)
 
-            s.commit()
-            s.refresh(task)
+            try:
+                complete(s, task)
+            except StaleDataError as e:
+                raise VersionConflict(f"Task #{task_id} has changed") from e
             return task
 
-    def delete(self, task_id: int) -> None:
+    def delete(self, task_id: int) -> Optional[int]:
+        """Deletes a task; returns its project id, or None if there was no such task."""
         with self.session_factory() as s:
             task = s.get(Task, task_id)
             if task is None:
-                return
+                return None
+            project_id = task.project_id
             s.delete(task)
-            s.commit()
+            release_task_slots(s, project_id)
+            complete(s)
+            return project_id
 
-    def get_by_id(self, task_id: int) -> Optional[Task]:
-        with self.session_factory() as s:
-            return s.get(Task, task_id)
+    def get_by_id(self, task_id: int, fields: Optional[Sequence[str]] = None) -> Optional[Task]:
+        """Loads a task; with ``fields`` only those columns (see task_columns)."""
+        options = [] if fields is None else [load_only(*task_columns(fields))]
+        with self.read_session_factory() as s:
+            return s.get(Task, task_id, options=options)
+
+    def get_version(self, task_id: int) -> Optional[tuple[int, int]]:
+        """Returns ``(project_id, version)`` of a task without loading the row."""
+        with self.read_session_factory() as s:
+            row = s.execute(
+                select(Task.project_id, Task.version).where(Task.id == task_id)
+            ).first()
+            return None if row is None else (row.project_id, row.version)
+
+    def list_fingerprint(self, project_id: int) -> tuple[int, int, int]:
+        """Summarizes a project's tasks as ``(count, max id, sum of versions)``.
+
+        Every write changes the tuple: an insert raises the max id (ids are
+        never reused), a delete lowers the count and an update raises the
+        version sum.
+        """
+        with self.read_session_factory() as s:
+            count, max_id, versions = s.execute(
+                select(
+                    func.count(Task.id),
+                    func.coalesce(func.max(Task.id), 0),
+                    func.coalesce(func.sum(Task.version), 0),
+                ).where(Task.project_id == project_id)
+            ).one()
+            return int(count), int(max_id), int(versions)
 
     def list_by_project(self, project_id: int) -> Iterable[Task]:
-        with self.session_factory() as s:
+        with self.read_session_factory() as s:
             rows = (
                 s.execute(
                     select(Task)
@@ -92,18 +369,326 @@ class SqlAlchemyTaskRepository(TaskRepository):
             )
             return rows
 
-    def list_overdue_open(self) -> Iterable[Task]:
-        now = datetime.now(timezone.utc)
-        with self.session_factory() as s:
-            rows = (
+    def list_rows_by_project(
+        self,
+        project_id: int,
+        fields: Optional[Sequence[str]] = None,
+    ) -> List[Row]:
+        """Like ``list_by_project``, as rows of ``task_columns(fields)``.
+
+        Skips the ORM (identity map, instance state) for read-only callers
+        such as the list endpoint; rows expose the columns as attributes.
+        """
+        with self.read_session_factory() as s:
+            return list(
                 s.execute(
-                    select(Task)
-                    .where(Task.deadline != None)  # noqa: E711
-                    .where(Task.deadline < now)
-                    .where(Task.status != "done")
-                    .order_by(Task.deadline.asc())
+                    select(*task_columns(fields))
+                    .where(Task.project_id == project_id)
+                    .order_by(Task.id.asc())
+                ).all()
+            )
+
+    def list_by_project_page(
+        self,
+        project_id: int,
+        limit: Optional[int],
+        cursor: Optional[str] = None,
+        order_by: str = "id",
+        total: Optional[str] = None,
+        fields: Optional[Sequence[str]] = None,
+    ) -> Page[Task]:
+        """Returns up to ``limit`` (None: all) tasks of a project after ``cursor`` (no filters)."""
+        return self.query_page(
+            project_id,
+            TaskFilter(),
+            limit=limit,
+            cursor=cursor,
+            order_by=order_by,
+            total=total,
+            fields=fields,
+        )
+
+    def query_page(
+        self,
+        project_id: int,
+        filters: TaskFilter,
+        limit: Optional[int],
+        cursor: Optional[str] = None,
+        order_by: str = "id",
+        total: Optional[str] = None,
+        fields: Optional[Sequence[str]] = None,
+    ) -> Page[Task]:
+        """Returns up to ``limit`` matching tasks of a project after ``cursor``.
+
+        All ``filters`` compile into the WHERE clause of one SELECT. ``order_by``
+        is one of TASK_PAGE_ORDERS; a leading ``-`` sorts descending. ``id``
+        seeks on ``(id)``, ``deadline`` / ``closed_at`` seek on ``(column, id)``
+        with NULLs sorted last in both directions (the descending orders have
+        indexes of their own). A cursor is only valid for the ordering that
+        produced it; ``limit=None`` returns every match as one page. ``total`` counts the matching tasks
+        exactly for both ``"exact"`` and ``"estimate"``, since a per-project
+        count is already bounded by MAX_NUMBER_OF_TASKS. With ``fields`` only
+        those columns (and the sort key) are loaded, see task_columns.
+        """
+        if order_by not in TASK_PAGE_ORDERS:
+            raise ValueError(f"Invalid order: {order_by!r}")
+        check_total_mode(total)
+
+        descending = order_by.startswith("-")
+        key = order_by.lstrip("-")
+        where = [Task.project_id == project_id, *filters.clauses()]
+
+        if key == "id":
+            order = [Task.id.desc() if descending else Task.id.asc()]
+        else:
+            column = getattr(Task, key)
+            direction = column.desc() if descending else column.asc()
+            order = [
+                direction.nulls_last(),
+                Task.id.desc() if descending else Task.id.asc(),
+            ]
+
+        stmt = select(Task).where(*where).order_by(*order)
+        if fields is not None:
+            stmt = stmt.options(load_only(*task_columns([*fields, key])))
+        if cursor is not None:
+            stmt = stmt.where(self._seek_after(order_by, decode_cursor(cursor)))
+
+        if limit is not None:
+            stmt = stmt.limit(limit + 1)
+
+        with self.read_session_factory() as s:  # type: Session
+            rows = list(s.execute(stmt).scalars().all())
+            page = Page(items=rows[:limit])
+            if limit is not None and len(rows) > limit:
+                last = rows[limit - 1]
+                if key == "id":
+                    page.next_cursor = encode_cursor([order_by, last.id])
+                else:
+                    page.next_cursor = encode_cursor([order_by, getattr(last, key), last.id])
+            if total is not None:
+                page.total = s.execute(
+                    select(func.count()).select_from(Task).where(*where)
+                ).scalar_one()
+            return page
+
+    @staticmethod
+    def _seek_after(order_by: str, key: list):
+        """Builds the WHERE clause that resumes a listing after ``key``."""
+        if key[0] != order_by:
+            raise ValueError("Invalid cursor")
+        descending = order_by.startswith("-")
+        name = order_by.lstrip("-")
+        try:
+            if name == "id" and len(key) == 2:
+                last_id = cursor_id(key[1])
+                return Task.id < last_id if descending else Task.id > last_id
+            if name in ("deadline", "closed_at") and len(key) == 3:
+                column = getattr(Task, name)
+                last_id = cursor_id(key[2])
+                after_id = Task.id < last_id if descending else Task.id > last_id
+                if key[1] is None:
+                    # already inside the trailing block of NULLs
+                    return and_(column.is_(None), after_id)
+                last_value = datetime.fromisoformat(key[1])
+                return or_(
+                    column < last_value if descending else column > last_value,
+                    and_(column == last_value, after_id),
+                    column.is_(None),
                 )
-                .scalars()
-                .all()
+        except (TypeError, ValueError) as e:
+            raise ValueError("Invalid cursor") from e
+        raise ValueError("Invalid cursor")
+
+    def search(
+        self,
+        query: str,
+        limit: int,
+        cursor: Optional[str] = None,
+    ) -> Page[Tuple[Task, float]]:
+        """Returns up to ``limit`` ``(task, rank)`` hits across all projects.
+
+        Hits are ordered by rank (best first), then id, and paginated with a
+        ``(rank, id)`` seek key. On Postgres matching uses the GIN-indexed
+        ``search_vector``; see ``task_search`` for the fallback.
+        """
+        with self.read_session_factory() as s:  # type: Session
+            match, rank = match_and_rank(s.get_bind().dialect.name, query)
+            stmt = (
+                select(Task, rank.label("rank"))
+                .where(match)
+                .order_by(rank.desc(), Task.id.asc())
             )
+            if cursor is not None:
+                key = decode_cursor(cursor)
+                if key[0] != "rank" or len(key) != 3:
+                    raise ValueError("Invalid cursor")
+                try:
+                    last_rank, last_id = float(key[1]), cursor_id(key[2])
+                except (TypeError, ValueError) as e:
+                    raise ValueError("Invalid cursor") from e
+                stmt = stmt.where(
+                    or_(rank < last_rank, and_(rank == last_rank, Task.id > last_id))
+                )
+
+            rows = s.execute(stmt.limit(limit + 1)).all()
+            page = Page(items=[(task, float(score)) for task, score in rows[:limit]])
+            if len(rows) > limit:
+                task, score = rows[limit - 1]
+                page.next_cursor = encode_cursor(["rank", float(score), task.id])
+            return page
+
+    def iter_rows(
+        self,
+        project_id: Optional[int] = None,
+        statuses: Optional[Sequence[str]] = None,
+        chunk_size: int = 1000,
+    ) -> Iterator[Sequence[Any]]:
+        """Streams tasks as plain column tuples, ordered by id.
+
+        Rows are fetched ``chunk_size`` at a time from a server-side cursor
+        (``yield_per`` implies ``stream_results``) and no ORM objects are
+        built, so memory stays flat however many rows match. The session is
+        held open until the iterator is exhausted or closed.
+        """
+        stmt = select(
+            Task.id,
+            Task.project_id,
+            Task.title,
+            Task.description,
+            Task.status,
+            Task.deadline,
+            Task.closed_at,
+        ).order_by(Task.id.asc())
+        if project_id is not None:
+            stmt = stmt.where(Task.project_id == project_id)
+        if statuses:
+            stmt = stmt.where(Task.status.in_(list(statuses)))
+
+        with self.read_session_factory() as s:  # type: Session
+            result = s.execute(stmt.execution_options(yield_per=chunk_size))
+            for row in result:
+                yield tuple(row)
+
+    @staticmethod
+    def _overdue_open(now: datetime):
+        return and_(
+            Task.deadline != None,  # noqa: E711
+            Task.deadline < now,
+            Task.status != "done",
+        )
+
+    def list_open_deadlines(
+        self,
+        until: datetime,
+        after: Optional[datetime] = None,
+        changed_since: Optional[datetime] = None,
+    ) -> List[Tuple[int, datetime, datetime]]:
+        """``(id, deadline, updated_at)`` of open tasks due by ``until``.
+
+        With ``after`` and/or ``changed_since`` only the tasks due after
+        ``after`` or changed since ``changed_since`` are returned, so the
+        autoclose scheduler can extend its window and pick up edits without
+        reading what it already knows. Served by the partial indexes on the
+        open tasks' ``deadline`` and ``updated_at``. Always read from the
+        primary: a lagging replica would hide just-changed deadlines behind
+        ``changed_since``, and the scheduler would never see them.
+        """
+        stmt = select(Task.id, Task.deadline, Task.updated_at).where(
+            Task.status != "done",
+            Task.deadline != None,  # noqa: E711
+            Task.deadline <= until,
+        )
+        since = []
+        if after is not None:
+            since.append(Task.deadline > after)
+        if changed_since is not None:
+            since.append(Task.updated_at > changed_since)
+        if since:
+            stmt = stmt.where(or_(*since))
+        with self.session_factory() as s:
+            return [tuple(row) for row in s.execute(stmt)]
+
+    def list_overdue_open(self, limit: Optional[int] = None) -> Iterable[Task]:
+        now = datetime.now(timezone.utc)
+        stmt = (
+            select(Task)
+            .where(self._overdue_open(now))
+            .order_by(Task.deadline.asc())
+        )
+        if limit is not None:
+            stmt = stmt.limit(limit)
+        with self.read_session_factory() as s:
+            rows = s.execute(stmt).scalars().all()
             return rows
+
+    def count_overdue_open(self) -> int:
+        now = datetime.now(timezone.utc)
+        with self.read_session_factory() as s:
+            return s.execute(
+                select(func.count())
+                .select_from(Task)
+                .where(self._overdue_open(now))
+            ).scalar_one()
+
+    def close_overdue_open(
+        self,
+        batch_size: Optional[int] = None,
+        limit: Optional[int] = None,
+        skip_locked: bool = False,
+    ) -> Iterator[List[int]]:
+        """Marks overdue open tasks as done, yielding the ids of each batch.
+
+        Without ``batch_size`` every overdue task is closed by one
+        ``UPDATE ... RETURNING``. With ``batch_size`` the oldest deadlines are
+        closed first, ``batch_size`` rows per transaction (per flush inside a
+        unit of work), so locks stay short and progress can be reported
+        between batches. ``limit`` caps the total
+        number of tasks closed by this call.
+
+        With ``skip_locked`` (and ``batch_size``) each batch is claimed by
+        ``SELECT ... FOR UPDATE SKIP LOCKED``, so concurrent callers close
+        disjoint batches instead of queueing behind each other's row locks;
+        the call only ends once no unclaimed overdue task is left. SQLite
+        has no row locks and ignores the clause (writers serialize).
+        """
+        now = datetime.now(timezone.utc)
+        remaining = limit
+        while remaining is None or remaining > 0:
+            size = batch_size
+            if remaining is not None:
+                size = remaining if size is None else min(size, remaining)
+
+            stmt = update(Task).values(
+                status="done",
+                closed_at=now,
+                version=Task.version + 1,
+            )
+            if size is None:
+                stmt = stmt.where(self._overdue_open(now))
+            else:
+                batch = (
+                    select(Task.id)
+                    .where(self._overdue_open(now))
+                    .order_by(Task.deadline.asc(), Task.id.asc())
+                    .limit(size)
+                )
+                if skip_locked:
+                    batch = batch.with_for_update(skip_locked=True)
+                stmt = stmt.where(Task.id.in_(batch.scalar_subquery()))
+            stmt = stmt.returning(Task.id).execution_options(synchronize_session=False)
+
+            with self.session_factory() as s:
+                ids = list(s.execute(stmt).scalars().all())
+                complete(s)
+
+            if ids:
+                yield ids
+            if size is None or not ids:
+                return
+            # a short batch means the rest is gone, unless it was claimed
+            # (and may yet be released by a rollback) by another worker
+            if len(ids) < size and not skip_locked:
+                return
+            if remaining is not None:
+                remaining -= len(ids)
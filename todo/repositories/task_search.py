@@ -0,0 +1,66 @@
+"""Full-text search predicates for tasks.
+
+On Postgres ``tasks.search_vector`` is a generated ``tsvector`` column
+(title weighted A, description B) with a GIN index; it is created by a
+migration and deliberately not mapped on ``Task``, so other backends can
+still ``create_all`` the schema. Elsewhere search falls back to
+case-insensitive LIKE matching of every term, with title hits ranked
+above description hits.
+"""
+from __future__ import annotations
+
+from functools import reduce
+from operator import add
+from typing import Any, Tuple
+
+from sqlalchemy import Double, and_, case, cast, func, literal_column, or_
+
+from todo.models.task import Task
+
+# Text search configuration of the generated column (no stemming, any language)
+TS_CONFIG = "simple"
+# The LIKE fallback ignores terms beyond this
+MAX_FALLBACK_TERMS = 8
+
+
+def search_vector():
+    # imported here: loading the Postgres dialect is not free for commands
+    # that never search (or run on SQLite)
+    from sqlalchemy.dialects.postgresql import TSVECTOR
+
+    return literal_column("tasks.search_vector", type_=TSVECTOR)
+
+
+def _postgres(query: str) -> Tuple[Any, Any]:
+    tsquery = func.websearch_to_tsquery(literal_column(f"'{TS_CONFIG}'::regconfig"), query)
+    match = search_vector().bool_op("@@")(tsquery)
+    # ts_rank returns real; compared as double so cursor values round-trip exactly
+    rank = cast(func.ts_rank(search_vector(), tsquery), Double)
+    return match, rank
+
+
+def _escape_like(term: str) -> str:
+    return term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def _fallback(query: str) -> Tuple[Any, Any]:
+    terms = query.lower().split()[:MAX_FALLBACK_TERMS]
+    conditions, scores = [], []
+    for term in terms:
+        pattern = f"%{_escape_like(term)}%"
+        in_title = func.lower(Task.title).like(pattern, escape="\\")
+        in_description = func.lower(func.coalesce(Task.description, "")).like(pattern, escape="\\")
+        conditions.append(or_(in_title, in_description))
+        scores += [case((in_title, 2), else_=0), case((in_description, 1), else_=0)]
+    return and_(*conditions), cast(reduce(add, scores), Double)
+
+
+def match_and_rank(dialect_name: str, query: str) -> Tuple[Any, Any]:
+    """Returns ``(where clause, rank expression)`` for a search ``query``.
+
+    On Postgres ``query`` uses web search syntax ("quoted phrases", ``or``,
+    ``-excluded``); the fallback treats it as plain terms that must all match.
+    """
+    if dialect_name == "postgresql":
+        return _postgres(query)
+    return _fallback(query)
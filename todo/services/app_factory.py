@@ -1,18 +1,31 @@
 from __future__ import annotations
 
+from typing import Optional
+
+from todo.db.session import SessionLocal
+from todo.db.unit_of_work import UnitOfWork
 from todo.repositories.project_repository import SqlAlchemyProjectRepository
 from todo.repositories.task_repository import SqlAlchemyTaskRepository
 from todo.services.project_service import ProjectService
 from todo.services.task_service import TaskService
 
 
-def build_services() -> tuple[ProjectService, TaskService]:
+def build_services(
+    uow: Optional[UnitOfWork] = None,
+) -> tuple[ProjectService, TaskService]:
     """Factory for building application services.
 
-    Used by CLI (legacy) and Web API (FastAPI controllers).
+    Used by the CLI (legacy) and maintenance commands; the Web API shares
+    one AppContainer per process instead (todo/services/container.py). With ``uow`` all
+    repositories share its session and the services commit it once per
+    use-case; without it every repository call runs in its own session.
+    Reads go to the primary, never to a replica, so a command reads its
+    own writes. Nor do they use the read cache: it is only ever invalidated
+    by the process that writes, and commands share it with nobody.
     """
-    proj_repo = SqlAlchemyProjectRepository()
-    task_repo = SqlAlchemyTaskRepository()
-    project_service = ProjectService(proj_repo, task_repo)
-    task_service = TaskService(proj_repo, task_repo)
+    session_factory = uow.session_factory if uow is not None else SessionLocal
+    proj_repo = SqlAlchemyProjectRepository(session_factory)
+    task_repo = SqlAlchemyTaskRepository(session_factory)
+    project_service = ProjectService(proj_repo, task_repo, uow=uow)
+    task_service = TaskService(proj_repo, task_repo, uow=uow)
     return project_service, task_service
@@ -0,0 +1,215 @@
+from __future__ import annotations
+
+from datetime import datetime
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Protocol,
+    Sequence,
+    Tuple,
+    overload,
+)
+
+from sqlalchemy import Row
+from starlette.concurrency import run_in_threadpool
+
+from todo.db.unit_of_work import UnitOfWork, bind_unit_of_work
+from todo.models.project import Project
+from todo.models.task import Task
+from todo.repositories.pagination import Page
+from todo.repositories.project_repository import ProjectStats
+from todo.repositories.task_repository import TaskFilter
+from todo.services.project_service import ProjectService
+from todo.services.task_service import TaskService
+
+# (method name, args, kwargs) -> awaitable result
+Invoker = Callable[[str, tuple, dict], Awaitable[Any]]
+
+
+class AsyncProjectService(Protocol):
+    """ProjectService as seen by the controllers: every method awaitable."""
+
+    async def list_projects(
+        self,
+        with_tasks: bool = False,
+        fields: Optional[Sequence[str]] = None,
+    ) -> Iterable[Project]: ...
+    async def list_projects_page(
+        self,
+        limit: int,
+        cursor: Optional[str] = None,
+        total: Optional[str] = None,
+        with_tasks: bool = False,
+        fields: Optional[Sequence[str]] = None,
+    ) -> Page[Project]: ...
+    async def search_projects(self, query: str, limit: int = 10) -> List[Project]: ...
+    async def project_stats(self) -> List[ProjectStats]: ...
+    async def get_project_stats(self, project_id: int) -> Optional[ProjectStats]: ...
+    async def create_project(self, name: str, description: Optional[str] = None) -> Project: ...
+    async def get_project(
+        self,
+        project_id: int,
+        with_tasks: bool = False,
+        fields: Optional[Sequence[str]] = None,
+    ) -> Optional[Project]: ...
+    async def get_project_version(self, project_id: int) -> Optional[int]: ...
+    async def update_project(
+        self,
+        project_id: int,
+        expected_version: Optional[int] = None,
+        **fields: Any,
+    ) -> Project: ...
+    async def delete_project(self, project_id: int) -> None: ...
+
+
+class AsyncTaskService(Protocol):
+    """TaskService as seen by the controllers: every method awaitable."""
+
+    async def list_tasks(self, project_id: int) -> Iterable[Task]: ...
+    async def list_task_rows(
+        self,
+        project_id: int,
+        fields: Optional[Sequence[str]] = None,
+    ) -> List[Row]: ...
+    async def list_tasks_page(
+        self,
+        project_id: int,
+        limit: Optional[int],
+        cursor: Optional[str] = None,
+        order_by: str = "id",
+        total: Optional[str] = None,
+        filters: Optional[TaskFilter] = None,
+        fields: Optional[Sequence[str]] = None,
+    ) -> Page[Task]: ...
+    async def search_tasks(
+        self,
+        query: str,
+        limit: int,
+        cursor: Optional[str] = None,
+    ) -> Page[Tuple[Task, float]]: ...
+    async def create_task(
+        self,
+        project_id: int,
+        title: str,
+        description: Optional[str] = None,
+        deadline: Optional[datetime] = None,
+    ) -> Task: ...
+    async def create_tasks(
+        self,
+        project_id: int,
+        items: Sequence[Mapping[str, Any]],
+    ) -> List[Task]: ...
+    async def export_tasks(
+        self,
+        fmt: str = "ndjson",
+        project_id: Optional[int] = None,
+        statuses: Optional[Sequence[str]] = None,
+        compress: bool = False,
+    ) -> Iterator[bytes]: ...
+    async def get_task(
+        self,
+        project_id: int,
+        task_id: int,
+        fields: Optional[Sequence[str]] = None,
+    ) -> Optional[Task]: ...
+    async def get_task_version(self, project_id: int, task_id: int) -> Optional[int]: ...
+    async def task_list_fingerprint(self, project_id: int) -> tuple[int, int, int]: ...
+    async def update_task(
+        self,
+        project_id: int,
+        task_id: int,
+        expected_version: Optional[int] = None,
+        **fields: Any,
+    ) -> Task: ...
+    async def delete_task(self, project_id: int, task_id: int) -> None: ...
+    async def autoclose_overdue_tasks(
+        self,
+        batch_size: Optional[int] = None,
+        limit: Optional[int] = None,
+    ) -> int: ...
+
+
+class AsyncService:
+    """Awaitable facade over ProjectService / TaskService.
+
+    ``await facade.method(...)`` runs the sync service method of the same name
+    through ``invoker``, which decides where it runs: on an AsyncSession (see
+    ``on_async_session``) or in the threadpool (see ``in_threadpool``). Every
+    method must return a fully materialized result, not an iterator.
+
+    The factories below type it as AsyncProjectService / AsyncTaskService;
+    a method added to a service must be declared there as well.
+    """
+
+    def __init__(self, invoker: Invoker) -> None:
+        self._invoker = invoker
+
+    def __getattr__(self, name: str) -> Callable[..., Awaitable[Any]]:
+        if name.startswith("_"):
+            raise AttributeError(name)
+
+        async def method(*args: Any, **kwargs: Any) -> Any:
+            return await self._invoker(name, args, kwargs)
+
+        method.__name__ = name
+        return method
+
+
+def _call(service: Any, uow: Optional[UnitOfWork], name: str, args: tuple, kwargs: dict) -> Any:
+    # bound around the call itself: the service may be shared by requests
+    with bind_unit_of_work(uow):
+        return getattr(service, name)(*args, **kwargs)
+
+
+@overload
+def in_threadpool(
+    service: ProjectService,
+    uow: Optional[UnitOfWork] = None,
+) -> AsyncProjectService: ...
+@overload
+def in_threadpool(
+    service: TaskService,
+    uow: Optional[UnitOfWork] = None,
+) -> AsyncTaskService: ...
+def in_threadpool(
+    service: ProjectService | TaskService,
+    uow: Optional[UnitOfWork] = None,
+) -> Any:
+    """Runs each call of a sync-stack service in Starlette's threadpool.
+
+    With ``uow`` the call runs as a use-case on that unit of work (for
+    services of the AppContainer); services built by ``build_services(uow)``
+    are already tied to theirs.
+    """
+
+    async def invoke(name: str, args: tuple, kwargs: dict) -> Any:
+        return await run_in_threadpool(_call, service, uow, name, args, kwargs)
+
+    return AsyncService(invoke)
+
+
+@overload
+def on_async_session(uow: Any, service: ProjectService) -> AsyncProjectService: ...
+@overload
+def on_async_session(uow: Any, service: TaskService) -> AsyncTaskService: ...
+def on_async_session(uow: Any, service: ProjectService | TaskService) -> Any:
+    """Runs each call as one use-case on an ``AsyncUnitOfWork``.
+
+    ``service`` works on the current unit of work (see AppContainer), which
+    is bound to the AsyncSession's sync facade for the call, so all I/O goes
+    through the async driver.
+    """
+
+    async def invoke(name: str, args: tuple, kwargs: dict) -> Any:
+        def call(sync_uow: UnitOfWork) -> Any:
+            return _call(service, sync_uow, name, args, kwargs)
+
+        return await uow.run(call)
+
+    return AsyncService(invoke)
@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+from sqlalchemy.engine import Engine
+
+from todo.config import CACHE_ENABLED
+from todo.db.session import ReadSessionLocal, SessionLocal, get_engine, get_replicas
+from todo.db.unit_of_work import (
+    CURRENT_UNIT_OF_WORK,
+    current_session_factory,
+    current_unit_of_work,
+)
+from todo.repositories.cache import CachedProjectRepository, CachedTaskRepository, read_cache
+from todo.repositories.project_repository import ProjectRepository, SqlAlchemyProjectRepository
+from todo.repositories.task_repository import SqlAlchemyTaskRepository, TaskRepository
+from todo.services.project_service import ProjectService
+from todo.services.task_service import TaskService
+
+
+@dataclass
+class AppContainer:
+    """Process-wide engine, repositories and services of the Web API.
+
+    Built once per worker (FastAPI lifespan, see main.py) instead of once
+    per request. The repositories and services hold no request state: they
+    work on the unit of work bound to the running use-case (see
+    ``bind_unit_of_work``), or standalone when none is bound.
+    """
+
+    engine: Engine
+    project_repo: ProjectRepository
+    task_repo: TaskRepository
+    project_service: ProjectService
+    task_service: TaskService
+    # further engines disposed on shutdown (read replicas)
+    extra_engines: List[Engine] = field(default_factory=list)
+
+    def close(self) -> None:
+        """Closes the pooled connections of every engine."""
+        for e in (self.engine, *self.extra_engines):
+            e.dispose()
+
+
+def _reads_primary() -> bool:
+    """Whether the running use-case reads the primary rather than a replica."""
+    uow = current_unit_of_work()
+    if uow is not None:
+        return not uow.on_replica
+    # standalone reads use ReadSessionLocal
+    return not get_replicas()
+
+
+def _use_cache() -> bool:
+    """Whether the running use-case may be served cached rows (not when pinned)."""
+    uow = current_unit_of_work()
+    return uow is None or not uow.pinned
+
+
+def build_container(
+    project_repo: Optional[ProjectRepository] = None,
+    task_repo: Optional[TaskRepository] = None,
+    cache_enabled: bool = CACHE_ENABLED,
+) -> AppContainer:
+    """Wires the default SQLAlchemy stack; tests and alternate backends may
+    pass their own repositories (used as they are, without the read cache).
+    """
+    if project_repo is None:
+        project_repo = SqlAlchemyProjectRepository(
+            current_session_factory(SessionLocal),
+            current_session_factory(ReadSessionLocal),
+        )
+        if cache_enabled:
+            project_repo = CachedProjectRepository(
+                project_repo,
+                read_cache,
+                uow=CURRENT_UNIT_OF_WORK,
+                reads_primary=_reads_primary,
+                use_cache=_use_cache,
+            )
+    if task_repo is None:
+        task_repo = SqlAlchemyTaskRepository(
+            current_session_factory(SessionLocal),
+            current_session_factory(ReadSessionLocal),
+        )
+        if cache_enabled:
+            task_repo = CachedTaskRepository(
+                task_repo,
+                read_cache,
+                uow=CURRENT_UNIT_OF_WORK,
+                reads_primary=_reads_primary,
+                use_cache=_use_cache,
+            )
+    return AppContainer(
+        engine=get_engine(),
+        project_repo=project_repo,
+        task_repo=task_repo,
+        project_service=ProjectService(project_repo, task_repo, uow=CURRENT_UNIT_OF_WORK),
+        task_service=TaskService(project_repo, task_repo, uow=CURRENT_UNIT_OF_WORK),
+        extra_engines=list(get_replicas().engines),
+    )
@@ -1,10 +1,13 @@
 from __future__ import annotations
 
-from typing import Iterable, Optional
+from dataclasses import replace
+from typing import Iterable, List, Optional, Sequence
 
-from todo.config import MAX_NUMBER_OF_PROJECTS
+from todo.config import ALLOWED_STATUSES, MAX_NUMBER_OF_PROJECTS
+from todo.db.unit_of_work import TransactionScope
 from todo.models.project import Project
-from todo.repositories.project_repository import ProjectRepository
+from todo.repositories.pagination import Page
+from todo.repositories.project_repository import ProjectRepository, ProjectStats
 from todo.repositories.task_repository import TaskRepository
 
 
@@ -15,37 +18,106 @@ class ProjectService:
         self,
         project_repo: ProjectRepository,
         task_repo: TaskRepository,
+        uow: Optional[TransactionScope] = None,
     ) -> None:
         self.project_repo = project_repo
         self.task_repo = task_repo
+        self.uow = uow
 
-    def list_projects(self) -> Iterable[Project]:
-        return self.project_repo.list_all()
+    def _commit(self) -> None:
+        """Commits the unit of work, if any (standalone repositories commit themselves)."""
+        if self.uow is not None:
+            self.uow.commit()
+
+    def list_projects(
+        self,
+        with_tasks: bool = False,
+        fields: Optional[Sequence[str]] = None,
+    ) -> Iterable[Project]:
+        return self.project_repo.list_all(with_tasks=with_tasks, fields=fields)
+
+    def list_projects_page(
+        self,
+        limit: int,
+        cursor: Optional[str] = None,
+        total: Optional[str] = None,
+        with_tasks: bool = False,
+        fields: Optional[Sequence[str]] = None,
+    ) -> Page[Project]:
+        """Returns one keyset page of projects ordered by id."""
+        return self.project_repo.list_page(
+            limit=limit,
+            cursor=cursor,
+            total=total,
+            with_tasks=with_tasks,
+            fields=fields,
+        )
+
+    def search_projects(self, query: str, limit: int = 10) -> List[Project]:
+        """Projects whose name matches ``query``, best match first (typeahead)."""
+        query = query.strip()
+        if not query:
+            raise ValueError("Search query must not be empty")
+        return self.project_repo.search(query, limit=limit)
+
+    def project_stats(self) -> List[ProjectStats]:
+        """Task statistics of every project, computed by a single aggregate query."""
+        return [self._with_all_statuses(st) for st in self.project_repo.task_stats()]
+
+    def get_project_stats(self, project_id: int) -> Optional[ProjectStats]:
+        stats = self.project_repo.task_stats(project_id)
+        return self._with_all_statuses(stats[0]) if stats else None
+
+    @staticmethod
+    def _with_all_statuses(stats: ProjectStats) -> ProjectStats:
+        # every allowed status is reported, also with zero tasks; a copy,
+        # as the repository's result may be shared through the read cache
+        counts = {status: 0 for status in ALLOWED_STATUSES}
+        counts.update(stats.counts)
+        return replace(stats, counts=counts)
 
     def create_project(
         self,
         name: str,
         description: Optional[str] = None,
     ) -> Project:
-        existing_projects = list(self.project_repo.list_all())
-        if len(existing_projects) >= MAX_NUMBER_OF_PROJECTS:
-            raise ValueError("Maximum number of projects reached")
-
-        # Optional: check duplicate name
-        existing = self.project_repo.get_by_name(name)
-        if existing is not None:
-            raise ValueError("Project with this name already exists")
+        # The quota is enforced atomically by the repository (QuotaExceeded is
+        # a ValueError); duplicate names are rejected by the unique constraint.
+        project = self.project_repo.create(
+            name=name,
+            description=description,
+            max_projects=MAX_NUMBER_OF_PROJECTS,
+        )
+        self._commit()
+        return project
 
-        return self.project_repo.create(name=name, description=description)
+    def get_project(
+        self,
+        project_id: int,
+        with_tasks: bool = False,
+        fields: Optional[Sequence[str]] = None,
+    ) -> Optional[Project]:
+        return self.project_repo.get_by_id(project_id, with_tasks=with_tasks, fields=fields)
 
-    def get_project(self, project_id: int) -> Optional[Project]:
-        return self.project_repo.get_by_id(project_id)
+    def get_project_version(self, project_id: int) -> Optional[int]:
+        return self.project_repo.get_version(project_id)
 
-    def update_project(self, project_id: int, **fields) -> Project:
+    def update_project(
+        self,
+        project_id: int,
+        expected_version: Optional[int] = None,
+        **fields,
+    ) -> Project:
         # Could enforce domain rules here if needed
-        project = self.project_repo.update(project_id, **fields)
+        project = self.project_repo.update(
+            project_id,
+            expected_version=expected_version,
+            **fields,
+        )
+        self._commit()
         return project
 
     def delete_project(self, project_id: int) -> None:
         # Deleting project cascades tasks by DB foreign key
         self.project_repo.delete(project_id)
+        self._commit()
@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import csv
+import io
+import json
+import zlib
+from datetime import datetime
+from typing import Any, Iterable, Iterator, Sequence
+
+EXPORT_FORMATS = ("ndjson", "csv")
+# Column order of exported rows (NDJSON keys / CSV header)
+EXPORT_FIELDS = ("id", "project_id", "title", "description", "status", "deadline", "closed_at")
+MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv; charset=utf-8"}
+
+# Output is handed out in chunks of about this many bytes
+CHUNK_BYTES = 64 * 1024
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"Cannot serialize {type(value).__name__}")
+
+
+def _ndjson_lines(rows: Iterable[Sequence[Any]]) -> Iterator[str]:
+    for row in rows:
+        yield json.dumps(dict(zip(EXPORT_FIELDS, row)), default=_json_default, ensure_ascii=False) + "\n"
+
+
+def _csv_lines(rows: Iterable[Sequence[Any]]) -> Iterator[str]:
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+
+    def take() -> str:
+        text = buf.getvalue()
+        buf.seek(0)
+        buf.truncate()
+        return text
+
+    writer.writerow(EXPORT_FIELDS)
+    yield take()
+    for row in rows:
+        writer.writerow(
+            [v.isoformat() if isinstance(v, datetime) else v for v in row]
+        )
+        yield take()
+
+
+def _chunked(lines: Iterable[str], size: int = CHUNK_BYTES) -> Iterator[bytes]:
+    parts, length = [], 0
+    for line in lines:
+        parts.append(line)
+        length += len(line)
+        if length >= size:
+            yield "".join(parts).encode("utf-8")
+            parts, length = [], 0
+    if parts:
+        yield "".join(parts).encode("utf-8")
+
+
+def gzipped(chunks: Iterable[bytes]) -> Iterator[bytes]:
+    """Compresses a byte stream on the fly into the gzip format."""
+    compressor = zlib.compressobj(6, zlib.DEFLATED, zlib.MAX_WBITS | 16)
+    for chunk in chunks:
+        out = compressor.compress(chunk)
+        if out:
+            yield out
+    yield compressor.flush()
+
+
+def encode_rows(
+    rows: Iterable[Sequence[Any]],
+    fmt: str = "ndjson",
+    compress: bool = False,
+) -> Iterator[bytes]:
+    """Renders task rows (in EXPORT_FIELDS order) as NDJSON or CSV bytes.
+
+    Works row by row over any iterable, so memory use does not depend on the
+    number of rows.
+    """
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Invalid export format: {fmt!r}")
+    lines = _ndjson_lines(rows) if fmt == "ndjson" else _csv_lines(rows)
+    chunks = _chunked(lines)
+    return gzipped(chunks) if compress else chunks
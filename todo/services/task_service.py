@@ -1,11 +1,16 @@
 from __future__ import annotations
-from typing import Iterable, Optional
+from typing import Any, Iterable, Iterator, List, Mapping, Optional, Sequence, Tuple
 from datetime import datetime, timezone
 
-from todo.config import MAX_NUMBER_OF_TASKS, ALLOWED_STATUSES
+from sqlalchemy import Row
+
+from todo.config import EXPORT_CHUNK_SIZE, MAX_BATCH_SIZE, MAX_NUMBER_OF_TASKS, ALLOWED_STATUSES
+from todo.db.unit_of_work import TransactionScope
 from todo.models.task import Task
+from todo.repositories.pagination import Page
 from todo.repositories.project_repository import ProjectRepository
-from todo.repositories.task_repository import TaskRepository
+from todo.repositories.task_repository import TaskFilter, TaskRepository
+from todo.services.task_export import EXPORT_FORMATS, encode_rows
 
 
 class TaskService:
@@ -15,9 +20,16 @@ class TaskService:
         self,
         project_repo: ProjectRepository,
         task_repo: TaskRepository,
+        uow: Optional[TransactionScope] = None,
     ) -> None:
         self.project_repo = project_repo
         self.task_repo = task_repo
+        self.uow = uow
+
+    def _commit(self) -> None:
+        """Commits the unit of work, if any (standalone repositories commit themselves)."""
+        if self.uow is not None:
+            self.uow.commit()
 
     def _ensure_project_exists(self, project_id: int) -> None:
         """Ensures that the project exists in the repository."""
@@ -29,6 +41,71 @@ class TaskService:
         self._ensure_project_exists(project_id)
         return self.task_repo.list_by_project(project_id)
 
+    def list_task_rows(
+        self,
+        project_id: int,
+        fields: Optional[Sequence[str]] = None,
+    ) -> List[Row]:
+        """Returns a project's tasks as column rows (read-only, see task_columns)."""
+        self._ensure_project_exists(project_id)
+        return self.task_repo.list_rows_by_project(project_id, fields=fields)
+
+    def list_tasks_page(
+        self,
+        project_id: int,
+        limit: Optional[int],
+        cursor: Optional[str] = None,
+        order_by: str = "id",
+        total: Optional[str] = None,
+        filters: Optional[TaskFilter] = None,
+        fields: Optional[Sequence[str]] = None,
+    ) -> Page[Task]:
+        """Returns one keyset page of a project's tasks, optionally filtered.
+
+        ``limit=None`` returns all of them (unpaginated lists).
+        """
+        self._ensure_project_exists(project_id)
+        if filters is None or filters.is_empty():
+            return self.task_repo.list_by_project_page(
+                project_id,
+                limit=limit,
+                cursor=cursor,
+                order_by=order_by,
+                total=total,
+                fields=fields,
+            )
+
+        for status in filters.statuses:
+            if status not in ALLOWED_STATUSES:
+                raise ValueError(f"Invalid status: {status!r}")
+        if (
+            filters.deadline_from is not None
+            and filters.deadline_to is not None
+            and filters.deadline_from >= filters.deadline_to
+        ):
+            raise ValueError("deadline_from must be before deadline_to")
+        return self.task_repo.query_page(
+            project_id,
+            filters,
+            limit=limit,
+            cursor=cursor,
+            order_by=order_by,
+            total=total,
+            fields=fields,
+        )
+
+    def search_tasks(
+        self,
+        query: str,
+        limit: int,
+        cursor: Optional[str] = None,
+    ) -> Page[Tuple[Task, float]]:
+        """Full-text search over task titles and descriptions of all projects."""
+        query = query.strip()
+        if not query:
+            raise ValueError("Search query must not be empty")
+        return self.task_repo.search(query, limit=limit, cursor=cursor)
+
     def create_task(
         self,
         project_id: int,
@@ -36,30 +113,106 @@ class TaskService:
         description: Optional[str] = None,
         deadline: Optional[datetime] = None,
     ) -> Task:
-        """Creates a task for the given project."""
-        self._ensure_project_exists(project_id)
-
-        existing_tasks = list(self.task_repo.list_by_project(project_id))
-        if len(existing_tasks) >= MAX_NUMBER_OF_TASKS:
-            raise ValueError("Maximum number of tasks for this project reached")
+        """Creates a task for the given project.
 
+        Project existence and MAX_NUMBER_OF_TASKS are checked by the repository
+        in the same statement as the insert (LookupError / QuotaExceeded).
+        """
         task = self.task_repo.create(
             project_id=project_id,
             title=title,
             description=description,
             deadline=deadline,
+            max_tasks=MAX_NUMBER_OF_TASKS,
         )
+        self._commit()
         return task
 
-    def get_task(self, project_id: int, task_id: int) -> Optional[Task]:
+    def create_tasks(
+        self,
+        project_id: int,
+        items: Sequence[Mapping[str, Any]],
+    ) -> List[Task]:
+        """Creates several tasks for the given project, all or nothing.
+
+        The quota is checked once for the whole batch. An empty batch is
+        rejected rather than answered with an empty list for any project id.
+        """
+        if not items:
+            raise ValueError("A batch must contain at least one task")
+        if len(items) > MAX_BATCH_SIZE:
+            raise ValueError(f"A batch may contain at most {MAX_BATCH_SIZE} tasks")
+        tasks = self.task_repo.create_many(
+            project_id,
+            items,
+            max_tasks=MAX_NUMBER_OF_TASKS,
+        )
+        self._commit()
+        return tasks
+
+    def export_tasks(
+        self,
+        fmt: str = "ndjson",
+        project_id: Optional[int] = None,
+        statuses: Optional[Sequence[str]] = None,
+        compress: bool = False,
+    ) -> Iterator[bytes]:
+        """Returns a lazy byte stream of tasks as NDJSON or CSV (optionally gzipped).
+
+        Arguments are validated right away (ValueError / LookupError); rows
+        are only read while the stream is consumed.
+        """
+        if fmt not in EXPORT_FORMATS:
+            raise ValueError(f"Invalid export format: {fmt!r}")
+        for status in statuses or ():
+            if status not in ALLOWED_STATUSES:
+                raise ValueError(f"Invalid status: {status!r}")
+        if project_id is not None:
+            self._ensure_project_exists(project_id)
+
+        rows = self.task_repo.iter_rows(
+            project_id=project_id,
+            statuses=statuses,
+            chunk_size=EXPORT_CHUNK_SIZE,
+        )
+        return encode_rows(rows, fmt=fmt, compress=compress)
+
+    def get_task(
+        self,
+        project_id: int,
+        task_id: int,
+        fields: Optional[Sequence[str]] = None,
+    ) -> Optional[Task]:
         """Retrieves a task by its ID and ensures it's from the correct project."""
-        task = self.task_repo.get_by_id(task_id)
+        task = self.task_repo.get_by_id(task_id, fields=fields)
         if task is None or task.project_id != project_id:
             return None
         return task
 
-    def update_task(self, project_id: int, task_id: int, **fields) -> Task:
-        """Updates a task's attributes."""
+    def get_task_version(self, project_id: int, task_id: int) -> Optional[int]:
+        """Returns the task's row version, or None if it is not in the project."""
+        found = self.task_repo.get_version(task_id)
+        if found is None or found[0] != project_id:
+            return None
+        return found[1]
+
+    def task_list_fingerprint(self, project_id: int) -> tuple[int, int, int]:
+        """Returns a value that changes whenever the project's task list changes."""
+        self._ensure_project_exists(project_id)
+        return self.task_repo.list_fingerprint(project_id)
+
+    def update_task(
+        self,
+        project_id: int,
+        task_id: int,
+        expected_version: Optional[int] = None,
+        **fields,
+    ) -> Task:
+        """Updates a task's attributes.
+
+        With ``expected_version`` the update only applies if the task is still
+        at that version (VersionConflict otherwise).
+        """
         task = self.get_task(project_id, task_id)
         if task is None:
             raise LookupError(f"Task #{task_id} not found in project #{project_id}")
@@ -72,7 +225,12 @@ class TaskService:
         if status == "done" and "closed_at" not in fields:
             fields["closed_at"] = datetime.now(timezone.utc)
 
-        updated_task = self.task_repo.update(task_id, **fields)
+        updated_task = self.task_repo.update(
+            task_id,
+            expected_version=expected_version,
+            **fields,
+        )
+        self._commit()
         return updated_task
 
     def delete_task(self, project_id: int, task_id: int) -> None:
@@ -81,26 +239,70 @@ class TaskService:
         if task is None:
             return  # Task does not exist, no need to delete
         self.task_repo.delete(task_id)
+        self._commit()
+
+    def list_overdue_open(self, limit: Optional[int] = None) -> Iterable[Task]:
+        """Returns overdue and still open tasks, oldest deadline first."""
+        return self.task_repo.list_overdue_open(limit=limit)
 
-    def list_overdue_open(self) -> Iterable[Task]:
-        """Returns all overdue and still open tasks."""
-        return self.task_repo.list_overdue_open()
-
-    def autoclose_overdue_tasks(self) -> int:
-        """Automatically closes overdue tasks."""
-        overdue = list(self.task_repo.list_overdue_open())
-        count = 0
-        now = datetime.now(timezone.utc)
-        for t in overdue:
-            # Ensure status is set to "done" and closed_at is set
-            self.update_task(
-                project_id=t.project_id,
-                task_id=t.id,
-                status="done",
-                closed_at=now,
+    def upcoming_deadlines(
+        self,
+        until: datetime,
+        after: Optional[datetime] = None,
+        changed_since: Optional[datetime] = None,
+    ) -> List[Tuple[int, datetime, datetime]]:
+        """``(id, deadline, updated_at)`` of open tasks due by ``until`` (see the repository)."""
+        return self.task_repo.list_open_deadlines(
+            until,
+            after=after,
+            changed_since=changed_since,
+        )
+
+    def count_overdue_open(self) -> int:
+        """Returns how many tasks are overdue and still open."""
+        return self.task_repo.count_overdue_open()
+
+    def iter_autoclose_overdue(
+        self,
+        batch_size: Optional[int] = None,
+        limit: Optional[int] = None,
+        skip_locked: bool = False,
+    ) -> Iterator[List[int]]:
+        """Closes overdue tasks set-wise, yielding the ids closed per batch.
+
+        ``skip_locked`` lets several workers run this concurrently, each
+        claiming batches the others have not locked (needs ``batch_size``).
+        """
+        if batch_size is not None and batch_size < 1:
+            raise ValueError("batch_size must be a positive integer")
+        if limit is not None and limit < 0:
+            raise ValueError("limit must not be negative")
+        if skip_locked and batch_size is None:
+            raise ValueError("skip_locked needs a batch_size")
+        return self._committed(
+            self.task_repo.close_overdue_open(
+                batch_size=batch_size,
+                limit=limit,
+                skip_locked=skip_locked,
             )
-            count += 1
-        return count
+        )
+
+    def _committed(self, batches: Iterator[List[int]]) -> Iterator[List[int]]:
+        # Inside a unit of work every batch is only flushed by the repository
+        for ids in batches:
+            self._commit()
+            yield ids
+
+    def autoclose_overdue_tasks(
+        self,
+        batch_size: Optional[int] = None,
+        limit: Optional[int] = None,
+    ) -> int:
+        """Automatically closes overdue tasks and returns how many were closed."""
+        return sum(
+            len(ids)
+            for ids in self.iter_autoclose_overdue(batch_size=batch_size, limit=limit)
+        )
 
     def update_task_status(self, task_id: int, status: str, closed_at: Optional[datetime] = None) -> Task:
         """Updates the status of a task."""
@@ -120,4 +322,5 @@ class TaskService:
             status=status,
             closed_at=closed_at
         )
+        self._commit()
         return updated_task